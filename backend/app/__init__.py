@@ -1,7 +1,6 @@
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from flask_socketio import SocketIO
 from flask_mail import Mail
 import os
 from dotenv import load_dotenv
@@ -10,7 +9,10 @@ from app.database import init_db, db
 from app.migrations import init_migrations
 from app.celery_app import create_celery_app
 from app.config import Config
-from app.cli import init_db_command
+from app.cli import (
+    init_db_command, rebuild_order_metrics_command, rebuild_hawker_ratings_command,
+    rebuild_notification_counters_command
+)
 
 # Load environment variables
 load_dotenv()
@@ -46,6 +48,29 @@ def create_app(config=None):
     
     # Register CLI commands
     app.cli.add_command(init_db_command)
+    app.cli.add_command(rebuild_order_metrics_command)
+    app.cli.add_command(rebuild_hawker_ratings_command)
+    app.cli.add_command(rebuild_notification_counters_command)
+    
+    # Register model/session event hooks (order metrics are maintained on flush;
+    # cached unread badges and user snapshots are refreshed and new notifications
+    # pushed on commit)
+    from app.models import metrics  # noqa: F401
+    from app.services import notification_counter  # noqa: F401
+    from app.services import notification_feed  # noqa: F401
+    from app.services import identity  # noqa: F401
+    
+    # Reject revoked tokens on every protected route; answered in-process
+    # for tokens that were never revoked
+    from app.services.token_revocation import TokenRevocationService
+    
+    @jwt.token_in_blocklist_loader
+    def token_revoked(jwt_header, jwt_payload):
+        return TokenRevocationService.is_revoked(jwt_payload['jti'])
+    
+    # Compile notification templates once per process
+    from app.services.notification_templates import NotificationTemplates
+    NotificationTemplates.compile_all()
     
     # Register blueprints
     from app.routes import auth, user, order, hawker, admin, payments, products, orders, location, delivery
@@ -60,8 +85,22 @@ def create_app(config=None):
     app.register_blueprint(location.bp, url_prefix='/api/location')
     app.register_blueprint(delivery.bp, url_prefix='/api/delivery')
     
+    from app.api.notifications import notifications_bp
+    app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
+    
     # Register error handlers
     from app.errors import register_error_handlers
     register_error_handlers(app)
     
+    # Tag and time every request, and serve the figures on /metrics; registered
+    # before the rate limiter so rejected requests are counted too
+    from app.middleware.security import request_id_middleware
+    from app.middleware.observability import init_observability
+    request_id_middleware(app)
+    init_observability(app)
+    
+    # Rate limit the endpoints named in RATELIMIT_POLICIES
+    from app.middleware.rate_limit import apply_rate_limits
+    apply_rate_limits(app)
+    
     return app 
\ No newline at end of file
@@ -1,13 +1,12 @@
 from flask import Blueprint, jsonify, request, current_app
 from flask_login import login_required, current_user
-from app.services.route_optimizer import RouteOptimizer
+from app.services.container import ServiceContainer
 from app.models.order import Order
 from app import db, socketio
 from datetime import datetime
 import json
 
 bp = Blueprint('eta', __name__, url_prefix='/api/eta')
-route_optimizer = RouteOptimizer()
 
 @bp.route('/update/<int:order_id>', methods=['POST'])
 @login_required
@@ -95,8 +94,7 @@ def batch_update_eta():
             'message': 'No orders provided'
         }), 400
     
-    # Set API key from config
-    route_optimizer.api_key = current_app.config['GOOGLE_MAPS_API_KEY']
+    route_optimizer = ServiceContainer.get('route_optimizer')
     
     # Process each order
     results = []
@@ -161,8 +159,7 @@ def get_eta(order_id):
             'message': 'Unauthorized to view this order'
         }), 403
     
-    # Set API key from config
-    route_optimizer.api_key = current_app.config['GOOGLE_MAPS_API_KEY']
+    route_optimizer = ServiceContainer.get('route_optimizer')
     
     # Get ETA
     result = route_optimizer.get_eta(order_id)
@@ -1,7 +1,10 @@
 from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.user import User
+from app.services.identity import IdentityService
 from app.models.notification import Notification
+from app.services.notification_counter import UnreadCounterService
+from app.services.notification_archive import NotificationArchiveService
+from app.services.notification_feed import NotificationFeedService
 from app import db
 from datetime import datetime, timedelta
 
@@ -11,8 +14,7 @@ notifications_bp = Blueprint('notifications', __name__)
 @jwt_required()
 def get_preferences():
     """Get user's notification preferences"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -37,8 +39,7 @@ def get_preferences():
 @jwt_required()
 def update_preferences():
     """Update user's notification preferences"""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -91,70 +92,53 @@ def get_history():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    # Build query
-    query = Notification.query.filter_by(user_id=user_id)
-    
-    # Apply filters
-    if notification_type:
-        query = query.filter_by(type=notification_type)
-    if read_status is not None:
-        query = query.filter_by(read=(read_status.lower() == 'true'))
+    # Validate pagination and filters
+    if page < 1:
+        return jsonify({'error': 'page must be a positive integer'}), 400
+    if per_page < 1:
+        return jsonify({'error': 'per_page must be a positive integer'}), 400
     if start_date:
         try:
             start_date = datetime.fromisoformat(start_date)
-            query = query.filter(Notification.created_at >= start_date)
         except ValueError:
             return jsonify({'error': 'Invalid start_date format'}), 400
     if end_date:
         try:
             end_date = datetime.fromisoformat(end_date)
-            query = query.filter(Notification.created_at <= end_date)
         except ValueError:
             return jsonify({'error': 'Invalid end_date format'}), 400
     
-    # Order by created_at descending
-    query = query.order_by(Notification.created_at.desc())
-    
-    # Paginate results
-    pagination = query.paginate(page=page, per_page=per_page)
-    
-    # Prepare response
-    notifications = [notification.to_dict() for notification in pagination.items]
-    
-    return jsonify({
-        'notifications': notifications,
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
-    })
+    # Newest first across recent and archived notifications
+    return jsonify(NotificationArchiveService.history(
+        user_id,
+        page=page,
+        per_page=per_page,
+        notification_type=notification_type,
+        read=(read_status.lower() == 'true') if read_status is not None else None,
+        start_date=start_date,
+        end_date=end_date
+    ))
 
 @notifications_bp.route('/mark-read', methods=['POST'])
 @jwt_required()
 def mark_read():
-    """Mark notifications as read"""
+    """Mark notifications as read, by ID list or everything up to an ID"""
     user_id = get_jwt_identity()
     data = request.get_json()
     
-    if not data or 'notification_ids' not in data:
-        return jsonify({'error': 'notification_ids is required'}), 400
-    
-    notification_ids = data['notification_ids']
+    if not data or ('notification_ids' not in data and 'up_to_id' not in data):
+        return jsonify({'error': 'notification_ids or up_to_id is required'}), 400
     
     try:
-        # Mark notifications as read
-        Notification.query.filter(
-            Notification.id.in_(notification_ids),
-            Notification.user_id == user_id
-        ).update(
-            {
-                'read': True,
-                'read_at': datetime.utcnow()
-            },
-            synchronize_session=False
+        # One range update; the unread counter is adjusted in the same transaction
+        changed = Notification.mark_read(
+            user_id,
+            ids=data.get('notification_ids'),
+            up_to_id=data.get('up_to_id')
         )
         
         db.session.commit()
-        return jsonify({'message': 'Notifications marked as read'})
+        return jsonify({'message': 'Notifications marked as read', 'updated': changed})
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Failed to mark notifications as read: {str(e)}")
@@ -168,19 +152,10 @@ def mark_all_read():
     
     try:
         # Mark all notifications as read
-        Notification.query.filter_by(
-            user_id=user_id,
-            read=False
-        ).update(
-            {
-                'read': True,
-                'read_at': datetime.utcnow()
-            },
-            synchronize_session=False
-        )
+        changed = Notification.mark_read(user_id)
         
         db.session.commit()
-        return jsonify({'message': 'All notifications marked as read'})
+        return jsonify({'message': 'All notifications marked as read', 'updated': changed})
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Failed to mark all notifications as read: {str(e)}")
@@ -193,12 +168,23 @@ def get_unread_count():
     user_id = get_jwt_identity()
     
     try:
-        count = Notification.query.filter_by(
-            user_id=user_id,
-            read=False
-        ).count()
+        # Cached counter, falling back to a primary-key lookup; never counts rows
+        count = UnreadCounterService.get(user_id)
         
         return jsonify({'unread_count': count})
     except Exception as e:
         current_app.logger.error(f"Failed to get unread count: {str(e)}")
-        return jsonify({'error': 'Failed to get unread count'}), 500 
\ No newline at end of file
+        return jsonify({'error': 'Failed to get unread count'}), 500
+
+@notifications_bp.route('/feed', methods=['GET'])
+@jwt_required()
+def get_feed():
+    """Get notifications newer than after_id; the HTTP twin of the Socket.IO catch-up"""
+    user_id = get_jwt_identity()
+    after_id = request.args.get('after_id', type=int)
+    
+    try:
+        return jsonify(NotificationFeedService.catch_up(user_id, after_id))
+    except Exception as e:
+        current_app.logger.error(f"Failed to get notification feed: {str(e)}")
+        return jsonify({'error': 'Failed to get notification feed'}), 500
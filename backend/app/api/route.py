@@ -1,6 +1,6 @@
 from flask import Blueprint, jsonify, request, current_app
 from flask_login import login_required, current_user
-from app.services.route_optimizer import RouteOptimizer
+from app.services.container import ServiceContainer
 from app.models.order import Order
 from app.models.user import User
 from app import db
@@ -8,7 +8,6 @@ from datetime import datetime
 import json
 
 bp = Blueprint('route', __name__, url_prefix='/api/route')
-route_optimizer = RouteOptimizer()
 
 @bp.route('/optimize', methods=['POST'])
 @login_required
@@ -46,8 +45,7 @@ def optimize_route():
     time_window = data.get('time_window', 8)
     return_to_start = data.get('return_to_start', True)
     
-    # Set API key from config
-    route_optimizer.api_key = current_app.config['GOOGLE_MAPS_API_KEY']
+    route_optimizer = ServiceContainer.get('route_optimizer')
     
     # Optimize route
     result = route_optimizer.optimize_route(current_user.id, date)
@@ -77,8 +75,7 @@ def get_current_route():
             'message': 'Only hawkers can view routes'
         }), 403
     
-    # Set API key from config
-    route_optimizer.api_key = current_app.config['GOOGLE_MAPS_API_KEY']
+    route_optimizer = ServiceContainer.get('route_optimizer')
     
     # Get current route
     result = route_optimizer.optimize_route(current_user.id)
@@ -108,6 +105,8 @@ def save_route():
             'message': 'Only hawkers can save routes'
         }), 403
     
+    route_optimizer = ServiceContainer.get('route_optimizer')
+    
     # Get current route
     result = route_optimizer.optimize_route(current_user.id)
     
@@ -147,8 +146,7 @@ def get_eta(order_id):
             'message': 'Unauthorized to view this order'
         }), 403
     
-    # Set API key from config
-    route_optimizer.api_key = current_app.config['GOOGLE_MAPS_API_KEY']
+    route_optimizer = ServiceContainer.get('route_optimizer')
     
     # Get ETA
     result = route_optimizer.get_eta(order_id)
@@ -14,7 +14,8 @@ def create_celery_app(app: Flask = None) -> Celery:
         include=[
             'app.tasks.order',
             'app.tasks.notification',
-            'app.tasks.location'
+            'app.tasks.location',
+            'app.tasks.auth'
         ]
     )
 
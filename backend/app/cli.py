@@ -1,19 +1,41 @@
 import click
 from flask.cli import with_appcontext
-from app import db
 
 @click.command('init-db')
 @with_appcontext
 def init_db_command():
-    """Initialize the database."""
-    # Import all models to ensure they are registered with SQLAlchemy
-    from app.models.user import User
-    from app.models.token_blacklist import TokenBlacklist
-    from app.models.order import Order
-    from app.models.notification import Notification
-    from app.models.product import Product
-    from app.models.payment import Payment
+    """Create the schema and bring it up to the latest migration."""
+    from flask_migrate import upgrade
     
-    # Create all tables
-    db.create_all()
-    click.echo('Initialized the database.') 
\ No newline at end of file
+    # The migration chain builds every table from an empty database;
+    # the app itself never issues DDL at startup
+    upgrade()
+    click.echo('Initialized the database.')
+
+@click.command('rebuild-order-metrics')
+@with_appcontext
+def rebuild_order_metrics_command():
+    """Recompute the daily order metrics from the orders table."""
+    from app.models.metrics import DailyOrderMetric
+    
+    rows = DailyOrderMetric.rebuild()
+    click.echo(f'Rebuilt {rows} daily order metric rows.')
+
+@click.command('rebuild-hawker-ratings')
+@click.option('--hawker-id', type=int, default=None, help='Only rebuild this hawker.')
+@with_appcontext
+def rebuild_hawker_ratings_command(hawker_id):
+    """Backfill hawker rating aggregates from existing ratings."""
+    from app.models.order import HawkerRatingAggregate
+    
+    hawkers = HawkerRatingAggregate.rebuild(hawker_id)
+    click.echo(f'Rebuilt rating aggregates for {hawkers} hawkers.')
+
+@click.command('rebuild-notification-counters')
+@with_appcontext
+def rebuild_notification_counters_command():
+    """Recompute unread notification counters from the notifications table."""
+    from app.models.notification import NotificationCounter
+    
+    users = NotificationCounter.rebuild()
+    click.echo(f'Rebuilt unread counters for {users} users.') 
\ No newline at end of file
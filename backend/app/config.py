@@ -1,55 +0,0 @@
-import os
-from datetime import timedelta
-from dotenv import load_dotenv
-
-load_dotenv()
-
-class Config:
-    # Flask
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'hard-to-guess-string'
-    
-    # Database
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///hawkeroute.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    
-    # JWT
-    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRES', 3600)))
-    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=int(os.environ.get('JWT_REFRESH_TOKEN_EXPIRES', 30)))
-    
-    # Razorpay
-    RAZORPAY_KEY_ID = os.getenv('RAZORPAY_KEY_ID')
-    RAZORPAY_KEY_SECRET = os.getenv('RAZORPAY_KEY_SECRET')
-    
-    # Google Maps
-    GOOGLE_MAPS_API_KEY = os.environ.get('GOOGLE_MAPS_API_KEY')
-    
-    # Application Settings
-    ORDER_CUTOFF_TIME = "14:00"  # 2 PM
-    DELIVERY_START_TIME = "16:00"  # 4 PM
-    DELIVERY_END_TIME = "20:00"   # 8 PM
-    
-    # Email configuration
-    MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
-    MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
-    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
-    MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
-    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
-    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
-    
-    # Socket.IO
-    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE', 'redis://localhost:6379/0')
-    
-    # Redis configuration
-    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
-    
-    # Rate limiting
-    RATELIMIT_DEFAULT = "100 per minute"
-    RATELIMIT_STORAGE_URL = REDIS_URL
-    
-    # Logging
-    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
-    
-    # SocketIO
-    SOCKETIO_PING_TIMEOUT = 10
-    SOCKETIO_PING_INTERVAL = 25 
\ No newline at end of file
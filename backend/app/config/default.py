@@ -14,7 +14,43 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///hawkeroute.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ECHO = FLASK_ENV == 'development'
+    # Read replica, used by the GET endpoints in DB_REPLICA_ENDPOINTS (ignored on SQLite)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    # Connection pool, per engine per process: size it so workers x (size + overflow)
+    # stays below the server's max_connections
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '10'))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '5'))  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', '1800'))  # Seconds; below any proxy idle timeout
+    DB_POOL_PRE_PING = str(os.environ.get('DB_POOL_PRE_PING', 'true')).lower() in ['true', 'on', '1']
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', '5'))
+    DB_APPLICATION_NAME = os.environ.get('DB_APPLICATION_NAME', 'hawkeroute')
+    # PostgreSQL statement timeouts in milliseconds: the default for every connection,
+    # and tighter limits applied per transaction for latency-sensitive endpoints
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '30000'))
+    DB_STATEMENT_TIMEOUTS = {
+        'products.get_products': 5000,
+        'products.get_product': 2000,
+        'orders.get_orders': 5000,
+        'orders.get_order': 2000,
+        'notifications.get_unread_count': 2000,
+        'notifications.get_feed': 5000,
+    }
+    DB_REPLICA_ENDPOINTS = {
+        'orders.get_orders',
+        'hawker.get_hawker_orders',
+        'user.get_user_orders',
+        'admin.get_orders',
+        'notifications.get_history',
+        'admin.get_dashboard_stats',
+        'products.get_products',
+        'products.get_product',
+        'admin.get_products',
+    }
+    # Statement logging is opt-in; per-endpoint statistics are on /api/admin/query-stats
+    SQLALCHEMY_ECHO = str(os.environ.get('SQLALCHEMY_ECHO', 'false')).lower() in ['true', 'on', '1']
+    # Register Flask-Migrate only for `flask` CLI commands, keeping alembic out of web workers
+    MIGRATIONS_CLI_ONLY = str(os.environ.get('MIGRATIONS_CLI_ONLY', 'true')).lower() in ['true', 'on', '1']
     
     # JWT
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
@@ -27,9 +63,53 @@ class Config:
         JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)  # Default 1 hour
         JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)  # Default 30 days
     
+    # Token revocation (Bloom filter in front of token_blacklist)
+    TOKEN_REVOCATION_SYNC_SECONDS = int(os.environ.get('TOKEN_REVOCATION_SYNC_SECONDS', '10'))  # Catch-up when a pub/sub message is missed
+    TOKEN_REVOCATION_REBUILD_SECONDS = int(os.environ.get('TOKEN_REVOCATION_REBUILD_SECONDS', '3600'))  # Drops expired jtis from the filter
+    # Sync re-reads revocations this recent; must exceed the longest transaction that revokes a token
+    TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS = int(os.environ.get('TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS', '300'))
+    TOKEN_REVOCATION_CONFIRM_TTL = int(os.environ.get('TOKEN_REVOCATION_CONFIRM_TTL', '60'))
+    TOKEN_REVOCATION_CONFIRM_MAX_SIZE = int(os.environ.get('TOKEN_REVOCATION_CONFIRM_MAX_SIZE', '10000'))
+    # A "not revoked" answer for a jti the filter learned this recently is not cached
+    TOKEN_REVOCATION_RECENT_SECONDS = int(os.environ.get('TOKEN_REVOCATION_RECENT_SECONDS', '30'))
+    TOKEN_REVOCATION_BLOOM_CAPACITY = int(os.environ.get('TOKEN_REVOCATION_BLOOM_CAPACITY', '100000'))
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE = float(os.environ.get('TOKEN_REVOCATION_BLOOM_ERROR_RATE', '0.001'))
+    TOKEN_REVOCATION_PURGE_BATCH_SIZE = int(os.environ.get('TOKEN_REVOCATION_PURGE_BATCH_SIZE', '1000'))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', '30'))  # Per-process (role, is_active) snapshots
+    USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', '10000'))
+    
     # Google Maps API
     GOOGLE_MAPS_API_KEY = os.environ.get('GOOGLE_MAPS_API_KEY')
     
+    # Payments
+    STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY')
+    PAYMENT_RETURN_URL = os.environ.get('PAYMENT_RETURN_URL')
+    RAZORPAY_KEY_ID = os.environ.get('RAZORPAY_KEY_ID')
+    RAZORPAY_KEY_SECRET = os.environ.get('RAZORPAY_KEY_SECRET')
+    
+    # Outbound HTTP: one keep-alive session per provider per worker process
+    HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '10'))  # Connections kept per host; match threads per worker
+    HTTP_CONNECT_TIMEOUT = float(os.environ.get('HTTP_CONNECT_TIMEOUT', '3.05'))
+    HTTP_READ_TIMEOUT = float(os.environ.get('HTTP_READ_TIMEOUT', '10'))
+    HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', '2'))  # Connect errors always; 502/503/504 for idempotent calls
+    HTTP_BREAKER_FAILURES = int(os.environ.get('HTTP_BREAKER_FAILURES', '5'))  # Consecutive failures that open a circuit
+    HTTP_BREAKER_RESET_SECONDS = float(os.environ.get('HTTP_BREAKER_RESET_SECONDS', '30'))  # Fail fast this long before a trial call
+    # Per-provider overrides of the settings above
+    HTTP_PROVIDER_SETTINGS = {
+        'stripe': {'read_timeout': 30},  # Payment confirmation can be slow
+        'twilio': {'retries': 0}  # SMSNotificationService retries sends itself
+    }
+    
+    # Application Settings
+    TIMEZONE = os.environ.get('TIMEZONE', 'Asia/Kolkata')
+    ORDER_CUTOFF_TIME = os.environ.get('ORDER_CUTOFF_TIME', '14:00')  # 2 PM
+    DEFAULT_LOCALE = os.environ.get('DEFAULT_LOCALE', 'en')  # Notification template locale
+    
+    # Hawker ratings
+    RATING_HALF_LIFE_DAYS = float(os.environ.get('RATING_HALF_LIFE_DAYS', '90'))
+    RATING_PRIOR_MEAN = float(os.environ.get('RATING_PRIOR_MEAN', '3.0'))
+    RATING_PRIOR_WEIGHT = float(os.environ.get('RATING_PRIOR_WEIGHT', '5'))
+    
     # Mail
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', '587'))
@@ -37,6 +117,42 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+    MAIL_POOL_SIZE = int(os.environ.get('MAIL_POOL_SIZE', '4'))  # Max concurrent SMTP connections
+    MAIL_BATCH_SIZE = int(os.environ.get('MAIL_BATCH_SIZE', '50'))  # Messages sent per connection checkout
+    MAIL_CONNECTION_MAX_IDLE = int(os.environ.get('MAIL_CONNECTION_MAX_IDLE', '60'))  # Seconds before an idle connection is dropped
+    
+    # SMS (Twilio)
+    TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID')
+    TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN')
+    TWILIO_PHONE_NUMBER = os.environ.get('TWILIO_PHONE_NUMBER', os.environ.get('TWILIO_FROM_NUMBER'))
+    TWILIO_API_BASE_URL = os.environ.get('TWILIO_API_BASE_URL')  # Override to point at a local stand-in
+    SMS_RATE_PER_SECOND = float(os.environ.get('SMS_RATE_PER_SECOND', '10'))  # Provider's per-second send cap
+    SMS_BURST = int(os.environ.get('SMS_BURST', '10'))
+    SMS_MAX_WORKERS = int(os.environ.get('SMS_MAX_WORKERS', '8'))
+    SMS_MAX_ATTEMPTS = int(os.environ.get('SMS_MAX_ATTEMPTS', '3'))
+    SMS_RETRY_BASE_SECONDS = float(os.environ.get('SMS_RETRY_BASE_SECONDS', '1'))
+    SMS_BULK_DEADLINE_SECONDS = int(os.environ.get('SMS_BULK_DEADLINE_SECONDS', '600'))  # Unsent numbers are deferred after this
+    
+    # Push (Firebase Cloud Messaging)
+    FIREBASE_CREDENTIALS_PATH = os.environ.get('FIREBASE_CREDENTIALS_PATH')
+    PUSH_MAX_WORKERS = int(os.environ.get('PUSH_MAX_WORKERS', '8'))  # Concurrent 500-token multicast requests
+    
+    # Notification outbox
+    NOTIFICATION_OUTBOX_BATCH_SIZE = int(os.environ.get('NOTIFICATION_OUTBOX_BATCH_SIZE', '100'))
+    NOTIFICATION_MAX_ATTEMPTS = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', '5'))
+    NOTIFICATION_RETRY_BASE_SECONDS = int(os.environ.get('NOTIFICATION_RETRY_BASE_SECONDS', '30'))
+    NOTIFICATION_RETRY_MAX_SECONDS = int(os.environ.get('NOTIFICATION_RETRY_MAX_SECONDS', '3600'))
+    NOTIFICATION_CLAIM_TIMEOUT = int(os.environ.get('NOTIFICATION_CLAIM_TIMEOUT', '300'))
+    NOTIFICATION_DIGEST_WINDOW_SECONDS = int(os.environ.get('NOTIFICATION_DIGEST_WINDOW_SECONDS', '120'))  # 0 sends everything immediately
+    NOTIFICATION_DIGEST_BATCH_SIZE = int(os.environ.get('NOTIFICATION_DIGEST_BATCH_SIZE', '500'))
+    UNREAD_COUNT_CACHE_TTL = int(os.environ.get('UNREAD_COUNT_CACHE_TTL', '60'))  # Redis copy of the unread badge
+    UNREAD_COUNT_LOCAL_TTL = int(os.environ.get('UNREAD_COUNT_LOCAL_TTL', '5'))  # In-process copy when Redis is down
+    UNREAD_COUNT_LOCAL_MAX_SIZE = int(os.environ.get('UNREAD_COUNT_LOCAL_MAX_SIZE', '10000'))  # Users kept in that copy
+    DAILY_SUMMARY_BATCH_SIZE = int(os.environ.get('DAILY_SUMMARY_BATCH_SIZE', '500'))  # Hawkers per commit
+    NOTIFICATION_HOT_DAYS = int(os.environ.get('NOTIFICATION_HOT_DAYS', '30'))  # Read notifications older than this are archived
+    NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.environ.get('NOTIFICATION_ARCHIVE_BATCH_SIZE', '1000'))
+    NOTIFICATION_ARCHIVE_MAX_BATCHES = int(os.environ.get('NOTIFICATION_ARCHIVE_MAX_BATCHES', '50'))  # Per task run
+    NOTIFICATION_ARCHIVE_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_ARCHIVE_RETENTION_DAYS', '0'))  # 0 keeps archived notifications forever
     
     # Redis
     REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
@@ -47,10 +163,51 @@ class Config:
     
     # SocketIO
     SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE', REDIS_URL)
+    NOTIFICATION_FEED_ENABLED = str(os.environ.get('NOTIFICATION_FEED_ENABLED', 'true')).lower() in ['true', 'on', '1']  # Push committed notifications to user rooms
+    NOTIFICATION_FEED_CATCH_UP_LIMIT = int(os.environ.get('NOTIFICATION_FEED_CATCH_UP_LIMIT', '100'))
     
     # API Rate Limiting
     RATELIMIT_DEFAULT = "100 per minute"
     RATELIMIT_STORAGE_URL = REDIS_URL
+    RATELIMIT_ENABLED = str(os.environ.get('RATELIMIT_ENABLED', 'true')).lower() in ['true', 'on', '1']
+    RATELIMIT_POOL_SIZE = int(os.environ.get('RATELIMIT_POOL_SIZE', '50'))  # Shared per process
+    RATELIMIT_SOCKET_TIMEOUT = float(os.environ.get('RATELIMIT_SOCKET_TIMEOUT', '0.1'))  # Fail open beyond this
+    # In-process first tier: rejects bursts without a Redis round trip
+    RATELIMIT_LOCAL_ENABLED = str(os.environ.get('RATELIMIT_LOCAL_ENABLED', 'true')).lower() in ['true', 'on', '1']
+    RATELIMIT_LOCAL_MAX_KEYS = int(os.environ.get('RATELIMIT_LOCAL_MAX_KEYS', '10000'))  # Per worker
+    RATELIMIT_LOCAL_SHARDS = int(os.environ.get('RATELIMIT_LOCAL_SHARDS', '16'))
+    # Per-route policies by endpoint name; "... by user" keys on the JWT identity
+    RATELIMIT_POLICIES = {
+        'auth.login': '10 per minute',
+        'auth.register': '5 per minute',
+        'auth.password_reset_request': '5 per hour',
+        'auth.refresh': '30 per minute by user',
+    }
+    # Per-user policies by role (from the token's claims), replacing "by user" limits
+    RATELIMIT_ROLE_POLICIES = {}
+    
+    # Observability
+    OBSERVABILITY_ENABLED = str(os.environ.get('OBSERVABILITY_ENABLED', 'true')).lower() in ['true', 'on', '1']
+    METRICS_PATH = os.environ.get('METRICS_PATH', '/metrics')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Bearer token required to scrape, if set
+    # Outbound calls are labelled by host suffix
+    OBSERVABILITY_PROVIDER_HOSTS = {
+        'googleapis.com': 'googlemaps',
+        'stripe.com': 'stripe',
+        'razorpay.com': 'razorpay',
+        'twilio.com': 'twilio',
+    }
+    # Statement statistics by endpoint and fingerprint
+    SQL_STATS_ENABLED = str(os.environ.get('SQL_STATS_ENABLED', 'true')).lower() in ['true', 'on', '1']
+    SQL_STATS_MAX_FINGERPRINTS = int(os.environ.get('SQL_STATS_MAX_FINGERPRINTS', '2000'))  # Per process
+    SQL_SLOW_QUERY_SECONDS = float(os.environ.get('SQL_SLOW_QUERY_SECONDS', '0.25'))  # Logged as they finish
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.environ.get('SQL_N_PLUS_ONE_THRESHOLD', '10'))  # Same statement, one request
+    # Sampling profiler, run for requests carrying PROFILER_HEADER: PROFILER_TOKEN
+    PROFILER_ENABLED = str(os.environ.get('PROFILER_ENABLED', 'false')).lower() in ['true', 'on', '1']
+    PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN')
+    PROFILER_HEADER = 'X-Profile'
+    PROFILER_INTERVAL = float(os.environ.get('PROFILER_INTERVAL', '0.001'))  # Seconds between samples
+    PROFILER_OUTPUT_DIR = os.environ.get('PROFILER_OUTPUT_DIR')  # Defaults to <instance>/profiles
     
     # Logging
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO') 
\ No newline at end of file
@@ -15,24 +15,26 @@ except ImportError:
     socketio = DummySocketIO()
 from app.models.order import Order
 from app.models.user import User
-from app.services.route_optimizer import RouteOptimizer
+from app.services.container import ServiceContainer
 from app.services.notification import NotificationService
+from app.services.notification_feed import NotificationFeedService
 from datetime import datetime
 import json
 
-# Initialize route optimizer
-route_optimizer = RouteOptimizer()
 
 @socketio.on('connect')
-def handle_connect():
+def handle_connect(auth=None):
     """
     Handle client connection
+    
+    Clients reconnecting with auth={'last_seen_id': <id>} get the
+    notifications they missed as a notification_backlog event.
     """
     if not current_user.is_authenticated:
         return False
     
-    # Join user's personal room
-    join_room(f'user_{current_user.id}')
+    # Join user's personal room; committed notifications are pushed here
+    join_room(NotificationFeedService.room(current_user.id))
     
     # If user is a hawker, join hawker room
     if current_user.is_hawker:
@@ -43,6 +45,22 @@ def handle_connect():
         join_room('admin')
     
     emit('connected', {'user_id': current_user.id, 'username': current_user.username})
+    
+    if auth and auth.get('last_seen_id') is not None:
+        emit('notification_backlog', NotificationFeedService.catch_up(current_user.id, int(auth['last_seen_id'])))
+
+@socketio.on('notifications_catch_up')
+def handle_notifications_catch_up(data):
+    """
+    Send notifications newer than the client's last seen id
+    """
+    if not current_user.is_authenticated:
+        return
+    
+    last_seen_id = (data or {}).get('last_seen_id')
+    emit('notification_backlog', NotificationFeedService.catch_up(
+        current_user.id, int(last_seen_id) if last_seen_id is not None else None
+    ))
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -51,7 +69,7 @@ def handle_disconnect():
     """
     if current_user.is_authenticated:
         # Leave user's personal room
-        leave_room(f'user_{current_user.id}')
+        leave_room(NotificationFeedService.room(current_user.id))
         
         # If user is a hawker, leave hawker room
         if current_user.is_hawker:
@@ -186,8 +204,7 @@ def handle_order_status_update(data):
     
     # If order is being delivered, start ETA updates
     if new_status == 'delivering':
-        # Set API key from config
-        route_optimizer.api_key = current_app.config['GOOGLE_MAPS_API_KEY']
+        route_optimizer = ServiceContainer.get('route_optimizer')
         
         # Get ETA
         eta_result = route_optimizer.get_eta(order_id)
@@ -210,8 +227,7 @@ def handle_route_update(data):
     if not current_user.is_hawker:
         return
     
-    # Set API key from config
-    route_optimizer.api_key = current_app.config['GOOGLE_MAPS_API_KEY']
+    route_optimizer = ServiceContainer.get('route_optimizer')
     
     # Get current route
     result = route_optimizer.optimize_route(current_user.id)
@@ -1,5 +1,5 @@
-from flask_jwt_extended import verify_jwt_in_request
-from app.models.token_blacklist import TokenBlacklist
+from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from app.services.token_revocation import TokenRevocationService
 from functools import wraps
 from flask import jsonify
 
@@ -9,7 +9,7 @@ def check_token_blacklist():
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
             jti = get_jwt()["jti"]
-            if TokenBlacklist.is_blacklisted(jti):
+            if TokenRevocationService.is_revoked(jti):
                 return jsonify({"error": "Token has been revoked"}), 401
             return fn(*args, **kwargs)
         return decorator
@@ -0,0 +1,311 @@
+from flask import Response, current_app, g, has_request_context, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from urllib.parse import urlsplit
+from functools import wraps
+from app.utils.histogram import Histogram
+from app.utils.profiler import make_profiler
+from app.middleware.query_instrumentation import QueryStats
+import logging
+import os
+import secrets
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Prometheus `le` buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RequestStats:
+    """What one request spent its time on, kept on flask.g."""
+
+    __slots__ = ('started', 'queries', 'db_time', 'external', 'profiler')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.external = {}  # provider -> seconds
+        self.profiler = None
+
+
+class RequestMetrics:
+    """
+    Per-process registry of request, database and provider timings.
+
+    Each worker process keeps its own figures; scrape every worker (or run
+    one per container) to see the whole picture.
+    """
+
+    _latency = {}  # (endpoint, method) -> Histogram
+    _responses = {}  # (endpoint, method, status) -> count
+    _db = {}  # endpoint -> [queries, seconds]
+    _external = {}  # provider -> Histogram
+    _external_by_endpoint = {}  # (endpoint, provider) -> seconds
+    _provider_hosts = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, provider_hosts):
+        cls._provider_hosts = dict(provider_hosts)
+
+    @classmethod
+    def _histogram(cls, registry, key):
+        histogram = registry.get(key)
+        if histogram is None:
+            with cls._lock:
+                histogram = registry.setdefault(key, Histogram())
+        return histogram
+
+    @staticmethod
+    def current():
+        """The current request's RequestStats, or None outside a request."""
+        if has_request_context():
+            return g.get('request_stats')
+        return None
+
+    @classmethod
+    def record_request(cls, endpoint, method, status, stats, elapsed):
+        cls._histogram(cls._latency, (endpoint, method)).record(elapsed)
+        with cls._lock:
+            key = (endpoint, method, status)
+            cls._responses[key] = cls._responses.get(key, 0) + 1
+            db = cls._db.setdefault(endpoint, [0, 0.0])
+            db[0] += stats.queries
+            db[1] += stats.db_time
+            for provider, seconds in stats.external.items():
+                key = (endpoint, provider)
+                cls._external_by_endpoint[key] = cls._external_by_endpoint.get(key, 0.0) + seconds
+
+    @classmethod
+    def record_query(cls, statement, elapsed):
+        stats = cls.current()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+
+    @classmethod
+    def provider_for(cls, url):
+        host = urlsplit(url).hostname or ''
+        for suffix, provider in cls._provider_hosts.items():
+            if host == suffix or host.endswith('.' + suffix):
+                return provider
+        return 'other'
+
+    @classmethod
+    def record_external(cls, url, elapsed):
+        provider = cls.provider_for(url)
+        cls._histogram(cls._external, provider).record(elapsed)
+        stats = cls.current()
+        if stats is not None:
+            stats.external[provider] = stats.external.get(provider, 0.0) + elapsed
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._latency = {}
+            cls._responses = {}
+            cls._db = {}
+            cls._external = {}
+            cls._external_by_endpoint = {}
+
+    @classmethod
+    def render(cls):
+        """
+        All metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Body for GET /metrics
+        """
+        with cls._lock:
+            latency = dict(cls._latency)
+            responses = dict(cls._responses)
+            db = {endpoint: list(values) for endpoint, values in cls._db.items()}
+            external = dict(cls._external)
+            external_by_endpoint = dict(cls._external_by_endpoint)
+
+        lines = []
+        _histogram_lines(lines, 'hawkeroute_http_request_duration_seconds', 'Request latency by endpoint',
+                         {(('endpoint', e), ('method', m)): h for (e, m), h in sorted(latency.items())})
+
+        name = 'hawkeroute_http_request_latency_seconds'
+        lines += [f"# HELP {name} Request latency quantiles by endpoint", f"# TYPE {name} summary"]
+        for (endpoint, method), histogram in sorted(latency.items()):
+            labels = (('endpoint', endpoint), ('method', method))
+            for q in QUANTILES:
+                lines.append(f"{name}{_labels(labels + (('quantile', str(q)),))} {histogram.percentile(q):.6f}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+        _counter_lines(lines, 'hawkeroute_http_responses_total', 'Responses by endpoint and status',
+                       {(('endpoint', e), ('method', m), ('status', str(s))): n
+                        for (e, m, s), n in sorted(responses.items())})
+        _counter_lines(lines, 'hawkeroute_db_queries_total', 'SQL statements executed by endpoint',
+                       {(('endpoint', e),): values[0] for e, values in sorted(db.items())})
+        _counter_lines(lines, 'hawkeroute_db_query_seconds_total', 'Time spent in SQL statements by endpoint',
+                       {(('endpoint', e),): values[1] for e, values in sorted(db.items())})
+
+        _histogram_lines(lines, 'hawkeroute_external_request_duration_seconds', 'Outbound HTTP latency by provider',
+                         {(('provider', p),): h for p, h in sorted(external.items())})
+        _counter_lines(lines, 'hawkeroute_external_seconds_total', 'Time spent calling providers by endpoint',
+                       {(('endpoint', e), ('provider', p)): s for (e, p), s in sorted(external_by_endpoint.items())})
+        return "\n".join(lines) + "\n"
+
+
+def _labels(pairs):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in pairs) + '}'
+
+
+def _histogram_lines(lines, name, help_text, histograms):
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in histograms.items():
+        for bound, count in zip(LATENCY_BUCKETS, histogram.cumulative(LATENCY_BUCKETS)):
+            lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {count}")
+        lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+        lines.append(f"{name}_sum{_labels(labels)} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+
+def _counter_lines(lines, name, help_text, values):
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+    for labels, value in values.items():
+        lines.append(f"{name}{_labels(labels)} {value}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    RequestMetrics.record_query(statement, elapsed)
+    QueryStats.record(statement, elapsed)
+
+
+def _query_failed(context):
+    # after_cursor_execute doesn't fire for a failed statement
+    started = context.connection.info.get('query_started') if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine():
+    """Time every statement on every engine; safe to call more than once."""
+    for name, listener in (('before_cursor_execute', _before_cursor_execute),
+                           ('after_cursor_execute', _after_cursor_execute),
+                           ('handle_error', _query_failed)):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+
+def _instrument_requests():
+    """
+    Time every request made through the requests library.
+
+    googlemaps, stripe, razorpay and twilio all send through a requests
+    HTTPAdapter, so one hook covers them; calls are labelled by host.
+    """
+    from requests.adapters import HTTPAdapter
+
+    send = HTTPAdapter.send
+    if getattr(send, '_observed', False):
+        return
+
+    @wraps(send)
+    def timed_send(self, prepared, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return send(self, prepared, *args, **kwargs)
+        finally:
+            RequestMetrics.record_external(prepared.url, time.perf_counter() - started)
+
+    timed_send._observed = True
+    HTTPAdapter.send = timed_send
+
+
+def _endpoint():
+    # Unmatched URLs share one label so scanners can't blow up the series count
+    return request.endpoint or 'unmatched'
+
+
+def _profiling_requested():
+    config = current_app.config
+    token = config.get('PROFILER_TOKEN')
+    if not config.get('PROFILER_ENABLED') or not token:
+        return False
+    supplied = request.headers.get(config.get('PROFILER_HEADER', 'X-Profile'))
+    return bool(supplied) and secrets.compare_digest(supplied, token)
+
+
+def _start_request():
+    stats = RequestStats()
+    g.request_stats = stats
+    if _profiling_requested():
+        stats.profiler = make_profiler(current_app.config.get('PROFILER_INTERVAL', 0.001))
+        stats.profiler.start()
+
+
+def _save_profile(stats, response=None):
+    profiler, stats.profiler = stats.profiler, None
+    profiler.stop()
+    directory = current_app.config.get('PROFILER_OUTPUT_DIR') or os.path.join(current_app.instance_path, 'profiles')
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{_endpoint()}-{secrets.token_hex(4)}.txt"
+    with open(os.path.join(directory, name), 'w') as f:
+        f.write(f"{request.method} {request.full_path}\n\n{profiler.output_text()}\n")
+    logger.info(f"Saved profile of {request.method} {request.path} to {name}")
+    if response is not None:
+        response.headers['X-Profile-Report'] = name
+
+
+def _finish_request(response):
+    QueryStats.finish_request()
+    stats = g.pop('request_stats', None)
+    if stats is None:
+        return response
+    if stats.profiler is not None:
+        _save_profile(stats, response)
+
+    elapsed = time.perf_counter() - stats.started
+    RequestMetrics.record_request(_endpoint(), request.method, response.status_code, stats, elapsed)
+    response.headers['Server-Timing'] = ', '.join(
+        [f"db;dur={stats.db_time * 1000:.1f}", f"app;dur={elapsed * 1000:.1f}"]
+        + [f"{provider};dur={seconds * 1000:.1f}" for provider, seconds in stats.external.items()]
+    )
+    return response
+
+
+def _teardown_request(exc=None):
+    # A failing after_request hook can skip _finish_request; don't leave a sampler running
+    g.pop('query_repeats', None)
+    stats = g.pop('request_stats', None)
+    if stats is not None and stats.profiler is not None:
+        stats.profiler.stop()
+
+
+def metrics_view():
+    """Prometheus scrape endpoint; requires `Authorization: Bearer METRICS_TOKEN` when that is set."""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and not secrets.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return jsonify({'status': 'error', 'message': 'Unauthorized'}), 401
+    return Response(RequestMetrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+def init_observability(app):
+    """Time requests, SQL and provider calls, and serve them on METRICS_PATH."""
+    if not app.config.get('OBSERVABILITY_ENABLED', True):
+        return
+
+    RequestMetrics.configure(app.config.get('OBSERVABILITY_PROVIDER_HOSTS') or {})
+    instrument_engine()
+    _instrument_requests()
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule(app.config.get('METRICS_PATH', '/metrics'), 'metrics', metrics_view)
@@ -0,0 +1,193 @@
+from flask import current_app, g, has_request_context, request
+from collections import deque
+from functools import lru_cache
+from app.utils.histogram import Histogram
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+|\$\d+|\?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement):
+    """
+    Statement shape with literals and placeholders replaced by ?.
+
+    `IN (?, ?, ?)` lists of any length collapse to `(?+)`, so the same query
+    built for different batch sizes groups together.
+    """
+    shape = _STRING.sub('?', statement)
+    shape = _PLACEHOLDER.sub('?', shape)
+    shape = _NUMBER.sub('?', shape)
+    shape = _LIST.sub('(?+)', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+class QueryCounter:
+    """
+    Counts the statements this thread executes while active.
+
+        with QueryCounter() as queries:
+            client.get('/api/orders')
+        assert queries.count <= 3, queries.report()
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        self.statements = []  # (statement, seconds)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def __enter__(self):
+        active = getattr(self._local, 'active', None)
+        if active is None:
+            active = self._local.active = []
+        active.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        self._local.active.remove(self)
+        return False
+
+    @classmethod
+    def record(cls, statement, elapsed):
+        for counter in getattr(cls._local, 'active', None) or ():
+            counter.statements.append((statement, elapsed))
+
+    def report(self):
+        """Statements grouped by fingerprint, most repeated first."""
+        groups = {}
+        for statement, elapsed in self.statements:
+            group = groups.setdefault(fingerprint(statement), [0, 0.0])
+            group[0] += 1
+            group[1] += elapsed
+        lines = [f"{self.count} statements:"]
+        for shape, (count, seconds) in sorted(groups.items(), key=lambda item: -item[1][0]):
+            lines.append(f"  {count:4d}x {seconds * 1000:8.2f} ms  {shape}")
+        return "\n".join(lines)
+
+
+class QueryStats:
+    """
+    Per-process statement statistics by endpoint and fingerprint.
+
+    Each executed statement is timed into a histogram for its (endpoint,
+    fingerprint) pair. At the end of a request, a fingerprint run more than
+    SQL_N_PLUS_ONE_THRESHOLD times is reported as a likely N+1, and
+    statements slower than SQL_SLOW_QUERY_SECONDS are logged as they finish.
+    """
+
+    OVERFLOW = '(other statements)'
+
+    _timings = {}  # (endpoint, fingerprint) -> Histogram
+    _n_plus_one = {}  # (endpoint, fingerprint) -> {'requests', 'max_repeats', 'last_seen'}
+    _slow = deque(maxlen=100)
+    _lock = threading.Lock()
+
+    @classmethod
+    def record(cls, statement, elapsed):
+        """Called for every statement executed, from the Engine hooks."""
+        QueryCounter.record(statement, elapsed)
+        if not has_request_context():
+            return
+        config = current_app.config
+        if not config.get('SQL_STATS_ENABLED', True):
+            return
+
+        endpoint = request.endpoint or 'unmatched'
+        shape = fingerprint(statement)
+        key = (endpoint, shape)
+        histogram = cls._timings.get(key)
+        if histogram is None:
+            with cls._lock:
+                if key not in cls._timings and len(cls._timings) >= config.get('SQL_STATS_MAX_FINGERPRINTS', 2000):
+                    # Keep memory bounded if statements with inlined literals slip through
+                    key = (endpoint, cls.OVERFLOW)
+                histogram = cls._timings.setdefault(key, Histogram())
+        histogram.record(elapsed)
+
+        repeats = g.get('query_repeats')
+        if repeats is None:
+            repeats = g.query_repeats = {}
+        repeats[shape] = repeats.get(shape, 0) + 1
+
+        if elapsed >= config.get('SQL_SLOW_QUERY_SECONDS', 0.25):
+            logger.warning(f"Slow query on {endpoint} ({elapsed * 1000:.0f} ms): {statement}")
+            cls._slow.append({
+                'endpoint': endpoint,
+                'fingerprint': shape,
+                'duration_ms': round(elapsed * 1000, 2),
+                'request_id': g.get('request_id'),
+                'at': time.time()
+            })
+
+    @classmethod
+    def finish_request(cls):
+        """Flag fingerprints repeated often enough in this request to look like N+1."""
+        repeats = g.pop('query_repeats', None)
+        if not repeats:
+            return
+        threshold = current_app.config.get('SQL_N_PLUS_ONE_THRESHOLD', 10)
+        endpoint = request.endpoint or 'unmatched'
+        for shape, count in repeats.items():
+            if count <= threshold:
+                continue
+            logger.warning(f"Possible N+1 on {endpoint}: {count} executions of {shape}")
+            with cls._lock:
+                seen = cls._n_plus_one.setdefault((endpoint, shape), {'requests': 0, 'max_repeats': 0})
+                seen['requests'] += 1
+                seen['max_repeats'] = max(seen['max_repeats'], count)
+                seen['last_seen'] = time.time()
+
+    @classmethod
+    def report(cls, endpoint=None, limit=50):
+        """
+        Aggregated statement statistics, most total time first.
+
+        Args:
+            endpoint (str, optional): Only this endpoint
+            limit (int): Maximum fingerprints to return
+
+        Returns:
+            dict: queries, n_plus_one and slow_queries lists
+        """
+        with cls._lock:
+            timings = [(key, histogram) for key, histogram in cls._timings.items()
+                       if endpoint is None or key[0] == endpoint]
+            n_plus_one = [(key, dict(seen)) for key, seen in cls._n_plus_one.items()
+                          if endpoint is None or key[0] == endpoint]
+            slow = [entry for entry in cls._slow if endpoint is None or entry['endpoint'] == endpoint]
+
+        timings.sort(key=lambda item: -item[1].sum)
+        return {
+            'queries': [{
+                'endpoint': key[0],
+                'fingerprint': key[1],
+                'count': histogram.count,
+                'total_ms': round(histogram.sum * 1000, 2),
+                'mean_ms': round(histogram.sum / histogram.count * 1000, 3) if histogram.count else 0,
+                'p95_ms': round(histogram.percentile(0.95) * 1000, 3),
+                'max_ms': round(histogram.max * 1000, 3)
+            } for key, histogram in timings[:limit]],
+            'n_plus_one': [dict(endpoint=key[0], fingerprint=key[1], **seen) for key, seen in
+                           sorted(n_plus_one, key=lambda item: -item[1]['max_repeats'])],
+            'slow_queries': list(reversed(slow))
+        }
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._timings = {}
+            cls._n_plus_one = {}
+            cls._slow.clear()
@@ -1,153 +1,274 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app, g
 from functools import wraps
+from collections import namedtuple
+from redis import ConnectionPool, Redis
+from redis.exceptions import RedisError
+from app.utils.rate_limit_store import LocalRateLimitStore
+import logging
+import os
+import re
+import threading
 import time
-from redis import Redis
-from current_app import current_app
+
+logger = logging.getLogger(__name__)
+
+# GCRA (generic cell rate algorithm): one key per client holding the
+# "theoretical arrival time" in milliseconds. Checking, updating and reading
+# back the state is a single atomic script call; time comes from the Redis
+# server, so application clocks don't need to agree.
+#
+# KEYS[1]  rate limit key
+# ARGV[1]  limit (requests per period)
+# ARGV[2]  period in milliseconds
+# ARGV[3]  cost of this request
+# Returns {allowed, remaining, reset_after_ms, retry_after_ms}
+GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local emission = period / limit
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+
+local new_tat = tat + emission * cost
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, 0, math.ceil(tat - now), math.ceil(allow_at - now)}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, math.floor((now - allow_at) / emission), math.ceil(new_tat - now), 0}
+"""
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+RateLimitPolicy = namedtuple('RateLimitPolicy', ['limit', 'period', 'per'])
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'limit', 'remaining', 'reset_after', 'retry_after'])
+
+
+def parse_policy(value, per='ip'):
+    """
+    Parse "100 per minute" (optionally "... by user") into a RateLimitPolicy.
+
+    Args:
+        value (str): Policy string, e.g. RATELIMIT_DEFAULT
+        per (str): Default key: 'ip' or 'user'
+
+    Returns:
+        RateLimitPolicy: limit, period in seconds, and key
+    """
+    match = re.fullmatch(r'\s*(\d+)\s*(?:per|/)\s*(\d+)?\s*(second|minute|hour|day)s?(?:\s+by\s+(ip|user))?\s*', value)
+    if not match:
+        raise ValueError(f"Invalid rate limit policy: {value!r}")
+    count, multiplier, unit, by = match.groups()
+    return RateLimitPolicy(int(count), int(multiplier or 1) * PERIODS[unit], by or per)
+
 
 class RateLimiter:
-    """Rate limiting middleware using Redis for storage."""
-    
-    def __init__(self, key_prefix='rate_limit:', default_limit=100, default_period=60):
-        """
-        Initialize the rate limiter.
-        
-        Args:
-            key_prefix: Prefix for Redis keys
-            default_limit: Default number of requests allowed per period
-            default_period: Default time period in seconds
-        """
-        self.redis = Redis.from_url(current_app.config['REDIS_URL'])
-        self.key_prefix = key_prefix
-        self.default_limit = default_limit
-        self.default_period = default_period
-    
-    def _get_key(self, key):
-        """Get the Redis key for rate limiting."""
-        return f"{self.key_prefix}{key}"
-    
-    def is_rate_limited(self, key, limit=None, period=None):
-        """
-        Check if the request should be rate limited.
-        
-        Args:
-            key: Unique identifier for the rate limit (e.g., IP address or user ID)
-            limit: Maximum number of requests allowed per period
-            period: Time period in seconds
-            
-        Returns:
-            bool: True if rate limited, False otherwise
-        """
-        limit = limit or self.default_limit
-        period = period or self.default_period
-        
-        redis_key = self._get_key(key)
-        current = self.redis.get(redis_key)
-        
-        if current is None:
-            # First request, set the counter and expiry
-            self.redis.setex(redis_key, period, 1)
-            return False
-        
-        if int(current) >= limit:
-            return True
-        
-        # Increment the counter
-        self.redis.incr(redis_key)
-        return False
-    
-    def get_remaining_requests(self, key, limit=None):
+    """
+    Two-tier rate limiter: a bounded in-process store, then one atomic Redis
+    script over a shared connection pool.
+
+    The local tier applies the same policy to this worker's share of the
+    traffic, so anything it rejects is over the global limit as well; bursts
+    are turned away without a network hop, and denials from Redis are
+    remembered locally until they expire.
+    """
+
+    KEY_PREFIX = 'rate_limit:'
+
+    _pool = None
+    _pool_key = None
+    _script = None
+    _local = None
+    _local_key = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _client(cls):
+        url = current_app.config.get('RATELIMIT_STORAGE_URL') or current_app.config['REDIS_URL']
+        key = (url, os.getpid())
+        if cls._pool_key != key:
+            with cls._lock:
+                if cls._pool_key != key:
+                    # One pool per process; connections are not shared across fork
+                    cls._pool = ConnectionPool.from_url(
+                        url,
+                        max_connections=current_app.config.get('RATELIMIT_POOL_SIZE', 50),
+                        socket_timeout=current_app.config.get('RATELIMIT_SOCKET_TIMEOUT', 0.1),
+                        socket_connect_timeout=current_app.config.get('RATELIMIT_SOCKET_TIMEOUT', 0.1)
+                    )
+                    cls._script = None
+                    cls._pool_key = key
+        client = Redis(connection_pool=cls._pool)
+        if cls._script is None:
+            # EVALSHA, falling back to EVAL once if the server doesn't have it cached
+            cls._script = client.register_script(GCRA_SCRIPT)
+        return client
+
+    @classmethod
+    def _local_store(cls):
+        config = current_app.config
+        if not config.get('RATELIMIT_LOCAL_ENABLED', True):
+            return None
+        key = (config.get('RATELIMIT_LOCAL_MAX_KEYS', 10000), config.get('RATELIMIT_LOCAL_SHARDS', 16), os.getpid())
+        if cls._local_key != key:
+            with cls._lock:
+                if cls._local_key != key:
+                    cls._local = LocalRateLimitStore(max_keys=key[0], shards=key[1])
+                    cls._local_key = key
+        return cls._local
+
+    @classmethod
+    def hit(cls, key, limit, period, cost=1):
         """
-        Get the number of remaining requests allowed.
-        
+        Count a request against a key and report the resulting state.
+
         Args:
-            key: Unique identifier for the rate limit
-            limit: Maximum number of requests allowed per period
-            
+            key (str): Client key, e.g. 'auth.login:ip:10.0.0.1'
+            limit (int): Requests allowed per period
+            period (int): Period in seconds
+            cost (int): Units this request uses
+
         Returns:
-            int: Number of remaining requests
+            RateLimitResult: allowed, limit, remaining, reset_after and
+                retry_after (both in seconds)
         """
-        limit = limit or self.default_limit
-        redis_key = self._get_key(key)
-        current = self.redis.get(redis_key)
-        
-        if current is None:
-            return limit
-        
-        return max(0, limit - int(current))
-    
-    def get_reset_time(self, key, period=None):
+        client = cls._client()
+        allowed, remaining, reset_after, retry_after = cls._script(
+            keys=[f"{cls.KEY_PREFIX}{key}"], args=[limit, int(period * 1000), cost], client=client
+        )
+        return RateLimitResult(bool(allowed), limit, int(remaining), reset_after / 1000.0, retry_after / 1000.0)
+
+    @classmethod
+    def check(cls, scope, policy):
         """
-        Get the time until the rate limit resets.
-        
+        Apply a policy to the current request.
+
+        If Redis is unavailable the request is allowed unless this worker
+        alone has already seen more than the limit.
+
         Args:
-            key: Unique identifier for the rate limit
-            period: Time period in seconds
-            
+            scope (str): What the limit covers, usually the endpoint name
+            policy (RateLimitPolicy): Limit, period and key
+
         Returns:
-            int: Seconds until reset
+            RateLimitResult or None: None if the check could not be made
         """
-        period = period or self.default_period
-        redis_key = self._get_key(key)
-        ttl = self.redis.ttl(redis_key)
-        
-        return max(0, ttl)
+        key = f"{scope}:{_client_key(policy.per)}"
+        local = cls._local_store()
+        result = None
+        if local is not None:
+            allowed, remaining, reset_after, retry_after = local.hit(key, policy.limit, policy.period)
+            result = RateLimitResult(allowed, policy.limit, remaining, reset_after, retry_after)
+            if not result.allowed:
+                g.rate_limit = result
+                return result
+
+        try:
+            result = cls.hit(key, policy.limit, policy.period)
+        except RedisError as e:
+            logger.warning(f"Rate limiter unavailable, allowing request: {str(e)}")
+        else:
+            if local is not None and not result.allowed:
+                local.block(key, policy.limit, policy.period, result.retry_after)
+
+        if result is not None:
+            g.rate_limit = result
+        return result
+
+
+def _current_claims():
+    from flask_jwt_extended import get_jwt, verify_jwt_in_request
+    verify_jwt_in_request(optional=True)
+    return get_jwt()
+
+
+def _client_key(per):
+    if per == 'user':
+        user_id = _current_claims().get('sub')
+        if user_id is not None:
+            return f"user:{user_id}"
+    return f"ip:{get_ip_address()}"
+
+
+def _user_policy(policy):
+    """Per-user policies can be overridden by role, read from the token's claims."""
+    overrides = current_app.config.get('RATELIMIT_ROLE_POLICIES') or {}
+    if policy.per != 'user' or not overrides:
+        return policy
+    role = _current_claims().get('role')
+    return parse_policy(overrides[role], per='user') if role in overrides else policy
+
+
+def _limited_response(result):
+    response = jsonify({
+        'status': 'error',
+        'message': 'Rate limit exceeded',
+        'retry_after': int(result.retry_after + 0.999)
+    })
+    response.status_code = 429
+    response.headers['Retry-After'] = str(int(result.retry_after + 0.999))
+    return response
 
-def rate_limit(limit=None, period=None, key_func=None):
+
+def add_rate_limit_headers(response):
+    """Expose the state of the check made for this request; no extra round trips."""
+    result = g.pop('rate_limit', None)
+    if result is not None:
+        response.headers['X-RateLimit-Limit'] = str(result.limit)
+        response.headers['X-RateLimit-Remaining'] = str(result.remaining)
+        response.headers['X-RateLimit-Reset'] = str(int(time.time() + result.reset_after))
+    return response
+
+
+def rate_limit(limit=None, period=None, per='ip', scope=None):
     """
     Decorator for rate limiting requests.
-    
+
+    A RATELIMIT_POLICIES entry for the endpoint takes precedence over the
+    arguments, so limits can be tuned without a deploy.
+
     Args:
-        limit: Maximum number of requests allowed per period
+        limit: Maximum number of requests allowed per period; defaults to RATELIMIT_DEFAULT
         period: Time period in seconds
-        key_func: Function to generate the rate limit key
-        
+        per: 'ip' or 'user' (falls back to the IP for anonymous requests)
+        scope: Bucket name; defaults to the endpoint, so each route has its own
+
     Returns:
         Decorated function with rate limiting
     """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Get the rate limiter instance
-            limiter = RateLimiter()
-            
-            # Get the rate limit key
-            if key_func:
-                key = key_func()
-            else:
-                # Default to using IP address
-                key = request.remote_addr
-            
-            # Check if rate limited
-            if limiter.is_rate_limited(key, limit, period):
-                return jsonify({
-                    'status': 'error',
-                    'message': 'Rate limit exceeded',
-                    'retry_after': limiter.get_reset_time(key, period)
-                }), 429
-            
-            # Add rate limit headers
-            response = f(*args, **kwargs)
-            if not isinstance(response, tuple):
-                response = (response, 200)
-            
-            response_obj, status_code = response
-            headers = {
-                'X-RateLimit-Limit': str(limit or limiter.default_limit),
-                'X-RateLimit-Remaining': str(limiter.get_remaining_requests(key, limit)),
-                'X-RateLimit-Reset': str(int(time.time()) + limiter.get_reset_time(key, period))
-            }
-            
-            if isinstance(response_obj, dict):
-                response_obj = jsonify(response_obj)
-            
-            for key, value in headers.items():
-                response_obj.headers[key] = value
-            
-            return response_obj, status_code
-            
+            if not current_app.config.get('RATELIMIT_ENABLED', True):
+                return f(*args, **kwargs)
+            endpoint = scope or request.endpoint or f.__name__
+            policy = _policy_for(endpoint, limit, period, per)
+            result = RateLimiter.check(endpoint, _user_policy(policy))
+            if result is not None and not result.allowed:
+                return _limited_response(result)
+            return f(*args, **kwargs)
+        decorated_function._rate_limited = True
         return decorated_function
     return decorator
 
+
+def _policy_for(endpoint, limit=None, period=None, per='ip'):
+    configured = (current_app.config.get('RATELIMIT_POLICIES') or {}).get(endpoint)
+    if configured:
+        return parse_policy(configured, per=per)
+    if limit and period:
+        return RateLimitPolicy(limit, period, per)
+    return parse_policy(current_app.config.get('RATELIMIT_DEFAULT', '100 per minute'), per=per)
+
+
 # Example key functions
 def get_user_id():
     """Get the current user's ID for rate limiting."""
@@ -159,33 +280,27 @@ def get_ip_address():
     return request.remote_addr
 
 # Rate limit by user ID for authenticated routes
-def user_rate_limit(limit_string):
-    def decorator(f):
-        @wraps(f)
-        def wrapped(*args, **kwargs):
-            from flask_jwt_extended import get_jwt_identity
-            user_id = get_jwt_identity()
-            if user_id:
-                limiter.limit(limit_string, key_func=lambda: f"user:{user_id}")(f)(*args, **kwargs)
-            return f(*args, **kwargs)
-        return wrapped
-    return decorator
+def user_rate_limit(limit=None, period=None):
+    return rate_limit(limit, period, per='user')
 
 # Rate limit by IP address
-def ip_rate_limit(limit_string):
-    return rate_limit(limit_string, key_func=get_remote_address)
+def ip_rate_limit(limit=None, period=None):
+    return rate_limit(limit, period, per='ip')
 
 # Apply rate limiting to specific endpoints
 def apply_rate_limits(app):
-    # Apply to all routes by default
-    limiter.init_app(app)
-    
-    # Override default error handler
-    @app.errorhandler(429)
-    def ratelimit_handler(e):
-        return jsonify({
-            "success": False,
-            "error": "Rate limit exceeded",
-            "message": "Too many requests. Please try again later.",
-            "retry_after": e.description
-        }), 429 
\ No newline at end of file
+    """Enforce RATELIMIT_POLICIES on the endpoints they name and add the headers."""
+    @app.before_request
+    def enforce_configured_policies():
+        policies = app.config.get('RATELIMIT_POLICIES') or {}
+        if not app.config.get('RATELIMIT_ENABLED', True) or request.endpoint not in policies:
+            return None
+        # Decorated views check themselves; don't count the request twice
+        if getattr(app.view_functions.get(request.endpoint), '_rate_limited', False):
+            return None
+        result = RateLimiter.check(request.endpoint, _user_policy(parse_policy(policies[request.endpoint])))
+        if result is not None and not result.allowed:
+            return _limited_response(result)
+        return None
+
+    app.after_request(add_rate_limit_headers)
@@ -2,11 +2,10 @@ from flask import request, g, jsonify, current_app
 from functools import wraps
 import time
 import secrets
-from datetime import datetime, timedelta
-from collections import defaultdict
+from app.utils.rate_limit_store import LocalRateLimitStore
 
-# Rate limiting storage
-rate_limit_storage = defaultdict(lambda: {'count': 0, 'reset_time': datetime.now()})
+# Per-worker rate limiting storage; bounded, and safe to share between threads
+rate_limit_storage = LocalRateLimitStore(max_keys=10000, shards=16)
 
 def add_security_headers(response):
     """Add security headers to the response."""
@@ -33,38 +32,29 @@ def add_security_headers(response):
     
     return response
 
-def request_id_middleware():
-    """Add a unique request ID to each request."""
-    def decorator(f):
-        @wraps(f)
-        def wrapped(*args, **kwargs):
-            # Generate a unique request ID
-            g.request_id = secrets.token_hex(16)
-            return f(*args, **kwargs)
-        return wrapped
-    return decorator
+def request_id_middleware(app):
+    """Give each request an ID (the caller's X-Request-ID if sent) and echo it back."""
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get('X-Request-ID') or secrets.token_hex(16)
 
-def timing_middleware():
-    """Track request timing."""
-    def decorator(f):
-        @wraps(f)
-        def wrapped(*args, **kwargs):
-            # Start timing
-            start_time = time.time()
-            
-            # Process the request
-            response = f(*args, **kwargs)
-            
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Add timing header
-            if hasattr(response, 'headers'):
-                response.headers['X-Request-Time'] = f"{duration:.3f}s"
-            
-            return response
-        return wrapped
-    return decorator
+    @app.after_request
+    def add_request_id_header(response):
+        if 'request_id' in g:
+            response.headers['X-Request-ID'] = g.request_id
+        return response
+
+def timing_middleware(app):
+    """Report each request's duration in an X-Request-Time header."""
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def add_timing_header(response):
+        if 'request_started' in g:
+            response.headers['X-Request-Time'] = f"{time.perf_counter() - g.request_started:.3f}s"
+        return response
 
 def cors_middleware():
     """Handle CORS preflight requests."""
@@ -105,27 +95,13 @@ def rate_limit(limit=100, per=60):
             # Get client identifier (IP or API key)
             client_id = request.headers.get('X-API-Key') or request.remote_addr
             
-            # Get current time
-            now = datetime.now()
-            
-            # Get or initialize rate limit data for this client
-            rate_data = rate_limit_storage[client_id]
-            
-            # Reset counter if time window has passed
-            if now > rate_data['reset_time']:
-                rate_data['count'] = 0
-                rate_data['reset_time'] = now + timedelta(seconds=per)
-            
-            # Check if rate limit exceeded
-            if rate_data['count'] >= limit:
+            allowed, _, _, retry_after = rate_limit_storage.hit(client_id, limit, per)
+            if not allowed:
                 return jsonify({
                     'error': 'Rate limit exceeded',
-                    'message': f'Please try again in {int((rate_data["reset_time"] - now).total_seconds())} seconds'
+                    'message': f'Please try again in {int(retry_after + 0.999)} seconds'
                 }), 429
             
-            # Increment counter
-            rate_data['count'] += 1
-            
             return f(*args, **kwargs)
         return wrapped
     return decorator
@@ -223,10 +199,10 @@ def apply_security_middleware(app):
     app.after_request(add_security_headers)
     
     # Add request ID to all requests
-    app.before_request(request_id_middleware())
+    request_id_middleware(app)
     
     # Add timing to all requests
-    app.before_request(timing_middleware())
+    timing_middleware(app)
     
     # Add CORS handling
     app.before_request(cors_middleware())
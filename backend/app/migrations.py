@@ -1,8 +1,25 @@
-from flask_migrate import Migrate
 from flask import Flask
 from app import db
+import click
+
+
+def _running_flask_cli():
+    """True when the app is being loaded by the `flask` command."""
+    from flask.cli import FlaskGroup
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and isinstance(ctx.find_root().command, FlaskGroup)
+
 
 def init_migrations(app: Flask):
-    """Initialize Flask-Migrate for database migrations."""
+    """
+    Initialize Flask-Migrate for database migrations.
+
+    Importing it pulls in all of alembic, which web and Celery workers never
+    use, so outside the `flask` command it is skipped unless
+    MIGRATIONS_CLI_ONLY is turned off.
+    """
+    if app.config.get('MIGRATIONS_CLI_ONLY', True) and not _running_flask_cli():
+        return None
+    from flask_migrate import Migrate
     migrate = Migrate(app, db)
-    return migrate 
\ No newline at end of file
+    return migrate
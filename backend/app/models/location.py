@@ -5,6 +5,9 @@ class Location(db.Model):
     """Model for storing current location data"""
     
     __tablename__ = 'locations'
+    __table_args__ = (
+        db.Index('ix_locations_user_active', 'user_id', 'is_active'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -48,6 +51,11 @@ class LocationHistory(db.Model):
     """Model for storing location history"""
     
     __tablename__ = 'location_history'
+    __table_args__ = (
+        db.Index('ix_location_history_user_timestamp', 'user_id', 'timestamp'),
+        db.Index('ix_location_history_order_id', 'order_id'),
+        db.Index('ix_location_history_timestamp', 'timestamp'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -0,0 +1,234 @@
+from app import db
+from app.models.order import Order
+from app.utils.dates import to_local_date
+from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+
+class DailyOrderMetric(db.Model):
+    """Model for storing daily per-hawker order counts and revenue by status"""
+    
+    # Rows are maintained incrementally by the Order mapper events at the
+    # bottom of this module, so dashboard reads never scan the orders table.
+
+    __tablename__ = 'daily_order_metrics'
+    __table_args__ = (
+        db.UniqueConstraint('day', 'hawker_id', 'status', name='uq_daily_order_metrics_day_hawker_status'),
+        db.Index('ix_daily_order_metrics_hawker_day', 'hawker_id', 'day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)  # Local day (Config.TIMEZONE) of Order.created_at
+    hawker_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)  # Sum of total_amount for orders in this status
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __init__(self, day, hawker_id, status, order_count=0, revenue=0.0):
+        self.day = day
+        self.hawker_id = hawker_id
+        self.status = status
+        self.order_count = order_count
+        self.revenue = revenue
+
+    @classmethod
+    def apply(cls, connection, day, hawker_id, status, count_delta, revenue_delta):
+        """
+        Atomically add deltas to a metrics bucket, creating it if needed
+
+        Args:
+            connection: Connection of the current flush/transaction
+            day (date): Local day of the order
+            hawker_id (int): ID of the hawker
+            status (str): Order status bucket
+            count_delta (int): Change in number of orders
+            revenue_delta (float): Change in revenue
+        """
+        table = cls.__table__
+        now = datetime.utcnow()
+
+        if connection.dialect.name in ('postgresql', 'sqlite'):
+            if connection.dialect.name == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            stmt = insert(table).values(
+                day=day,
+                hawker_id=hawker_id,
+                status=status,
+                order_count=count_delta,
+                revenue=revenue_delta,
+                updated_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['day', 'hawker_id', 'status'],
+                set_={
+                    'order_count': table.c.order_count + stmt.excluded.order_count,
+                    'revenue': table.c.revenue + stmt.excluded.revenue,
+                    'updated_at': now
+                }
+            )
+            connection.execute(stmt)
+            return
+
+        update = table.update().where(
+            table.c.day == day,
+            table.c.hawker_id == hawker_id,
+            table.c.status == status
+        ).values(
+            order_count=table.c.order_count + count_delta,
+            revenue=table.c.revenue + revenue_delta,
+            updated_at=now
+        )
+        if connection.execute(update).rowcount:
+            return
+        try:
+            # In a savepoint, so losing the race doesn't roll back the caller's order write
+            with connection.begin_nested():
+                connection.execute(table.insert().values(
+                    day=day,
+                    hawker_id=hawker_id,
+                    status=status,
+                    order_count=count_delta,
+                    revenue=revenue_delta,
+                    updated_at=now
+                ))
+        except IntegrityError:
+            # A concurrent transaction created the bucket first
+            connection.execute(update)
+
+    @classmethod
+    def apply_status_change(cls, connection, orders, old_status, new_status):
+        """
+        Move orders changed by a bulk UPDATE between status buckets
+        
+        Bulk statements bypass the mapper events below, so callers that
+        update orders set-wise must account for them here.
+        
+        Args:
+            connection: Connection of the current transaction
+            orders: Rows exposing hawker_id, created_at and total_amount
+            old_status (str): Status the orders had before the update
+            new_status (str): Status the orders have now
+        """
+        buckets = {}
+        for order in orders:
+            key = (_order_day(order), order.hawker_id)
+            count, revenue = buckets.get(key, (0, 0.0))
+            buckets[key] = (count + 1, revenue + (order.total_amount or 0.0))
+        
+        for (day, hawker_id), (count, revenue) in buckets.items():
+            cls.apply(connection, day, hawker_id, old_status, -count, -revenue)
+            cls.apply(connection, day, hawker_id, new_status, count, revenue)
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recompute all buckets from the orders table
+
+        Order writes wait until the rebuilt rows are committed (a table lock
+        on PostgreSQL and MSSQL, the database write lock on SQLite), so their
+        metric updates cannot be lost in between.
+
+        Returns:
+            int: Number of metric rows written
+        """
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            db.session.execute(db.text('LOCK TABLE orders IN SHARE MODE'))
+        elif dialect == 'mssql':
+            db.session.execute(db.text('SELECT TOP 1 1 FROM orders WITH (TABLOCK, HOLDLOCK)'))
+        # Deleting first takes SQLite's write lock before the orders are read
+        cls.query.delete()
+
+        buckets = {}
+        rows = db.session.query(
+            Order.hawker_id, Order.status, Order.created_at, Order.total_amount
+        ).yield_per(1000)
+
+        for hawker_id, status, created_at, total_amount in rows:
+            key = (to_local_date(created_at), hawker_id, status)
+            count, revenue = buckets.get(key, (0, 0.0))
+            buckets[key] = (count + 1, revenue + (total_amount or 0.0))
+
+        db.session.bulk_insert_mappings(cls, [{
+            'day': day,
+            'hawker_id': hawker_id,
+            'status': status,
+            'order_count': count,
+            'revenue': revenue,
+            'updated_at': datetime.utcnow()
+        } for (day, hawker_id, status), (count, revenue) in buckets.items()])
+        db.session.commit()
+
+        return len(buckets)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'day': self.day.isoformat(),
+            'hawker_id': self.hawker_id,
+            'status': self.status,
+            'order_count': self.order_count,
+            'revenue': self.revenue,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def __repr__(self):
+        return f'<DailyOrderMetric {self.day} hawker={self.hawker_id} {self.status}: {self.order_count}>'
+
+
+def _order_day(order):
+    """Return the local day an order is bucketed under"""
+    return to_local_date(order.created_at or datetime.utcnow())
+
+
+def _previous_value(state, key):
+    """Return the value an attribute had before the current flush"""
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, key)
+
+
+@event.listens_for(Order, 'after_insert')
+def _order_inserted(mapper, connection, target):
+    DailyOrderMetric.apply(
+        connection,
+        _order_day(target),
+        target.hawker_id,
+        target.status,
+        1,
+        target.total_amount or 0.0
+    )
+
+
+@event.listens_for(Order, 'after_update')
+def _order_updated(mapper, connection, target):
+    state = inspect(target)
+    old = (
+        _previous_value(state, 'hawker_id'),
+        _previous_value(state, 'status'),
+        _previous_value(state, 'total_amount') or 0.0
+    )
+    new = (target.hawker_id, target.status, target.total_amount or 0.0)
+    if old == new:
+        return
+
+    day = _order_day(target)
+    DailyOrderMetric.apply(connection, day, old[0], old[1], -1, -old[2])
+    DailyOrderMetric.apply(connection, day, new[0], new[1], 1, new[2])
+
+
+@event.listens_for(Order, 'after_delete')
+def _order_deleted(mapper, connection, target):
+    DailyOrderMetric.apply(
+        connection,
+        _order_day(target),
+        target.hawker_id,
+        target.status,
+        -1,
+        -(target.total_amount or 0.0)
+    )
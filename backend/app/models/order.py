@@ -1,8 +1,13 @@
 from app import db
+from app.config import Config
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 
 class OrderItem(db.Model):
     __tablename__ = 'order_items'
+    __table_args__ = (
+        db.Index('ix_order_items_order_id', 'order_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
@@ -15,12 +20,30 @@ class OrderItem(db.Model):
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Hawker dashboards, route optimisation and daily summaries
+        db.Index('ix_orders_hawker_status_created', 'hawker_id', 'status', 'created_at'),
+        # Customer order history (newest first)
+        db.Index('ix_orders_customer_created', 'customer_id', 'created_at'),
+        # Admin listings and status distribution
+        db.Index('ix_orders_status_created', 'status', 'created_at'),
+        db.Index('ix_orders_created_at', 'created_at'),
+        # Expired order sweeper only ever looks at pending orders
+        db.Index(
+            'ix_orders_pending_created', 'created_at',
+            postgresql_where=db.text("status = 'pending'"),
+            sqlite_where=db.text("status = 'pending'"),
+            mssql_where=db.text("status = 'pending'")
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    hawker_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, confirmed, preparing, delivering, delivered, cancelled
-    total_amount = db.Column(db.Float, nullable=False)
+    # active_history: daily order metrics need the committed value even when
+    # these are assigned on an expired instance without being read first
+    hawker_id = db.column_property(db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False), active_history=True)
+    status = db.column_property(db.Column(db.String(20), nullable=False, default='pending'), active_history=True)  # pending, confirmed, preparing, delivering, delivered, cancelled
+    total_amount = db.column_property(db.Column(db.Float, nullable=False), active_history=True)
     delivery_address = db.Column(db.String(200), nullable=False)
     delivery_latitude = db.Column(db.Float, nullable=False)
     delivery_longitude = db.Column(db.Float, nullable=False)
@@ -86,6 +109,9 @@ class OrderRating(db.Model):
     """Model for storing order ratings"""
     
     __tablename__ = 'order_ratings'
+    __table_args__ = (
+        db.Index('ix_order_ratings_order_id', 'order_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
@@ -149,6 +175,212 @@ class OrderRating(db.Model):
     def __repr__(self):
         return f'<OrderRating {self.id}: {self.rating} stars>'
 
+class HawkerRatingAggregate(db.Model):
+    """Model for storing running rating aggregates per hawker"""
+    
+    __tablename__ = 'hawker_rating_aggregates'
+    
+    CATEGORIES = ('product_quality', 'delivery_time', 'communication',
+                  'packaging', 'value_for_money', 'product_condition')
+    
+    hawker_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Per-category sums and counts (categories are optional on a rating)
+    product_quality_sum = db.Column(db.Integer, nullable=False, default=0)
+    product_quality_count = db.Column(db.Integer, nullable=False, default=0)
+    delivery_time_sum = db.Column(db.Integer, nullable=False, default=0)
+    delivery_time_count = db.Column(db.Integer, nullable=False, default=0)
+    communication_sum = db.Column(db.Integer, nullable=False, default=0)
+    communication_count = db.Column(db.Integer, nullable=False, default=0)
+    packaging_sum = db.Column(db.Integer, nullable=False, default=0)
+    packaging_count = db.Column(db.Integer, nullable=False, default=0)
+    value_for_money_sum = db.Column(db.Integer, nullable=False, default=0)
+    value_for_money_count = db.Column(db.Integer, nullable=False, default=0)
+    product_condition_sum = db.Column(db.Integer, nullable=False, default=0)
+    product_condition_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Exponentially time-decayed sum/weight, both expressed as of decayed_at
+    decayed_sum = db.Column(db.Float, nullable=False, default=0.0)
+    decayed_weight = db.Column(db.Float, nullable=False, default=0.0)
+    decayed_at = db.Column(db.DateTime)
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    hawker = db.relationship('User', backref=db.backref('rating_aggregate', uselist=False))
+    
+    def __init__(self, hawker_id):
+        self.hawker_id = hawker_id
+        self.rating_count = 0
+        self.rating_sum = 0
+        for category in self.CATEGORIES:
+            setattr(self, f'{category}_sum', 0)
+            setattr(self, f'{category}_count', 0)
+        self.decayed_sum = 0.0
+        self.decayed_weight = 0.0
+    
+    @classmethod
+    def for_hawker(cls, hawker_id):
+        """
+        Get the aggregate row for a hawker, locked for update, creating it if needed
+        
+        Args:
+            hawker_id: ID of the hawker
+            
+        Returns:
+            HawkerRatingAggregate: Row attached to the current session
+        """
+        aggregate = cls.query.filter_by(hawker_id=hawker_id).with_for_update().first()
+        if aggregate:
+            return aggregate
+        
+        # No row to lock yet: insert one, letting a concurrent first rating win,
+        # then lock whichever row exists
+        table = cls.__table__
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            db.session.execute(
+                insert(table).values(hawker_id=hawker_id).on_conflict_do_nothing(index_elements=['hawker_id'])
+            )
+        else:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(table.insert().values(hawker_id=hawker_id))
+            except IntegrityError:
+                pass
+        return cls.query.filter_by(hawker_id=hawker_id).with_for_update().one()
+    
+    @staticmethod
+    def _decay_factor(since, until):
+        """Weight multiplier for ratings that are (until - since) old"""
+        if not since or until <= since:
+            return 1.0
+        half_life = Config.RATING_HALF_LIFE_DAYS * 86400.0
+        return 0.5 ** ((until - since).total_seconds() / half_life)
+    
+    def add_rating(self, rating):
+        """
+        Fold a new rating into the running aggregates in O(1)
+        
+        Args:
+            rating (OrderRating): Newly submitted rating
+        """
+        rated_at = rating.created_at or datetime.utcnow()
+        
+        self.rating_count += 1
+        self.rating_sum += rating.rating
+        for category in self.CATEGORIES:
+            value = getattr(rating, category)
+            if value is not None:
+                setattr(self, f'{category}_sum', getattr(self, f'{category}_sum') + value)
+                setattr(self, f'{category}_count', getattr(self, f'{category}_count') + 1)
+        
+        if self.decayed_at and rated_at < self.decayed_at:
+            # Late arrival: age the new rating instead of the existing totals
+            weight = self._decay_factor(rated_at, self.decayed_at)
+            self.decayed_sum += rating.rating * weight
+            self.decayed_weight += weight
+        else:
+            factor = self._decay_factor(self.decayed_at, rated_at)
+            self.decayed_sum = self.decayed_sum * factor + rating.rating
+            self.decayed_weight = self.decayed_weight * factor + 1.0
+            self.decayed_at = rated_at
+    
+    @property
+    def average(self):
+        """Plain mean of all ratings"""
+        return self.rating_sum / self.rating_count if self.rating_count else None
+    
+    @property
+    def decayed_average(self):
+        """Mean of all ratings with recent ratings weighted more heavily"""
+        return self.decayed_sum / self.decayed_weight if self.decayed_weight else None
+    
+    def category_averages(self):
+        """Mean rating for each category that has been rated at least once"""
+        averages = {}
+        for category in self.CATEGORIES:
+            count = getattr(self, f'{category}_count')
+            averages[category] = getattr(self, f'{category}_sum') / count if count else None
+        return averages
+    
+    def ranking_score(self, now=None):
+        """
+        Decayed average shrunk towards a prior mean as ratings age
+        
+        Hawkers with few or stale ratings drift towards Config.RATING_PRIOR_MEAN,
+        so the score is suitable for ordering hawkers in listings.
+        """
+        factor = self._decay_factor(self.decayed_at, now or datetime.utcnow())
+        prior_weight = Config.RATING_PRIOR_WEIGHT
+        return (
+            (self.decayed_sum * factor + Config.RATING_PRIOR_MEAN * prior_weight) /
+            (self.decayed_weight * factor + prior_weight)
+        )
+    
+    @classmethod
+    def rebuild(cls, hawker_id=None):
+        """
+        Recompute aggregates from existing customer ratings of completed orders
+        
+        New ratings wait until the rebuilt rows are committed (a table lock on
+        PostgreSQL and MSSQL, the database write lock on SQLite), so none can
+        be lost in between.
+        
+        Args:
+            hawker_id (int, optional): Only rebuild this hawker's aggregate
+            
+        Returns:
+            int: Number of hawkers rebuilt
+        """
+        query = db.session.query(OrderRating, Order.hawker_id).join(Order).filter(
+            Order.status == 'completed',
+            OrderRating.user_id == Order.customer_id
+        )
+        delete_query = cls.query
+        if hawker_id is not None:
+            query = query.filter(Order.hawker_id == hawker_id)
+            delete_query = delete_query.filter_by(hawker_id=hawker_id)
+        
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            db.session.execute(db.text('LOCK TABLE order_ratings IN SHARE MODE'))
+        elif dialect == 'mssql':
+            db.session.execute(db.text('SELECT TOP 1 1 FROM order_ratings WITH (TABLOCK, HOLDLOCK)'))
+        # Deleting first takes SQLite's write lock before the ratings are read
+        delete_query.delete(synchronize_session=False)
+        
+        aggregates = {}
+        for rating, hawker in query.order_by(OrderRating.created_at).yield_per(1000):
+            if hawker not in aggregates:
+                aggregates[hawker] = cls(hawker)
+            aggregates[hawker].add_rating(rating)
+        
+        db.session.add_all(aggregates.values())
+        db.session.commit()
+        
+        return len(aggregates)
+    
+    def to_dict(self):
+        return {
+            'hawker_id': self.hawker_id,
+            'rating_count': self.rating_count,
+            'average': self.average,
+            'decayed_average': self.decayed_average,
+            'ranking_score': self.ranking_score(),
+            'categories': self.category_averages(),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def __repr__(self):
+        return f'<HawkerRatingAggregate hawker={self.hawker_id}: {self.average} ({self.rating_count})>'
+
 class OrderDispute(db.Model):
     """Model for storing order disputes"""
     
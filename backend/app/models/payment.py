@@ -5,6 +5,9 @@ from decimal import Decimal
 class Payment(db.Model):
     """Model for storing payment information"""
     __tablename__ = 'payments'
+    __table_args__ = (
+        db.Index('ix_payments_order_id', 'order_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
@@ -55,6 +58,9 @@ class Payment(db.Model):
 class PaymentHistory(db.Model):
     """Model for storing payment history"""
     __tablename__ = 'payment_history'
+    __table_args__ = (
+        db.Index('ix_payment_history_payment_created', 'payment_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     payment_id = db.Column(db.Integer, db.ForeignKey('payments.id'), nullable=False)
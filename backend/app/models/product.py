@@ -3,6 +3,9 @@ from datetime import datetime
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        db.Index('ix_products_hawker_available', 'hawker_id', 'is_available'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     hawker_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
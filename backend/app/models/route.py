@@ -4,6 +4,9 @@ import json
 
 class HawkerRoute(db.Model):
     __tablename__ = 'hawker_routes'
+    __table_args__ = (
+        db.Index('ix_hawker_routes_hawker_date', 'hawker_id', 'date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     hawker_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
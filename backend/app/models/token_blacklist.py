@@ -3,6 +3,10 @@ from datetime import datetime
 
 class TokenBlacklist(db.Model):
     __tablename__ = 'token_blacklist'
+    # jti lookups are served by the unique constraint's index
+    __table_args__ = (
+        db.Index('ix_token_blacklist_expires_at', 'expires_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     jti = db.Column(db.String(36), nullable=False, unique=True)
@@ -19,4 +23,17 @@ class TokenBlacklist(db.Model):
 
     @classmethod
     def is_blacklisted(cls, jti):
-        return cls.query.filter_by(jti=jti).first() is not None 
\ No newline at end of file
+        return cls.query.filter_by(jti=jti).first() is not None
+
+    @classmethod
+    def purge_expired(cls, now, batch_size):
+        """
+        Delete one batch of revocations for tokens that have expired anyway
+
+        Returns:
+            int: Number of rows deleted
+        """
+        ids = [id for id, in db.session.query(cls.id).filter(cls.expires_at <= now).limit(batch_size)]
+        if ids:
+            cls.query.filter(cls.id.in_(ids)).delete(synchronize_session=False)
+        return len(ids)
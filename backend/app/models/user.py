@@ -4,6 +4,9 @@ from werkzeug.security import generate_password_hash, check_password_hash
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_role_active', 'role', 'is_active'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -83,6 +86,39 @@ class User(db.Model):
             return
         
         self.device_tokens = [device for device in self.device_tokens if device.get('token') != token]
+
+    @classmethod
+    def prune_device_tokens(cls, tokens_by_user):
+        """
+        Remove dead device tokens from many users in one bulk update
+
+        Args:
+            tokens_by_user (dict): user_id -> iterable of tokens to remove
+
+        Returns:
+            int: Number of tokens removed
+        """
+        dead = {user_id: set(tokens) for user_id, tokens in tokens_by_user.items() if tokens}
+        if not dead:
+            return 0
+
+        # Lock the rows so a token registered meanwhile isn't overwritten
+        rows = db.session.query(cls.id, cls.device_tokens).filter(
+            cls.id.in_(dead.keys())
+        ).with_for_update().all()
+
+        removed = 0
+        mappings = []
+        for user_id, devices in rows:
+            devices = devices or []
+            kept = [device for device in devices if device.get('token') not in dead[user_id]]
+            if len(kept) != len(devices):
+                removed += len(devices) - len(kept)
+                mappings.append({'id': user_id, 'device_tokens': kept})
+
+        if mappings:
+            db.session.bulk_update_mappings(cls, mappings)
+        return removed
     
     def to_dict(self):
         return {
@@ -0,0 +1,63 @@
+"""
+pytest plugin failing tests that execute more SQL statements than allowed.
+
+Enable with `pytest -p app.pytest_plugin` or `pytest_plugins = ['app.pytest_plugin']`
+in a conftest, then set a budget per test:
+
+    @pytest.mark.query_budget(3)
+    def test_order_list(client):
+        ...
+
+or for every unmarked test with `--query-budget=N` (or `query_budget = N` in the
+ini file). Statements are counted on the test's own thread, so queries run by
+the Flask test client are included. The `query_counter` fixture gives access
+to the statements for finer-grained assertions.
+"""
+import pytest
+from app.middleware.observability import instrument_engine
+from app.middleware.query_instrumentation import QueryCounter
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('query budget')
+    group.addoption('--query-budget', type=int, default=None,
+                    help='Fail tests that execute more SQL statements than this (default: no limit)')
+    parser.addini('query_budget', 'Default SQL statement budget per test', default='')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'query_budget(n): fail the test if it executes more than n SQL statements')
+    instrument_engine()
+
+
+def _budget(item):
+    marker = item.get_closest_marker('query_budget')
+    if marker is not None:
+        return marker.args[0] if marker.args else marker.kwargs['n']
+    if item.config.getoption('query_budget') is not None:
+        return item.config.getoption('query_budget')
+    value = item.config.getini('query_budget')
+    return int(value) if value else None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    budget = _budget(item)
+    if budget is None:
+        yield
+        return
+
+    with QueryCounter() as counter:
+        outcome = yield
+    if outcome.excinfo is None and counter.count > budget:
+        outcome.force_exception(pytest.fail.Exception(
+            f"Query budget exceeded: {counter.count} statements, budget {budget}\n{counter.report()}",
+            pytrace=False
+        ))
+
+
+@pytest.fixture
+def query_counter():
+    """A QueryCounter active for the rest of the test."""
+    with QueryCounter() as counter:
+        yield counter
@@ -1,12 +1,16 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app.models.user import User
+from app.services.identity import IdentityService
 from app.models.order import Order
 from app.models.product import Product
 from app.models.payment import Payment
 from app import db
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import func, case
+from app.models.metrics import DailyOrderMetric
+from app.utils.dates import local_today, day_range, within
+from app.middleware.query_instrumentation import QueryStats
 
 bp = Blueprint('admin', __name__)
 
@@ -14,10 +18,8 @@ def admin_required(f):
     """Decorator to check if the user is an admin"""
     @jwt_required()
     def decorated_function(*args, **kwargs):
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
-        
-        if not user or user.role != 'admin':
+        # Role comes from the token's claims; no query
+        if IdentityService.current_role() != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
         return f(*args, **kwargs)
@@ -134,13 +136,13 @@ def get_orders():
     if date_from:
         try:
             date_from_obj = datetime.strptime(date_from, '%Y-%m-%d').date()
-            query = query.filter(db.func.date(Order.created_at) >= date_from_obj)
+            query = query.filter(*within(Order.created_at, start=day_range(date_from_obj)[0]))
         except ValueError:
             return jsonify({'error': 'Invalid date_from format. Use YYYY-MM-DD'}), 400
     if date_to:
         try:
             date_to_obj = datetime.strptime(date_to, '%Y-%m-%d').date()
-            query = query.filter(db.func.date(Order.created_at) <= date_to_obj)
+            query = query.filter(*within(Order.created_at, end=day_range(date_to_obj)[1]))
         except ValueError:
             return jsonify({'error': 'Invalid date_to format. Use YYYY-MM-DD'}), 400
     
@@ -253,40 +255,50 @@ def update_product(product_id):
 @admin_required
 def get_dashboard_stats():
     # Get date range
-    today = datetime.now().date()
+    today = local_today()
     last_week = today - timedelta(days=7)
     last_month = today - timedelta(days=30)
     
-    # Get stats
-    total_users = User.query.count()
-    total_customers = User.query.filter_by(role='customer').count()
-    total_hawkers = User.query.filter_by(role='hawker').count()
-    
-    total_orders = Order.query.count()
-    orders_today = Order.query.filter(db.func.date(Order.created_at) == today).count()
-    orders_this_week = Order.query.filter(db.func.date(Order.created_at) >= last_week).count()
-    orders_this_month = Order.query.filter(db.func.date(Order.created_at) >= last_month).count()
+    # Get user stats in a single grouped query
+    users_by_role = dict(db.session.query(User.role, func.count(User.id)).group_by(User.role).all())
+    total_users = sum(users_by_role.values())
+    total_customers = users_by_role.get('customer', 0)
+    total_hawkers = users_by_role.get('hawker', 0)
     
-    total_revenue = db.session.query(func.sum(Order.total_amount)).filter_by(status='delivered').scalar() or 0
-    revenue_today = db.session.query(func.sum(Order.total_amount)).filter(
-        Order.status == 'delivered',
-        db.func.date(Order.created_at) == today
-    ).scalar() or 0
-    revenue_this_week = db.session.query(func.sum(Order.total_amount)).filter(
-        Order.status == 'delivered',
-        db.func.date(Order.created_at) >= last_week
-    ).scalar() or 0
-    revenue_this_month = db.session.query(func.sum(Order.total_amount)).filter(
-        Order.status == 'delivered',
-        db.func.date(Order.created_at) >= last_month
-    ).scalar() or 0
+    # Order and revenue stats come from the incrementally maintained daily metrics
+    def in_window(value, since):
+        return func.sum(case((DailyOrderMetric.day >= since, value), else_=0))
     
-    # Get order status distribution
-    order_status = db.session.query(
-        Order.status, func.count(Order.id)
-    ).group_by(Order.status).all()
+    rows = db.session.query(
+        DailyOrderMetric.status,
+        func.sum(DailyOrderMetric.order_count),
+        func.sum(DailyOrderMetric.revenue),
+        in_window(DailyOrderMetric.order_count, today),
+        in_window(DailyOrderMetric.order_count, last_week),
+        in_window(DailyOrderMetric.order_count, last_month),
+        in_window(DailyOrderMetric.revenue, today),
+        in_window(DailyOrderMetric.revenue, last_week),
+        in_window(DailyOrderMetric.revenue, last_month)
+    ).group_by(DailyOrderMetric.status).all()
     
-    status_distribution = {status: count for status, count in order_status}
+    status_distribution = {}
+    total_orders = orders_today = orders_this_week = orders_this_month = 0
+    total_revenue = revenue_today = revenue_this_week = revenue_this_month = 0
+    for status, count, revenue, count_today, count_week, count_month, rev_today, rev_week, rev_month in rows:
+        if not count:
+            continue
+        status_distribution[status] = count
+        total_orders += count
+        orders_today += count_today or 0
+        orders_this_week += count_week or 0
+        orders_this_month += count_month or 0
+        
+        # Revenue only counts delivered orders
+        if status == 'delivered':
+            total_revenue = revenue or 0
+            revenue_today = rev_today or 0
+            revenue_this_week = rev_week or 0
+            revenue_this_month = rev_month or 0
     
     return jsonify({
         'users': {
@@ -307,4 +319,18 @@ def get_dashboard_stats():
             'this_week': revenue_this_week,
             'this_month': revenue_this_month
         }
-    }), 200 
\ No newline at end of file
+    }), 200 
+
+@bp.route('/query-stats', methods=['GET'])
+@admin_required
+def get_query_stats():
+    # Statement statistics for the worker process that serves this request
+    endpoint = request.args.get('endpoint')
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    return jsonify(QueryStats.report(endpoint=endpoint, limit=limit)), 200
+
+@bp.route('/query-stats', methods=['DELETE'])
+@admin_required
+def reset_query_stats():
+    QueryStats.reset()
+    return jsonify({'message': 'Query statistics reset'}), 200
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
 from app.models.user import User
-from app.models.token_blacklist import TokenBlacklist
+from app.services.identity import IdentityService
+from app.services.token_revocation import TokenRevocationService
 from app import db
 from datetime import datetime, timedelta
 import jwt
@@ -53,7 +54,7 @@ def register():
         db.session.commit()
         
         # Generate tokens
-        access_token = create_access_token(identity=user.id)
+        access_token = create_access_token(identity=user.id, additional_claims=IdentityService.claims_for(user))
         refresh_token = create_refresh_token(identity=user.id)
         
         return jsonify({
@@ -83,7 +84,7 @@ def login():
         return jsonify({'error': 'Account is deactivated'}), 403
     
     # Generate tokens
-    access_token = create_access_token(identity=user.id)
+    access_token = create_access_token(identity=user.id, additional_claims=IdentityService.claims_for(user))
     refresh_token = create_refresh_token(identity=user.id)
     
     return jsonify({
@@ -97,14 +98,20 @@ def login():
 @jwt_required(refresh=True)
 def refresh():
     current_user_id = get_jwt_identity()
-    access_token = create_access_token(identity=current_user_id)
+    
+    # Claims are re-read here, so role changes apply from the next refresh
+    user = IdentityService.snapshot(current_user_id)
+    if not user or not user.is_active:
+        return jsonify({'error': 'Account is deactivated'}), 403
+    
+    access_token = create_access_token(identity=current_user_id, additional_claims=IdentityService.claims_for(user))
     return jsonify({'access_token': access_token}), 200
 
 @bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -114,19 +121,7 @@ def get_current_user():
 @bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
-    jti = get_jwt()["jti"]
-    token_type = get_jwt()["type"]
-    user_id = get_jwt_identity()
-    expires_at = datetime.fromtimestamp(get_jwt()["exp"])
-
-    blacklisted_token = TokenBlacklist(
-        jti=jti,
-        token_type=token_type,
-        user_id=user_id,
-        expires_at=expires_at
-    )
-
-    db.session.add(blacklisted_token)
+    TokenRevocationService.revoke(get_jwt())
     db.session.commit()
 
     return jsonify({"message": "Successfully logged out"}), 200
@@ -175,28 +170,16 @@ def password_reset():
         return jsonify({"error": "New password is required"}), 400
 
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = IdentityService.current_user()
 
     if not user:
         return jsonify({"error": "User not found"}), 404
 
     # Update password
     user.set_password(new_password)
-    db.session.commit()
 
-    # Blacklist the reset token
-    jti = get_jwt()["jti"]
-    token_type = get_jwt()["type"]
-    expires_at = datetime.fromtimestamp(get_jwt()["exp"])
-
-    blacklisted_token = TokenBlacklist(
-        jti=jti,
-        token_type=token_type,
-        user_id=user_id,
-        expires_at=expires_at
-    )
-
-    db.session.add(blacklisted_token)
+    # Blacklist the reset token in the same transaction, so it can't be replayed
+    TokenRevocationService.revoke(get_jwt())
     db.session.commit()
 
     return jsonify({"message": "Password successfully reset"}), 200
@@ -209,7 +192,7 @@ def verify_email():
         return jsonify({"error": "Invalid token type"}), 400
 
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = IdentityService.current_user()
 
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -217,21 +200,9 @@ def verify_email():
     # Update email verification status
     user.email_verified = True
     user.email_verified_at = datetime.utcnow()
-    db.session.commit()
-
-    # Blacklist the verification token
-    jti = get_jwt()["jti"]
-    token_type = get_jwt()["type"]
-    expires_at = datetime.fromtimestamp(get_jwt()["exp"])
-
-    blacklisted_token = TokenBlacklist(
-        jti=jti,
-        token_type=token_type,
-        user_id=user_id,
-        expires_at=expires_at
-    )
 
-    db.session.add(blacklisted_token)
+    # Blacklist the verification token in the same transaction
+    TokenRevocationService.revoke(get_jwt())
     db.session.commit()
 
     return jsonify({"message": "Email successfully verified"}), 200
@@ -240,7 +211,7 @@ def verify_email():
 @jwt_required()
 def resend_verification():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = IdentityService.current_user()
 
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
+from app.services.identity import IdentityService
 from app.models.order import Order
 from app.models.route import HawkerRoute
 from app import db
@@ -28,7 +29,7 @@ bp = Blueprint('delivery', __name__)
 @jwt_required()
 def get_route():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -52,7 +53,7 @@ def get_route():
 @jwt_required()
 def update_location():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.current_user()
     
     if not user or user.role != 'hawker':
         return jsonify({'error': 'Unauthorized'}), 403
@@ -87,7 +88,7 @@ def update_location():
 @jwt_required()
 def track_hawker(hawker_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
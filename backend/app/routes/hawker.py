@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.user import User
+from app.services.identity import IdentityService
 from app.services.user import UserService
 from app.services.order_service import OrderService
 from app.services.route_optimizer import RouteOptimizer
@@ -13,9 +13,8 @@ def get_hawker_orders():
     """Get orders assigned to the hawker"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
         
-        if not user or user.role != 'hawker':
+        if IdentityService.current_role() != 'hawker':
             return jsonify({'error': 'Unauthorized access'}), 403
             
         page = request.args.get('page', 1, type=int)
@@ -33,7 +32,7 @@ def get_optimized_route():
     """Get optimized delivery route for the hawker"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = IdentityService.current_user()
         
         if not user or user.role != 'hawker':
             return jsonify({'error': 'Unauthorized access'}), 403
@@ -49,9 +48,8 @@ def update_location():
     """Update hawker's current location"""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
         
-        if not user or user.role != 'hawker':
+        if IdentityService.current_role() != 'hawker':
             return jsonify({'error': 'Unauthorized access'}), 403
             
         data = request.get_json()
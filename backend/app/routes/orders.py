@@ -3,9 +3,12 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.order import Order, OrderItem
 from app.models.product import Product
 from app.models.user import User
+from app.services.identity import IdentityService
 from app import db
 from app.middleware.check_time import check_order_time
+from app.utils.dates import day_range, within
 from datetime import datetime
+from sqlalchemy.orm import selectinload
 
 bp = Blueprint('orders', __name__)
 
@@ -87,7 +90,7 @@ def create_order():
 @jwt_required()
 def get_orders():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -110,19 +113,22 @@ def get_orders():
     if date:
         try:
             date_obj = datetime.strptime(date, '%Y-%m-%d').date()
-            query = query.filter(db.func.date(Order.created_at) == date_obj)
+            query = query.filter(*within(Order.created_at, *day_range(date_obj)))
         except ValueError:
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
     
-    # Get orders
-    orders = query.order_by(Order.created_at.desc()).all()
+    # Get orders, loading the hawkers, items and products to_dict needs up front
+    orders = query.options(
+        selectinload(Order.hawker),
+        selectinload(Order.items).selectinload(OrderItem.product)
+    ).order_by(Order.created_at.desc()).all()
     return jsonify([order.to_dict() for order in orders]), 200
 
 @bp.route('/<int:order_id>', methods=['GET'])
 @jwt_required()
 def get_order(order_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -143,9 +149,8 @@ def get_order(order_id):
 @jwt_required()
 def update_order_status(order_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
     
-    if not user or user.role != 'hawker':
+    if IdentityService.current_role() != 'hawker':
         return jsonify({'error': 'Unauthorized'}), 403
     
     order = Order.query.get(order_id)
@@ -3,23 +3,22 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.order import Order
 from app.models.payment import Payment
 from app.models.user import User
+from app.services.identity import IdentityService
+from app.services.container import ServiceContainer
 from app import db
-import razorpay
 from datetime import datetime
 
 bp = Blueprint('payments', __name__)
 
 def get_razorpay_client():
-    """Get Razorpay client instance"""
-    return razorpay.Client(
-        auth=(current_app.config['RAZORPAY_KEY_ID'], current_app.config['RAZORPAY_KEY_SECRET'])
-    )
+    """Get the worker's shared Razorpay client"""
+    return ServiceContainer.get('razorpay')
 
 @bp.route('/initiate', methods=['POST'])
 @jwt_required()
 def initiate_payment():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -88,7 +87,7 @@ def initiate_payment():
 @jwt_required()
 def verify_payment():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = IdentityService.current_user()
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -100,6 +99,8 @@ def verify_payment():
     if not all(field in data for field in required_fields):
         return jsonify({'error': 'Missing required fields'}), 400
     
+    from razorpay.errors import SignatureVerificationError
+    
     try:
         # Verify payment signature
         razorpay_client = get_razorpay_client()
@@ -137,7 +138,7 @@ def verify_payment():
             'order': order.to_dict()
         }), 200
         
-    except razorpay.errors.SignatureVerificationError:
+    except SignatureVerificationError:
         return jsonify({'error': 'Invalid payment signature'}), 400
     except Exception as e:
         db.session.rollback()
@@ -147,9 +148,8 @@ def verify_payment():
 @jwt_required()
 def record_cod_payment():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
     
-    if not user or user.role != 'hawker':
+    if IdentityService.current_role() != 'hawker':
         return jsonify({'error': 'Unauthorized'}), 403
     
     data = request.get_json()
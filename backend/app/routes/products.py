@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.product import Product
-from app.models.user import User
+from app.services.identity import IdentityService
 from app import db
 from datetime import datetime
 
@@ -30,9 +30,8 @@ def get_products():
 @jwt_required()
 def create_product():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
     
-    if not user or user.role != 'hawker':
+    if IdentityService.current_role() != 'hawker':
         return jsonify({'error': 'Unauthorized'}), 403
     
     data = request.get_json()
@@ -73,9 +72,8 @@ def get_product(product_id):
 @jwt_required()
 def update_product(product_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
     
-    if not user or user.role != 'hawker':
+    if IdentityService.current_role() != 'hawker':
         return jsonify({'error': 'Unauthorized'}), 403
     
     product = Product.query.get(product_id)
@@ -112,9 +110,8 @@ def update_product(product_id):
 @jwt_required()
 def delete_product(product_id):
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
     
-    if not user or user.role != 'hawker':
+    if IdentityService.current_role() != 'hawker':
         return jsonify({'error': 'Unauthorized'}), 403
     
     product = Product.query.get(product_id)
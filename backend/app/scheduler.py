@@ -4,9 +4,7 @@ from app.models.user import User
 from app.models.order import Order
 from app.services.route_optimizer import RouteOptimizer
 from app import db
-from datetime import datetime, date
-import pytz
-from app.config import Config
+from app.utils.dates import local_today, day_range, within
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,8 +12,8 @@ logger = logging.getLogger(__name__)
 def optimize_routes():
     """Optimize routes for all hawkers with pending orders"""
     # Get current date in the configured timezone
-    tz = pytz.timezone(Config.TIMEZONE)
-    current_date = datetime.now(tz).date()
+    current_date = local_today()
+    start, end = day_range(current_date)
     
     # Get all active hawkers
     hawkers = User.query.filter_by(role='hawker', is_active=True).all()
@@ -26,7 +24,7 @@ def optimize_routes():
             hawker_id=hawker.id,
             status='pending'
         ).filter(
-            db.func.date(Order.created_at) == current_date
+            *within(Order.created_at, start, end)
         ).count()
         
         if pending_orders > 0:
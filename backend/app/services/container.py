@@ -0,0 +1,185 @@
+from flask import current_app
+from app.utils.http import provider_session
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    Provider clients and services shared by every request and task of a worker.
+
+    Each entry is built by its factory the first time it is asked for and
+    reused after that, so HTTP connection pools (and the TLS sessions in
+    them) outlive a single request. Instances belong to the application and
+    the process that built them: after a fork (gunicorn --preload, Celery
+    prefork) the child builds its own rather than sharing the parent's
+    sockets.
+
+        gmaps = ServiceContainer.get('googlemaps')
+
+    A factory takes the application config and may return None when the
+    provider is not configured.
+    """
+
+    _factories = {}
+    _lock = threading.RLock()
+
+    @classmethod
+    def register(cls, name, factory):
+        """
+        Register the factory for a named service.
+
+        Args:
+            name (str): Service name
+            factory (callable): Called with the app config; returns the instance
+        """
+        cls._factories[name] = factory
+        return factory
+
+    @classmethod
+    def _instances(cls, app):
+        registry = app.extensions.get('services')
+        if registry is None or registry['pid'] != os.getpid():
+            with cls._lock:
+                registry = app.extensions.get('services')
+                if registry is None or registry['pid'] != os.getpid():
+                    registry = app.extensions['services'] = {'pid': os.getpid(), 'instances': {}}
+        return registry['instances']
+
+    @classmethod
+    def get(cls, name):
+        """
+        The shared instance of a service, built on first use.
+
+        Args:
+            name (str): Service name
+
+        Returns:
+            The instance, or None if the provider is not configured
+        """
+        app = current_app._get_current_object()
+        instances = cls._instances(app)
+        try:
+            return instances[name]
+        except KeyError:
+            pass
+        with cls._lock:
+            if name not in instances:
+                instances[name] = cls._factories[name](app.config)
+                logger.debug(f"Built shared {name} for process {os.getpid()}")
+            return instances[name]
+
+    @classmethod
+    def reset(cls, name=None):
+        """Drop one or all instances of the current app; they are rebuilt on next use."""
+        instances = cls._instances(current_app._get_current_object())
+        with cls._lock:
+            if name is None:
+                instances.clear()
+            else:
+                instances.pop(name, None)
+
+
+def http_settings(config, provider):
+    """
+    Pool, timeout, retry and circuit breaker settings for a provider.
+
+    The HTTP_* defaults, overridden by HTTP_PROVIDER_SETTINGS[provider].
+    """
+    settings = {
+        'pool_size': config.get('HTTP_POOL_SIZE', 10),
+        'connect_timeout': config.get('HTTP_CONNECT_TIMEOUT', 3.05),
+        'read_timeout': config.get('HTTP_READ_TIMEOUT', 10),
+        'retries': config.get('HTTP_RETRIES', 2),
+        'failure_threshold': config.get('HTTP_BREAKER_FAILURES', 5),
+        'reset_timeout': config.get('HTTP_BREAKER_RESET_SECONDS', 30)
+    }
+    settings.update((config.get('HTTP_PROVIDER_SETTINGS') or {}).get(provider, {}))
+    return settings
+
+
+def _http_session(provider):
+    def factory(config):
+        return provider_session(provider, **http_settings(config, provider))
+    return factory
+
+
+def _googlemaps(config):
+    api_key = config.get('GOOGLE_MAPS_API_KEY')
+    if not api_key:
+        logger.warning("Google Maps API key not configured. Maps features will be disabled.")
+        return None
+    import googlemaps
+    # The session supplies the timeouts; bound the client's own retries of 5xx answers by the same budget
+    return googlemaps.Client(
+        key=api_key,
+        requests_session=ServiceContainer.get('http.googlemaps'),
+        retry_timeout=http_settings(config, 'googlemaps')['read_timeout']
+    )
+
+
+def _stripe(config):
+    import stripe
+    settings = http_settings(config, 'stripe')
+    stripe.api_key = config.get('STRIPE_SECRET_KEY')
+    stripe.default_http_client = stripe.RequestsClient(
+        session=ServiceContainer.get('http.stripe'),
+        timeout=(settings['connect_timeout'], settings['read_timeout'])
+    )
+    return stripe
+
+
+def _razorpay(config):
+    import razorpay
+    return razorpay.Client(
+        session=ServiceContainer.get('http.razorpay'),
+        auth=(config.get('RAZORPAY_KEY_ID'), config.get('RAZORPAY_KEY_SECRET'))
+    )
+
+
+def _twilio(config):
+    account_sid = config.get('TWILIO_ACCOUNT_SID')
+    auth_token = config.get('TWILIO_AUTH_TOKEN')
+    if not account_sid or not auth_token:
+        return None
+    from twilio.rest import Client
+    from app.services.sms_notification import routed_http_client
+    http_client = routed_http_client(base_url=config.get('TWILIO_API_BASE_URL'))
+    # One pooled HTTP session shared by all sending threads
+    http_client.session = ServiceContainer.get('http.twilio')
+    return Client(account_sid, auth_token, http_client=http_client)
+
+
+def _route_optimizer(config):
+    from app.services.route_optimizer import RouteOptimizer
+    return RouteOptimizer()
+
+
+def _notifications(config):
+    from app.services.notification import NotificationService
+    return NotificationService()
+
+
+def _payments(config):
+    from app.services.payment import PaymentService
+    return PaymentService()
+
+
+def _geocoding(config):
+    from app.services.geocoding import GeocodingService
+    return GeocodingService()
+
+
+for _provider in ('googlemaps', 'stripe', 'razorpay', 'twilio'):
+    ServiceContainer.register(f'http.{_provider}', _http_session(_provider))
+ServiceContainer.register('googlemaps', _googlemaps)
+ServiceContainer.register('stripe', _stripe)
+ServiceContainer.register('razorpay', _razorpay)
+ServiceContainer.register('twilio', _twilio)
+ServiceContainer.register('route_optimizer', _route_optimizer)
+ServiceContainer.register('notifications', _notifications)
+ServiceContainer.register('payments', _payments)
+ServiceContainer.register('geocoding', _geocoding)
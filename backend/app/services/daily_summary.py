@@ -0,0 +1,162 @@
+from flask import current_app
+from app.models.user import User
+from app.models.order import Order
+from app.models.notification import Notification, NotificationOutbox
+from app.services.notification import NotificationService
+from app.services.notification_outbox import NotificationOutboxService
+from app.services.notification_templates import NotificationTemplates
+from app.utils.dates import local_today, day_range, within
+from app import db
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import String, cast, exists, func
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DailySummaryService:
+    """Service for the hawkers' daily delivery summary, built set-wise and safe to re-run."""
+
+    NOTIFICATION_TYPE = 'daily_delivery_summary'
+    DELIVERY_STATUSES = ('accepted', 'picked_up')
+
+    @staticmethod
+    def _pending_summaries(day):
+        """
+        One query for every active hawker not yet summarised for the day,
+        with their delivery count and "id:status" list.
+        """
+        start, end = day_range(day)
+
+        deliveries = db.session.query(
+            Order.hawker_id.label('hawker_id'),
+            func.count(Order.id).label('delivery_count'),
+            func.aggregate_strings(cast(Order.id, String) + ':' + Order.status, ',').label('deliveries')
+        ).filter(
+            Order.status.in_(DailySummaryService.DELIVERY_STATUSES),
+            *within(Order.created_at, start, end)
+        ).group_by(Order.hawker_id).subquery()
+
+        # Hawkers already summarised for this day (by an earlier, interrupted run)
+        # are skipped. Summaries are stamped with the run time, not the day they
+        # cover, so match on data.day; a summary is never written before its
+        # day starts, which keeps the created_at bound usable by the index.
+        already_sent = exists().where(
+            Notification.user_id == User.id,
+            Notification.type == DailySummaryService.NOTIFICATION_TYPE,
+            Notification.created_at >= start,
+            Notification.data['day'].as_string() == day.isoformat()
+        )
+
+        return db.session.query(
+            User, deliveries.c.delivery_count, deliveries.c.deliveries
+        ).outerjoin(
+            deliveries, deliveries.c.hawker_id == User.id
+        ).filter(
+            User.role == 'hawker',
+            User.is_active == True,  # noqa: E712
+            ~already_sent
+        ).order_by(User.id).all()
+
+    @staticmethod
+    def _parse_deliveries(value):
+        deliveries = []
+        for item in (value or '').split(','):
+            if item:
+                order_id, status = item.split(':', 1)
+                deliveries.append((int(order_id), status))
+        return sorted(deliveries)
+
+    @staticmethod
+    def queue(day=None, batch_size=None, progress=None):
+        """
+        Record every hawker's summary and queue its email/SMS/push deliveries.
+
+        Each chunk of hawkers is committed as one bulk Notification insert
+        plus one outbox enqueue. Outbox keys are per hawker and day, and
+        hawkers whose summary already exists are skipped, so a run that
+        crashed halfway can simply be started again.
+
+        Args:
+            day (date, optional): Local day to summarise; defaults to today
+            batch_size (int, optional): Hawkers per commit; defaults to DAILY_SUMMARY_BATCH_SIZE
+            progress (callable, optional): Called with (done, total) after each chunk
+
+        Returns:
+            int: Number of hawkers summarised by this run
+        """
+        day = day or local_today()
+        batch_size = batch_size or current_app.config.get('DAILY_SUMMARY_BATCH_SIZE', 500)
+
+        rows = DailySummaryService._pending_summaries(day)
+        total = len(rows)
+
+        for start in range(0, total, batch_size):
+            chunk = rows[start:start + batch_size]
+            now = datetime.utcnow()
+            notifications = []
+            outbox = []
+
+            for hawker, delivery_count, delivery_list in chunk:
+                deliveries = DailySummaryService._parse_deliveries(delivery_list)
+                rendered = NotificationTemplates.render_daily_summary(deliveries)
+                key = f"{DailySummaryService.NOTIFICATION_TYPE}:{day.isoformat()}:user:{hawker.id}"
+
+                notifications.append({
+                    'user_id': hawker.id,
+                    'type': DailySummaryService.NOTIFICATION_TYPE,
+                    'title': rendered.title,
+                    'message': rendered.message,
+                    'data': {'day': day.isoformat(), 'delivery_count': delivery_count or 0},
+                    'read': False,
+                    'created_at': now
+                })
+                outbox.extend(NotificationService.build_channel_entries(
+                    hawker,
+                    DailySummaryService.NOTIFICATION_TYPE,
+                    rendered,
+                    lambda channel, key=key: f"{key}:{channel}",
+                    {'type': DailySummaryService.NOTIFICATION_TYPE, 'day': day.isoformat()}
+                ))
+
+            Notification.bulk_create(notifications)
+            NotificationOutbox.enqueue(outbox)
+            db.session.commit()
+
+            done = start + len(chunk)
+            logger.info(f"Daily summary {day}: queued {done}/{total} hawkers")
+            if progress:
+                progress(done, total)
+
+        return total
+
+    @staticmethod
+    def dispatch(channels=None, progress=None):
+        """
+        Drain the outbox for several channels in parallel until nothing is due.
+
+        Args:
+            channels (tuple, optional): Channels to drain; defaults to all
+            progress (callable, optional): Called with (channel, sent, retried, failed) per batch
+
+        Returns:
+            dict: channel -> (sent, retried, failed) totals
+        """
+        app = current_app._get_current_object()
+        channels = channels or NotificationOutboxService.CHANNELS
+
+        def drain(channel):
+            totals = [0, 0, 0]
+            with app.app_context():
+                while True:
+                    counts = NotificationOutboxService.drain(channel)
+                    if not any(counts):
+                        break
+                    totals = [total + count for total, count in zip(totals, counts)]
+                    logger.info(f"Dispatch {channel}: {totals[0]} sent, {totals[1]} retrying, {totals[2]} failed")
+                    if progress:
+                        progress(channel, *totals)
+            return tuple(totals)
+
+        with ThreadPoolExecutor(max_workers=len(channels)) as executor:
+            return dict(zip(channels, executor.map(drain, channels)))
@@ -0,0 +1,181 @@
+from flask import current_app
+from app import mail
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import smtplib
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SMTPConnectionPool:
+    """Bounded pool of long-lived Flask-Mail SMTP connections."""
+
+    def __init__(self, size, max_idle):
+        self.size = size
+        self.max_idle = max_idle
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []  # (connection, last_used) pairs, most recently used last
+
+    def _open(self):
+        connection = mail.connect()
+        connection.__enter__()
+        return connection
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.__exit__(None, None, None)
+        except Exception:
+            pass
+
+    def _checkout(self):
+        """Reuse the most recently used idle connection, dropping stale ones."""
+        now = time.monotonic()
+        stale = []
+        connection = None
+        with self._lock:
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if now - last_used <= self.max_idle:
+                    connection = candidate
+                    break
+                stale.append(candidate)
+        for candidate in stale:
+            self._close(candidate)
+        return connection or self._open()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; at most `size` are in use at any time."""
+        self._slots.acquire()
+        connection = None
+        try:
+            connection = self._checkout()
+            yield connection
+        except Exception:
+            # Dropped, or possibly mid-transaction; don't hand it out again
+            if connection:
+                self._close(connection)
+            connection = None
+            raise
+        finally:
+            if connection:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+            self._slots.release()
+
+    def close_all(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close(connection)
+
+
+class EmailDeliveryService:
+    """Service for sending email over pooled, reused SMTP connections."""
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    @classmethod
+    def get_pool(cls):
+        """Get or create the connection pool for the current application."""
+        app = current_app._get_current_object()
+        with cls._pools_lock:
+            pool = cls._pools.get(app.name)
+            if pool is None:
+                pool = SMTPConnectionPool(
+                    size=app.config.get('MAIL_POOL_SIZE', 4),
+                    max_idle=app.config.get('MAIL_CONNECTION_MAX_IDLE', 60)
+                )
+                cls._pools[app.name] = pool
+        return pool
+
+    @classmethod
+    def send(cls, message):
+        """
+        Send a single message over a pooled connection.
+
+        Args:
+            message (flask_mail.Message): Message to send
+
+        Returns:
+            bool: True if the message was accepted by the SMTP server
+        """
+        return cls.send_batch([message])[0][0]
+
+    @classmethod
+    def send_batch(cls, messages):
+        """
+        Send many messages, reusing each SMTP connection for a chunk of them.
+
+        Chunks of MAIL_BATCH_SIZE messages are sent in parallel, limited by
+        the pool size, so a large batch never opens more than MAIL_POOL_SIZE
+        connections.
+
+        Args:
+            messages (list): flask_mail.Message objects
+
+        Returns:
+            list: (sent, error) tuples in the same order as messages
+        """
+        if not messages:
+            return []
+
+        app = current_app._get_current_object()
+        pool = cls.get_pool()
+        chunk_size = max(1, app.config.get('MAIL_BATCH_SIZE', 50))
+        chunks = [list(range(i, min(i + chunk_size, len(messages))))
+                  for i in range(0, len(messages), chunk_size)]
+        results = [(False, None)] * len(messages)
+
+        def send_chunk(indexes):
+            with app.app_context():
+                cls._send_chunk(pool, messages, indexes, results)
+
+        if len(chunks) == 1:
+            send_chunk(chunks[0])
+        else:
+            with ThreadPoolExecutor(max_workers=min(pool.size, len(chunks))) as executor:
+                list(executor.map(send_chunk, chunks))
+
+        failed = sum(1 for sent, _ in results if not sent)
+        if failed:
+            logger.warning(f"Email batch: {len(messages) - failed} sent, {failed} failed")
+        return results
+
+    @staticmethod
+    def _send_chunk(pool, messages, indexes, results):
+        """Send a chunk on one connection, reconnecting once if the server drops us."""
+        pending = list(indexes)
+        reconnects = 0
+        while pending:
+            try:
+                with pool.connection() as connection:
+                    while pending:
+                        index = pending[0]
+                        try:
+                            connection.send(messages[index])
+                            results[index] = (True, None)
+                        except smtplib.SMTPServerDisconnected:
+                            raise
+                        except Exception as e:
+                            logger.error(f"Failed to send email: {str(e)}")
+                            results[index] = (False, str(e))
+                        pending.pop(0)
+            except smtplib.SMTPServerDisconnected as e:
+                reconnects += 1
+                if reconnects > 1:
+                    for index in pending:
+                        results[index] = (False, str(e))
+                    return
+            except Exception as e:
+                # Could not connect at all
+                logger.error(f"SMTP connection error: {str(e)}")
+                for index in pending:
+                    results[index] = (False, str(e))
+                return
@@ -1,14 +1,13 @@
-import googlemaps
 from flask import current_app
 from datetime import datetime
 import logging
+from app.services.container import ServiceContainer
 
 class GeocodingService:
     """Service for handling geocoding operations using Google Maps API"""
     
     _instance = None
     _initialized = False
-    _client = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -20,18 +19,12 @@ class GeocodingService:
             GeocodingService._initialized = True
     
     def _get_client(self):
-        """Get or initialize the Google Maps client"""
-        if GeocodingService._client is None:
-            try:
-                api_key = current_app.config.get('GOOGLE_MAPS_API_KEY')
-                if api_key:
-                    GeocodingService._client = googlemaps.Client(key=api_key)
-                else:
-                    logging.warning("Google Maps API key not configured. Geocoding service will be disabled.")
-            except RuntimeError:
-                logging.warning("Cannot access application context. Geocoding service will be disabled.")
-        
-        return GeocodingService._client
+        """Get the worker's shared Google Maps client"""
+        try:
+            return ServiceContainer.get('googlemaps')
+        except RuntimeError:
+            logging.warning("Cannot access application context. Geocoding service will be disabled.")
+            return None
     
     def geocode_address(self, address):
         """
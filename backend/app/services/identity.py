@@ -0,0 +1,155 @@
+from flask import current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app import db
+from app.database import use_primary
+from collections import namedtuple
+import threading
+import time
+
+# The columns authorization needs, cached across requests
+UserSnapshot = namedtuple('UserSnapshot', ['id', 'role', 'is_active'])
+
+
+class IdentityService:
+    """
+    Service resolving the current user from JWT claims with as few queries as possible.
+
+    Access tokens carry the user's role and active flag, so role checks read
+    the token. The full User row is loaded at most once per request and kept
+    on flask.g. Snapshots of (role, is_active) are cached per process for
+    USER_CACHE_TTL seconds; an update committed in this process replaces the
+    snapshot straight away and takes precedence over the token's claims,
+    while other processes pick up the change when the token is refreshed.
+    """
+
+    # Session.info key collecting snapshots of updated users, cached on commit
+    DIRTY_KEY = 'identity_dirty_users'
+
+    _cache = {}  # user_id -> (UserSnapshot, expires_at)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def claims_for(user):
+        """Extra JWT claims for create_access_token(additional_claims=...)."""
+        return {'role': user.role, 'active': bool(user.is_active)}
+
+    @staticmethod
+    def current_user_id():
+        return get_jwt_identity()
+
+    @classmethod
+    def current_user(cls):
+        """
+        The authenticated User, loaded once per request.
+
+        Returns:
+            User or None: None if the user no longer exists
+        """
+        if 'current_user' not in g:
+            # Deactivations and role changes must take effect at once, so never a replica
+            with use_primary():
+                g.current_user = db.session.get(User, cls.current_user_id())
+        return g.current_user
+
+    @classmethod
+    def current_role(cls):
+        """
+        The authenticated user's role, without a query in the common case.
+
+        Returns:
+            str or None: None for deactivated or deleted users
+        """
+        user_id = cls.current_user_id()
+        snapshot = cls._cached(user_id)
+        if snapshot is None:
+            claims = get_jwt()
+            if 'role' in claims:
+                return claims['role'] if claims.get('active', True) else None
+            # Token issued before roles were embedded
+            snapshot = cls.snapshot(user_id)
+        return snapshot.role if snapshot and snapshot.is_active else None
+
+    @classmethod
+    def snapshot(cls, user_id):
+        """
+        A user's role and active flag from the cache, or one narrow query.
+
+        Returns:
+            UserSnapshot or None: None if the user does not exist
+        """
+        snapshot = cls._cached(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        if 'current_user' in g and g.current_user is not None and str(g.current_user.id) == str(user_id):
+            user = g.current_user
+            snapshot = UserSnapshot(user.id, user.role, user.is_active)
+        else:
+            with use_primary():
+                row = db.session.query(User.id, User.role, User.is_active).filter(User.id == user_id).first()
+            if row is None:
+                return None
+            snapshot = UserSnapshot(*row)
+
+        cls._store([snapshot])
+        return snapshot
+
+    @classmethod
+    def _cached(cls, user_id):
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        cached = cls._cache.get(user_id)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        return None
+
+    @classmethod
+    def _store(cls, snapshots):
+        try:
+            ttl = current_app.config.get('USER_CACHE_TTL', 30)
+            max_size = current_app.config.get('USER_CACHE_MAX_SIZE', 10000)
+        except RuntimeError:
+            # No application context (e.g. a script without create_app); nothing to cache for
+            return
+
+        expires_at = time.monotonic() + ttl
+        with cls._lock:
+            for snapshot in snapshots:
+                cls._cache.pop(snapshot.id, None)
+                cls._cache[snapshot.id] = (snapshot, expires_at)
+            # Dicts keep insertion order, so the first keys are the oldest entries
+            while len(cls._cache) > max_size:
+                cls._cache.pop(next(iter(cls._cache)))
+
+
+@event.listens_for(User, 'after_update')
+def _user_updated(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.role.history.has_changes() or state.attrs.is_active.history.has_changes():
+        state.session.info.setdefault(IdentityService.DIRTY_KEY, {})[target.id] = UserSnapshot(
+            target.id, target.role, target.is_active
+        )
+
+
+@event.listens_for(User, 'after_delete')
+def _user_deleted(mapper, connection, target):
+    inspect(target).session.info.setdefault(IdentityService.DIRTY_KEY, {})[target.id] = UserSnapshot(
+        target.id, target.role, False
+    )
+
+
+@event.listens_for(Session, 'after_commit')
+def _cache_committed_users(session):
+    snapshots = session.info.pop(IdentityService.DIRTY_KEY, None)
+    if snapshots:
+        IdentityService._store(snapshots.values())
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dirty_users(session):
+    session.info.pop(IdentityService.DIRTY_KEY, None)
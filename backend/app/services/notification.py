@@ -1,12 +1,16 @@
 from flask import current_app
-from app import mail
 from flask_mail import Message
 from app.models.user import User
 from app.models.order import Order
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationOutbox
 from app import db
 from datetime import datetime
 from app.services.sms_notification import SMSNotificationService
+from app.services.email_delivery import EmailDeliveryService
+from app.services.notification_templates import NotificationTemplates
+from app.services.notification_digest import NotificationDigestService
+import hashlib
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +20,9 @@ class NotificationService:
     
     _sms_service = None
     
+    # Sent immediately by every channel, never coalesced into a digest
+    CRITICAL_TYPES = ('order_delivered', 'order_cancelled', 'account_deactivated')
+    
     @classmethod
     def get_sms_service(cls):
         """Get or create SMS service instance."""
@@ -60,113 +67,26 @@ class NotificationService:
     
     @staticmethod
     def send_email_notification(to_email, subject, html_content):
-        """Send an email notification."""
+        """Send an email notification over a pooled SMTP connection."""
         try:
             msg = Message(
                 subject=subject,
                 recipients=[to_email],
                 html=html_content
             )
-            mail.send(msg)
-            return True
+            return EmailDeliveryService.send(msg)
         except Exception as e:
             logger.error(f"Failed to send email: {str(e)}")
             return False
     
-    @staticmethod
-    def send_hawker_daily_notification(hawker_id):
-        """
-        Send daily notification to hawker about their deliveries.
-        This should be called before 4 PM to inform hawkers about their deliveries.
-        """
-        try:
-            hawker = User.query.get(hawker_id)
-            if not hawker:
-                logger.error(f"Hawker {hawker_id} not found")
-                return False
-            
-            # Get today's pending deliveries
-            from datetime import datetime, timedelta
-            today = datetime.utcnow().date()
-            tomorrow = today + timedelta(days=1)
-            
-            pending_deliveries = Order.query.filter(
-                Order.hawker_id == hawker_id,
-                Order.status.in_(['accepted', 'picked_up']),
-                Order.created_at >= today,
-                Order.created_at < tomorrow
-            ).all()
-            
-            # Prepare notification content
-            if pending_deliveries:
-                title = "You Have Deliveries Today"
-                message = f"You have {len(pending_deliveries)} delivery{'s' if len(pending_deliveries) > 1 else ''} today."
-                email_html = f"""
-                <html>
-                <body>
-                    <h1>{title}</h1>
-                    <p>{message}</p>
-                    <h2>Your Deliveries:</h2>
-                    <ul>
-                    {''.join(f'<li>Order #{order.id} - {order.status}</li>' for order in pending_deliveries)}
-                    </ul>
-                    <p>Please check your app for more details.</p>
-                </body>
-                </html>
-                """
-            else:
-                title = "No Deliveries Today"
-                message = "You have no deliveries scheduled for today."
-                email_html = f"""
-                <html>
-                <body>
-                    <h1>{title}</h1>
-                    <p>{message}</p>
-                </body>
-                </html>
-                """
-            
-            # Create notification record
-            notification = Notification(
-                user_id=hawker_id,
-                type='daily_delivery_summary',
-                title=title,
-                message=message,
-                data={'delivery_count': len(pending_deliveries)}
-            )
-            
-            db.session.add(notification)
-            db.session.commit()
-            
-            # Send email notification
-            if hawker.email_notifications:
-                NotificationService.send_email_notification(
-                    hawker.email,
-                    title,
-                    email_html
-                )
-            
-            # Send SMS if enabled and phone number exists
-            if hawker.sms_notifications and hawker.phone:
-                try:
-                    NotificationService.get_sms_service().send_sms(
-                        hawker.phone,
-                        message
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send SMS: {str(e)}")
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error sending hawker daily notification: {str(e)}")
-            return False
-    
     @staticmethod
     def send_order_notification(order_id, notification_type, data=None):
         """
         Send notifications related to orders to both customers and hawkers.
         
+        Records the in-app notifications and the email/SMS/push delivery
+        intents, then commits. Providers are contacted by the outbox workers.
+        
         Args:
             order_id: ID of the order
             notification_type: Type of notification (e.g., 'order_created', 'order_accepted')
@@ -178,131 +98,157 @@ class NotificationService:
                 logger.error(f"Order {order_id} not found")
                 return False
             
-            # Get notification content
-            title = NotificationService._get_notification_title(notification_type, order)
-            message = NotificationService._get_notification_message(notification_type, order, data)
-            
-            # Create notification record
-            notification = Notification(
-                user_id=order.customer_id,
-                type=notification_type,
-                title=title,
-                message=message,
-                data=data or {},
-                related_id=order_id,
-                related_type='order'
-            )
-            
-            # Also notify hawker if applicable
-            if order.hawker_id and notification_type in ['order_accepted', 'order_picked_up', 'order_delivered']:
-                hawker_notification = Notification(
-                    user_id=order.hawker_id,
-                    type=notification_type,
-                    title=title,
-                    message=message,
-                    data=data or {},
-                    related_id=order_id,
-                    related_type='order'
-                )
-                db.session.add(hawker_notification)
-            
-            db.session.add(notification)
+            NotificationService.queue_order_notification(order, notification_type, data)
             db.session.commit()
             
-            # Send email if enabled
-            customer = User.query.get(order.customer_id)
-            if customer and customer.notify_email:
-                email_html = NotificationService._get_email_template(notification_type, order, data)
-                NotificationService.send_email_notification(
-                    customer.email,
-                    title,
-                    email_html
-                )
-            
-            # Send SMS if enabled
-            if customer and customer.notify_sms and customer.phone:
-                try:
-                    NotificationService.get_sms_service().send_sms(
-                        customer.phone,
-                        message
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send SMS: {str(e)}")
-            
             return True
             
         except Exception as e:
+            db.session.rollback()
             logger.error(f"Error sending order notification: {str(e)}")
             return False
     
     @staticmethod
-    def _get_notification_title(notification_type, order):
-        """Get the title for an order notification."""
-        titles = {
-            'order_created': 'New Order Created',
-            'order_accepted': 'Order Accepted',
-            'order_picked_up': 'Order Picked Up',
-            'order_delivered': 'Order Delivered',
-            'order_cancelled': 'Order Cancelled',
-            'order_expired': 'Order Expired',
-            'payment_successful': 'Payment Successful',
-            'payment_failed': 'Payment Failed',
-            'eta_updated': 'ETA Updated'
-        }
-        return titles.get(notification_type, 'Order Update')
+    def queue_order_notification(order, notification_type, data=None):
+        """
+        Add an order notification to the caller's transaction without committing.
+        
+        Args:
+            order: Order the notification is about
+            notification_type: Type of notification (e.g., 'order_cancelled')
+            data: Additional data for the notification
+        """
+        # Render once and reuse for the in-app records and every channel
+        rendered = NotificationTemplates.render(notification_type, order, data)
+        notification_data = dict(data or {}, order_id=order.id)
+        notify_hawker = order.hawker_id and notification_type in ['order_accepted', 'order_picked_up', 'order_delivered']
+        
+        # Chatty, non-critical events wait in the digest buffer instead
+        if NotificationDigestService.should_buffer(notification_type):
+            recipients = [(order.customer_id, True)]
+            if notify_hawker:
+                recipients.append((order.hawker_id, False))
+            NotificationDigestService.buffer(order, notification_type, notification_data, rendered, recipients)
+            return
+        
+        # Buffered updates about this order are superseded by a critical one
+        NotificationDigestService.discard(order.id)
+        
+        # Create notification record
+        db.session.add(Notification(
+            user_id=order.customer_id,
+            type=notification_type,
+            title=rendered.title,
+            message=rendered.message,
+            data=notification_data
+        ))
+        
+        # Also notify hawker if applicable
+        if notify_hawker:
+            db.session.add(Notification(
+                user_id=order.hawker_id,
+                type=notification_type,
+                title=rendered.title,
+                message=rendered.message,
+                data=notification_data
+            ))
+        
+        customer = User.query.get(order.customer_id)
+        NotificationOutbox.enqueue(
+            NotificationService.build_outbox_entries(customer, notification_type, order, data, rendered)
+        )
     
     @staticmethod
-    def _get_notification_message(notification_type, order, data=None):
-        """Get the message for an order notification."""
-        messages = {
-            'order_created': f'Your order #{order.id} has been created and is waiting for a hawker to accept it.',
-            'order_accepted': f'Your order #{order.id} has been accepted by a hawker and is being prepared.',
-            'order_picked_up': f'Your order #{order.id} has been picked up and is on its way to you.',
-            'order_delivered': f'Your order #{order.id} has been delivered. Enjoy your meal!',
-            'order_cancelled': f'Your order #{order.id} has been cancelled.',
-            'order_expired': f'Your order #{order.id} has expired because no hawker accepted it within the time limit.',
-            'payment_successful': f'Payment for order #{order.id} was successful.',
-            'payment_failed': f'Payment for order #{order.id} failed. Please try again.',
-            'eta_updated': f'The estimated delivery time for your order #{order.id} has been updated.'
-        }
+    def build_outbox_entries(customer, notification_type, order, data=None, rendered=None):
+        """
+        Build the per-channel delivery intents for an order notification.
         
-        message = messages.get(notification_type, f'Update for your order #{order.id}')
+        Args:
+            customer: User receiving the notification
+            notification_type: Type of notification (e.g., 'order_expired')
+            order: Order (or row with the same attributes) the notification is about
+            data: Additional data for the notification
+            rendered: RenderedNotification for this event, rendered here if omitted
+            
+        Returns:
+            list: Outbox entries for NotificationOutbox.enqueue
+        """
+        if not customer:
+            return []
         
-        # Add ETA if available
-        if order.eta and notification_type in ['order_accepted', 'order_picked_up', 'eta_updated']:
-            message += f' Estimated delivery time: {order.eta.strftime("%I:%M %p")}'
+        rendered = rendered or NotificationTemplates.render(notification_type, order, data)
         
-        return message
+        return NotificationService.build_channel_entries(
+            customer,
+            notification_type,
+            rendered,
+            lambda channel: NotificationService._idempotency_key(notification_type, order.id, customer.id, channel, data),
+            {'type': notification_type, 'order_id': str(order.id)}
+        )
     
     @staticmethod
-    def _get_email_template(notification_type, order, data=None):
-        """Get the HTML email template for an order notification."""
-        # This would typically load from a template file
-        # For now, we'll return a simple HTML template
-        return f"""
-        <html>
-        <body>
-            <h1>{NotificationService._get_notification_title(notification_type, order)}</h1>
-            <p>{NotificationService._get_notification_message(notification_type, order, data)}</p>
-            <p>Order ID: {order.id}</p>
-            <p>Thank you for using HawkeRoute!</p>
-        </body>
-        </html>
+    def build_channel_entries(user, notification_type, rendered, key_for, push_data):
         """
+        Build email/SMS/push outbox entries for already rendered content.
+        
+        A channel is skipped unless the user has it switched on, has an
+        address for it and wants this notification type on it.
+        
+        Args:
+            user: User receiving the notification
+            notification_type: Type recorded on the entries
+            rendered: RenderedNotification with title, message and html
+            key_for: Callable mapping a channel name to its idempotency key
+            push_data: String-valued data dict for the push payload
+            
+        Returns:
+            list: Outbox entries for NotificationOutbox.enqueue
+        """
+        entries = []
+        
+        def add(channel, payload):
+            entries.append({
+                'idempotency_key': key_for(channel),
+                'channel': channel,
+                'user_id': user.id,
+                'notification_type': notification_type,
+                'payload': payload
+            })
+        
+        if user.notify_email and user.email and NotificationService._should_send_email(user, notification_type):
+            add('email', {
+                'to': user.email,
+                'subject': rendered.title,
+                'html': rendered.html
+            })
+        
+        if user.notify_sms and user.phone and NotificationService._should_send_sms(user, notification_type):
+            add('sms', {
+                'to': user.phone,
+                'body': rendered.message
+            })
+        
+        if user.notify_push and user.device_tokens and NotificationService._should_send_push(user, notification_type):
+            add('push', {
+                'title': rendered.title,
+                'body': rendered.message,
+                'data': push_data
+            })
+        
+        return entries
+    
+    @staticmethod
+    def _idempotency_key(notification_type, order_id, user_id, channel, data=None):
+        """Key identifying one delivery of one order event to one user on one channel."""
+        digest = hashlib.sha1(json.dumps(data or {}, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        return f"{notification_type}:order:{order_id}:user:{user_id}:{channel}:{digest}"
     
     @staticmethod
     def _should_send_email(user, notification_type):
         """Check if email notification should be sent based on user preferences"""
         if notification_type.startswith('order_'):
-            if notification_type == 'order_created' and not user.notify_order_created:
-                return False
-            if notification_type == 'order_accepted' and not user.notify_order_accepted:
-                return False
-            if notification_type == 'order_picked_up' and not user.notify_order_picked_up:
-                return False
-            if notification_type == 'order_delivered' and not user.notify_order_delivered:
-                return False
-            if notification_type == 'order_cancelled' and not user.notify_order_cancelled:
+            # Statuses without a preference column (e.g. order_picked_up) are always on
+            if not getattr(user, f'notify_{notification_type}', True):
                 return False
         elif notification_type == 'account_updates' and not user.notify_account_updates:
             return False
@@ -320,5 +266,4 @@ class NotificationService:
     def _should_send_sms(user, notification_type):
         """Check if SMS notification should be sent based on user preferences"""
         # SMS notifications are more limited to critical updates
-        critical_types = ['order_delivered', 'order_cancelled', 'account_deactivated']
-        return notification_type in critical_types and NotificationService._should_send_email(user, notification_type) 
\ No newline at end of file
+        return notification_type in NotificationService.CRITICAL_TYPES and NotificationService._should_send_email(user, notification_type) 
\ No newline at end of file
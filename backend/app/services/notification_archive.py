@@ -0,0 +1,156 @@
+from flask import current_app
+from app.models.notification import Notification, NotificationArchive
+from app import db
+from datetime import datetime, timedelta
+from sqlalchemy import func, literal, select, union_all
+import math
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotificationArchiveService:
+    """Service for moving old read notifications to the archive and reading history across both tables."""
+
+    @staticmethod
+    def archive(days=None, batch_size=None, max_batches=None):
+        """
+        Archive read notifications older than the hot retention period.
+
+        Each batch is committed on its own, so no lock is held for longer
+        than one batch; whatever is left after max_batches is picked up by
+        the next run.
+
+        Args:
+            days (int, optional): Hot retention; defaults to NOTIFICATION_HOT_DAYS
+            batch_size (int, optional): Rows per batch; defaults to NOTIFICATION_ARCHIVE_BATCH_SIZE
+            max_batches (int, optional): Batches per run; defaults to NOTIFICATION_ARCHIVE_MAX_BATCHES
+
+        Returns:
+            int: Number of notifications archived
+        """
+        days = days or current_app.config.get('NOTIFICATION_HOT_DAYS', 30)
+        batch_size = batch_size or current_app.config.get('NOTIFICATION_ARCHIVE_BATCH_SIZE', 1000)
+        max_batches = max_batches or current_app.config.get('NOTIFICATION_ARCHIVE_MAX_BATCHES', 50)
+        before = datetime.utcnow() - timedelta(days=days)
+
+        total = 0
+        for _ in range(max_batches):
+            moved = NotificationArchive.archive(before, batch_size)
+            db.session.commit()
+            total += moved
+            if moved < batch_size:
+                break
+
+        if total:
+            logger.info(f"Archived {total} notifications read before {before.isoformat()}")
+        return total
+
+    @staticmethod
+    def purge(days=None, batch_size=None, max_batches=None):
+        """
+        Delete archived notifications past the archive retention period.
+
+        Args:
+            days (int, optional): Archive retention; defaults to NOTIFICATION_ARCHIVE_RETENTION_DAYS,
+                where 0 keeps archived notifications forever
+
+        Returns:
+            int: Number of archived notifications deleted
+        """
+        days = days if days is not None else current_app.config.get('NOTIFICATION_ARCHIVE_RETENTION_DAYS', 0)
+        if not days:
+            return 0
+        batch_size = batch_size or current_app.config.get('NOTIFICATION_ARCHIVE_BATCH_SIZE', 1000)
+        max_batches = max_batches or current_app.config.get('NOTIFICATION_ARCHIVE_MAX_BATCHES', 50)
+        before = datetime.utcnow() - timedelta(days=days)
+
+        total = 0
+        for _ in range(max_batches):
+            deleted = NotificationArchive.purge(before, batch_size)
+            db.session.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+
+        if total:
+            logger.info(f"Purged {total} archived notifications created before {before.isoformat()}")
+        return total
+
+    @staticmethod
+    def _select(model, archived, user_id, notification_type=None, read=None, start_date=None, end_date=None):
+        query = select(
+            model.id.label('id'),
+            model.created_at.label('created_at'),
+            literal(archived).label('archived')
+        ).where(model.user_id == user_id)
+
+        if notification_type:
+            query = query.where(model.type == notification_type)
+        if read is not None and not archived:
+            query = query.where(model.read == read)
+        if start_date:
+            query = query.where(model.created_at >= start_date)
+        if end_date:
+            query = query.where(model.created_at <= end_date)
+        return query
+
+    @staticmethod
+    def history(user_id, page=1, per_page=20, notification_type=None, read=None, start_date=None, end_date=None):
+        """
+        Page through a user's notifications, newest first, hot and archived alike.
+
+        Pagination runs over (id, created_at) keys of both tables; only the
+        rows on the requested page are then loaded, and only archived rows on
+        that page are decompressed.
+
+        Args:
+            user_id (int): Owner of the notifications
+            page (int): 1-based page number
+            per_page (int): Notifications per page
+            notification_type (str, optional): Only this type
+            read (bool, optional): Only read (True) or unread (False) notifications
+            start_date (datetime, optional): Created at or after
+            end_date (datetime, optional): Created at or before
+
+        Returns:
+            dict: notifications (list of dicts), total, pages, current_page
+
+        Raises:
+            ValueError: If page or per_page is less than 1
+        """
+        if page < 1 or per_page < 1:
+            raise ValueError("page and per_page must be at least 1")
+
+        filters = dict(
+            user_id=user_id, notification_type=notification_type,
+            read=read, start_date=start_date, end_date=end_date
+        )
+        selects = [NotificationArchiveService._select(Notification, False, **filters)]
+        # Only read notifications are ever archived
+        if read is not False:
+            selects.append(NotificationArchiveService._select(NotificationArchive, True, **filters))
+
+        keys = union_all(*selects).subquery() if len(selects) > 1 else selects[0].subquery()
+
+        total = db.session.query(func.count()).select_from(keys).scalar()
+        page_keys = db.session.query(keys.c.id, keys.c.archived).order_by(
+            keys.c.created_at.desc(), keys.c.id.desc()
+        ).limit(per_page).offset((page - 1) * per_page).all()
+
+        hot_ids = [id for id, archived in page_keys if not archived]
+        archived_ids = [id for id, archived in page_keys if archived]
+        rows = {}
+        if hot_ids:
+            rows.update({(n.id, False): n for n in Notification.query.filter(Notification.id.in_(hot_ids))})
+        if archived_ids:
+            rows.update({(n.id, True): n for n in NotificationArchive.query.filter(NotificationArchive.id.in_(archived_ids))})
+
+        return {
+            'notifications': [
+                rows[(id, bool(archived))].to_dict()
+                for id, archived in page_keys if (id, bool(archived)) in rows
+            ],
+            'total': total,
+            'pages': math.ceil(total / per_page),
+            'current_page': page
+        }
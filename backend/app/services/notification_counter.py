@@ -0,0 +1,119 @@
+from flask import current_app
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.notification import NotificationCounter
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class UnreadCounterService:
+    """Service serving unread-notification badges from Redis, with an in-process fallback."""
+
+    KEY_PREFIX = 'notifications:unread:'
+
+    _redis = None
+    _redis_url = None
+    _redis_down_until = 0.0
+    _local = {}  # user_id -> (count, expires_at), used while Redis is unavailable
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_redis(cls):
+        url = current_app.config.get('REDIS_URL')
+        if not url or time.monotonic() < cls._redis_down_until:
+            return None
+        if cls._redis is None or cls._redis_url != url:
+            cls._redis = Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+            cls._redis_url = url
+        return cls._redis
+
+    @classmethod
+    def _redis_failed(cls, error):
+        # Back off for a while instead of paying the timeout on every poll
+        logger.warning(f"Unread counter cache unavailable, using local cache: {str(error)}")
+        cls._redis_down_until = time.monotonic() + 30
+
+    @classmethod
+    def get(cls, user_id):
+        """
+        Get a user's unread notification count.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            int: Number of unread notifications
+        """
+        ttl = current_app.config.get('UNREAD_COUNT_CACHE_TTL', 60)
+        key = f"{cls.KEY_PREFIX}{user_id}"
+
+        redis = cls._get_redis()
+        if redis is not None:
+            try:
+                cached = redis.get(key)
+                if cached is not None:
+                    return int(cached)
+                count = NotificationCounter.get_unread_count(user_id)
+                # NX: never overwrite a value cached after a newer commit; the
+                # TTL bounds staleness if this read straddled one
+                redis.set(key, count, ex=ttl, nx=True)
+                return count
+            except RedisError as e:
+                cls._redis_failed(e)
+
+        now = time.monotonic()
+        with cls._lock:
+            cached = cls._local.get(user_id)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        # Other processes can't invalidate this copy, so keep it short-lived
+        count = NotificationCounter.get_unread_count(user_id)
+        max_size = current_app.config.get('UNREAD_COUNT_LOCAL_MAX_SIZE', 10000)
+        with cls._lock:
+            cls._local.pop(user_id, None)
+            cls._local[user_id] = (count, now + current_app.config.get('UNREAD_COUNT_LOCAL_TTL', 5))
+            # Dicts keep insertion order, so the first keys are the oldest
+            # entries: drop the expired ones, then any beyond the size cap
+            for oldest in list(cls._local):
+                if len(cls._local) <= max_size and cls._local[oldest][1] > now:
+                    break
+                del cls._local[oldest]
+        return count
+
+    @classmethod
+    def invalidate(cls, user_ids):
+        """Drop cached counts so the next poll reads the committed counter."""
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+
+        with cls._lock:
+            for user_id in user_ids:
+                cls._local.pop(user_id, None)
+
+        try:
+            redis = cls._get_redis()
+            if redis is not None:
+                redis.delete(*[f"{cls.KEY_PREFIX}{user_id}" for user_id in user_ids])
+        except RedisError as e:
+            cls._redis_failed(e)
+        except RuntimeError:
+            # No application context (e.g. a script without create_app); nothing cached
+            pass
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_counters(session):
+    user_ids = session.info.pop(NotificationCounter.DIRTY_KEY, None)
+    if user_ids:
+        UnreadCounterService.invalidate(user_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dirty_counters(session):
+    session.info.pop(NotificationCounter.DIRTY_KEY, None)
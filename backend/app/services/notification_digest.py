@@ -0,0 +1,212 @@
+from flask import current_app
+from app.models.notification import Notification, NotificationOutbox, NotificationDigestEntry
+from app.models.user import User
+from app.services.notification_templates import NotificationTemplates, RenderedNotification
+from app import db
+from datetime import datetime, timedelta
+from sqlalchemy import func
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotificationDigestService:
+    """Service for coalescing chatty order events into one digest per user and window."""
+
+    # Events in the same group supersede each other: the latest status, ETA
+    # or location of an order is the only one worth telling the user about.
+    COALESCE_GROUPS = {
+        'order_created': 'status',
+        'order_accepted': 'status',
+        'order_picked_up': 'status',
+        'eta_updated': 'eta',
+        'location_pickup': 'location',
+        'location_delivery': 'location'
+    }
+
+    @staticmethod
+    def should_buffer(notification_type):
+        """Critical types are always immediate; everything else waits for the window."""
+        from app.services.notification import NotificationService
+
+        window = current_app.config.get('NOTIFICATION_DIGEST_WINDOW_SECONDS', 120)
+        return window > 0 and notification_type not in NotificationService.CRITICAL_TYPES
+
+    @staticmethod
+    def coalesce_key(notification_type, order_id):
+        group = NotificationDigestService.COALESCE_GROUPS.get(notification_type, notification_type)
+        return f"{group}:{order_id}"
+
+    @staticmethod
+    def buffer(order, notification_type, data, rendered, recipients):
+        """
+        Add an event to the recipients' digest buffers without committing.
+
+        A recipient's window starts with its first buffered event, so later
+        events join the same digest rather than extending it.
+
+        Args:
+            order: Order the notification is about
+            notification_type: Type of notification (e.g., 'eta_updated')
+            data: Notification data, including order_id
+            rendered: RenderedNotification for the event
+            recipients: (user_id, deliver) pairs; deliver=False means in-app only
+        """
+        now = datetime.utcnow()
+        default_flush = now + timedelta(seconds=current_app.config.get('NOTIFICATION_DIGEST_WINDOW_SECONDS', 120))
+        user_ids = [user_id for user_id, _ in recipients]
+
+        windows = dict(db.session.query(
+            NotificationDigestEntry.user_id, func.min(NotificationDigestEntry.flush_after)
+        ).filter(
+            NotificationDigestEntry.user_id.in_(user_ids)
+        ).group_by(NotificationDigestEntry.user_id).all())
+
+        key = NotificationDigestService.coalesce_key(notification_type, order.id)
+        NotificationDigestEntry.buffer([{
+            'user_id': user_id,
+            'order_id': order.id,
+            'coalesce_key': key,
+            'notification_type': notification_type,
+            'title': rendered.title,
+            'message': rendered.message,
+            'html': rendered.html,
+            'data': data,
+            'deliver': deliver,
+            'flush_after': windows.get(user_id) or default_flush
+        } for user_id, deliver in recipients])
+
+    @staticmethod
+    def discard(order_id):
+        """Drop buffered events about an order, e.g. once it has been delivered."""
+        NotificationDigestEntry.query.filter(
+            NotificationDigestEntry.order_id == order_id
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def flush_due(batch_size=None):
+        """
+        Emit one notification per channel for every user whose window has closed.
+
+        A user with a single buffered event gets it unchanged; several events
+        are merged into one digest. Each batch of users is locked with
+        FOR UPDATE SKIP LOCKED and committed on its own.
+
+        Args:
+            batch_size (int, optional): Users per batch; defaults to NOTIFICATION_DIGEST_BATCH_SIZE
+
+        Returns:
+            int: Number of users flushed
+        """
+        batch_size = batch_size or current_app.config.get('NOTIFICATION_DIGEST_BATCH_SIZE', 500)
+        total = 0
+
+        while True:
+            due_users = db.session.query(NotificationDigestEntry.user_id).filter(
+                NotificationDigestEntry.flush_after <= datetime.utcnow()
+            ).distinct().limit(batch_size).subquery()
+
+            entries = NotificationDigestEntry.query.filter(
+                NotificationDigestEntry.user_id.in_(db.session.query(due_users.c.user_id))
+            ).order_by(
+                NotificationDigestEntry.user_id, NotificationDigestEntry.created_at
+            ).with_for_update(skip_locked=True).all()
+
+            if not entries:
+                break
+
+            by_user = {}
+            for entry in entries:
+                by_user.setdefault(entry.user_id, []).append(entry)
+
+            NotificationDigestService._emit(by_user)
+
+            NotificationDigestEntry.query.filter(
+                NotificationDigestEntry.id.in_([entry.id for entry in entries])
+            ).delete(synchronize_session=False)
+            db.session.commit()
+
+            total += len(by_user)
+            if len(by_user) < batch_size:
+                break
+
+        if total:
+            logger.info(f"Flushed notification digests for {total} users")
+        return total
+
+    @staticmethod
+    def _emit(by_user):
+        """Bulk insert the in-app rows and enqueue the deliveries for a batch."""
+        from app.services.notification import NotificationService
+
+        users = {
+            user.id: user
+            for user in User.query.filter(User.id.in_([
+                user_id for user_id, entries in by_user.items() if any(entry.deliver for entry in entries)
+            ])).all()
+        }
+
+        now = datetime.utcnow()
+        notifications = []
+        outbox = []
+        for user_id, entries in by_user.items():
+            notification_type, rendered, data, push_data = NotificationDigestService._merge(entries)
+            notifications.append({
+                'user_id': user_id,
+                'type': notification_type,
+                'title': rendered.title,
+                'message': rendered.message,
+                'data': data,
+                'read': False,
+                'created_at': now
+            })
+
+            # In-app only events (e.g. the hawker's copy) stay out of email/SMS/push
+            external = [entry for entry in entries if entry.deliver]
+            user = users.get(user_id)
+            if user and external:
+                if len(external) != len(entries):
+                    notification_type, rendered, _, push_data = NotificationDigestService._merge(external)
+                key = NotificationDigestService._idempotency_key(user_id, external)
+                outbox.extend(NotificationService.build_channel_entries(
+                    user, notification_type, rendered, lambda channel: f"{key}:{channel}", push_data
+                ))
+
+        Notification.bulk_create(notifications)
+        NotificationOutbox.enqueue(outbox)
+
+    @staticmethod
+    def _idempotency_key(user_id, entries):
+        """
+        Key identifying one user's digest for one window.
+
+        Entry ids are reused once flushed rows are deleted (SQLite), so the key
+        is built from the window and the coalesce keys it holds instead.
+        """
+        flush_after = min(entry.flush_after for entry in entries)
+        digest = hashlib.sha1(','.join(sorted(entry.coalesce_key for entry in entries)).encode()).hexdigest()[:16]
+        return f"digest:user:{user_id}:{flush_after.isoformat()}:{digest}"
+
+    @staticmethod
+    def _merge(entries):
+        """
+        Turn buffered entries into one notification.
+
+        Returns:
+            tuple: (notification_type, RenderedNotification, data, push_data)
+        """
+        if len(entries) == 1:
+            entry = entries[0]
+            return (
+                entry.notification_type,
+                RenderedNotification(entry.title, entry.message, entry.html),
+                entry.data,
+                {'type': entry.notification_type, 'order_id': str(entry.order_id)}
+            )
+
+        data = {
+            'order_ids': sorted({entry.order_id for entry in entries if entry.order_id}),
+            'events': [{'type': entry.notification_type, 'order_id': entry.order_id} for entry in entries]
+        }
+        rendered = NotificationTemplates.render_digest([entry.message for entry in entries])
+        return 'order_digest', rendered, data, {'type': 'order_digest'}
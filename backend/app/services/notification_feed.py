@@ -0,0 +1,126 @@
+from flask import current_app
+from redis import Redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.notification import Notification
+from app.services.notification_counter import UnreadCounterService
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotificationFeedService:
+    """Service pushing committed notifications to each user's Socket.IO room."""
+
+    # Write-only emitter on the Socket.IO message queue: works from web and
+    # Celery processes alike, and the Socket.IO servers fan it out to sockets
+    _emitter = None
+    _emitter_url = None
+    # python-socketio logs and swallows Redis publish failures, so Redis
+    # health is checked on a client of our own
+    _redis = None
+    _down_until = 0.0
+    _lock = threading.Lock()
+
+    # Seconds to wait on Redis from the commit path
+    REDIS_TIMEOUT = 0.25
+
+    @staticmethod
+    def room(user_id):
+        """Personal room joined in events.handle_connect."""
+        return f'user_{user_id}'
+
+    @classmethod
+    def _get_emitter(cls):
+        url = current_app.config.get('SOCKETIO_MESSAGE_QUEUE')
+        if not url or not current_app.config.get('NOTIFICATION_FEED_ENABLED', True):
+            return None
+        if time.monotonic() < cls._down_until:
+            return None
+        with cls._lock:
+            if cls._emitter is None or cls._emitter_url != url:
+                from flask_socketio import SocketIO
+                options = {}
+                cls._redis = None
+                if url.startswith(('redis://', 'rediss://')):
+                    import socketio
+                    redis_options = {'socket_timeout': cls.REDIS_TIMEOUT, 'socket_connect_timeout': cls.REDIS_TIMEOUT}
+                    options['client_manager'] = socketio.RedisManager(
+                        url, channel='flask-socketio', write_only=True, redis_options=redis_options
+                    )
+                    cls._redis = Redis.from_url(url, **redis_options)
+                cls._emitter = SocketIO(message_queue=url, **options)
+                cls._emitter_url = url
+            return cls._emitter
+
+    @classmethod
+    def _unavailable(cls, error):
+        # Back off for a while instead of paying the failure on every commit
+        logger.warning(f"Notification feed unavailable: {str(error)}")
+        cls._down_until = time.monotonic() + 30
+
+    @classmethod
+    def publish(cls, events):
+        """
+        Emit feed events to the users' rooms.
+
+        Delivery is best effort: a client that misses an event fetches it with
+        catch_up() from the last notification id it saw.
+
+        Args:
+            events (list): (user_id, event, payload) tuples
+        """
+        try:
+            emitter = cls._get_emitter()
+            if emitter is None:
+                return
+            if cls._redis is not None:
+                cls._redis.ping()
+            for user_id, name, payload in events:
+                emitter.emit(name, payload, to=cls.room(user_id))
+        except RuntimeError:
+            # No application context (e.g. a script without create_app); nobody to tell
+            pass
+        except Exception as e:
+            cls._unavailable(e)
+
+    @staticmethod
+    def catch_up(user_id, last_seen_id=None, limit=None):
+        """
+        Notifications a client missed while disconnected.
+
+        Args:
+            user_id (int): ID of the user
+            last_seen_id (int, optional): Highest notification id the client has;
+                without it only the unread count is returned
+            limit (int, optional): Maximum notifications; defaults to NOTIFICATION_FEED_CATCH_UP_LIMIT
+
+        Returns:
+            dict: notifications (oldest first), has_more and unread_count
+        """
+        limit = limit or current_app.config.get('NOTIFICATION_FEED_CATCH_UP_LIMIT', 100)
+        notifications = []
+        if last_seen_id is not None:
+            notifications = Notification.query.filter(
+                Notification.user_id == user_id,
+                Notification.id > last_seen_id
+            ).order_by(Notification.id).limit(limit + 1).all()
+
+        return {
+            'notifications': [notification.to_dict() for notification in notifications[:limit]],
+            'has_more': len(notifications) > limit,
+            'unread_count': UnreadCounterService.get(user_id)
+        }
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_committed_notifications(session):
+    events = session.info.pop(Notification.FEED_KEY, None)
+    if events:
+        NotificationFeedService.publish(events)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_unpublished_notifications(session):
+    session.info.pop(Notification.FEED_KEY, None)
@@ -0,0 +1,211 @@
+from flask import current_app
+from app.models.notification import NotificationOutbox
+from app.models.user import User
+from app.services.notification import NotificationService
+from app.services.push_notification import PushNotificationService
+from app.services.email_delivery import EmailDeliveryService
+from flask_mail import Message
+from app import db
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, and_, or_
+import json
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+class NotificationOutboxService:
+    """Service for draining the notification outbox, one channel at a time."""
+
+    CHANNELS = ('email', 'sms', 'push')
+
+    @staticmethod
+    def claim_batch(channel, batch_size):
+        """
+        Claim due outbox entries for a channel.
+
+        Rows are selected with FOR UPDATE SKIP LOCKED and flipped to 'sending'
+        in one statement, so concurrent workers never claim the same entry.
+        Entries stuck in 'sending' past the claim timeout (crashed worker) are
+        claimed again.
+
+        Args:
+            channel (str): Channel to drain
+            batch_size (int): Maximum number of entries to claim
+
+        Returns:
+            list: Claimed NotificationOutbox entries
+        """
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=current_app.config.get('NOTIFICATION_CLAIM_TIMEOUT', 300))
+
+        candidates = select(NotificationOutbox.id).where(
+            NotificationOutbox.channel == channel,
+            or_(
+                and_(NotificationOutbox.status == 'pending', NotificationOutbox.next_attempt_at <= now),
+                and_(NotificationOutbox.status == 'sending', NotificationOutbox.claimed_at < stale)
+            )
+        ).order_by(NotificationOutbox.next_attempt_at).limit(batch_size).with_for_update(skip_locked=True)
+
+        claimed = db.session.execute(
+            update(NotificationOutbox).where(
+                NotificationOutbox.id.in_(candidates)
+            ).values(
+                status='sending',
+                claimed_at=now,
+                attempts=NotificationOutbox.attempts + 1
+            ).returning(NotificationOutbox.id).execution_options(synchronize_session=False)
+        ).scalars().all()
+        db.session.commit()
+
+        if not claimed:
+            return []
+        return NotificationOutbox.query.filter(NotificationOutbox.id.in_(claimed)).all()
+
+    @staticmethod
+    def drain(channel, batch_size=None):
+        """
+        Deliver one batch of due entries for a channel.
+
+        Args:
+            channel (str): Channel to drain
+            batch_size (int, optional): Overrides NOTIFICATION_OUTBOX_BATCH_SIZE
+
+        Returns:
+            tuple: (sent_count, retry_count, failed_count)
+        """
+        if channel not in NotificationOutboxService.CHANNELS:
+            raise ValueError(f"Unknown notification channel: {channel}")
+
+        batch_size = batch_size or current_app.config.get('NOTIFICATION_OUTBOX_BATCH_SIZE', 100)
+        max_attempts = current_app.config.get('NOTIFICATION_MAX_ATTEMPTS', 5)
+
+        entries = NotificationOutboxService.claim_batch(channel, batch_size)
+        results = NotificationOutboxService._deliver_batch(channel, entries)
+
+        sent = retried = failed = 0
+        for entry, (delivered, error) in zip(entries, results):
+            if delivered:
+                entry.status = 'sent'
+                entry.sent_at = datetime.utcnow()
+                entry.last_error = None
+                sent += 1
+            elif entry.attempts >= max_attempts:
+                entry.status = 'failed'
+                entry.last_error = error
+                failed += 1
+                logger.error(f"Giving up on {channel} notification {entry.idempotency_key}: {error}")
+            else:
+                entry.status = 'pending'
+                entry.next_attempt_at = datetime.utcnow() + NotificationOutboxService._backoff(entry.attempts)
+                entry.last_error = error
+                retried += 1
+
+        db.session.commit()
+
+        if sent or retried or failed:
+            logger.info(f"Outbox {channel}: {sent} sent, {retried} retrying, {failed} failed")
+        return sent, retried, failed
+
+    @staticmethod
+    def _backoff(attempts):
+        """Exponential backoff with jitter for the given attempt number."""
+        base = current_app.config.get('NOTIFICATION_RETRY_BASE_SECONDS', 30)
+        cap = current_app.config.get('NOTIFICATION_RETRY_MAX_SECONDS', 3600)
+        delay = min(cap, base * (2 ** (attempts - 1)))
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    @staticmethod
+    def _deliver_batch(channel, entries):
+        """
+        Send claimed entries through the channel's provider.
+
+        Returns:
+            list: (delivered, error) tuples aligned with entries
+        """
+        if channel == 'email':
+            # One pooled batch so SMTP connections are reused across entries
+            return EmailDeliveryService.send_batch([
+                Message(
+                    subject=entry.payload['subject'],
+                    recipients=[entry.payload['to']],
+                    html=entry.payload['html']
+                ) for entry in entries
+            ])
+
+        if channel == 'push':
+            return NotificationOutboxService._deliver_push_batch(entries)
+
+        results = []
+        for entry in entries:
+            try:
+                delivered = NotificationOutboxService._deliver(entry)
+                results.append((delivered, None if delivered else 'Provider rejected the message'))
+            except Exception as e:
+                results.append((False, str(e)))
+        return results
+
+    @staticmethod
+    def _deliver(entry):
+        """Send a single SMS outbox entry."""
+        payload = entry.payload
+        return NotificationService.get_sms_service().send_sms(payload['to'], payload['body'])
+
+    @staticmethod
+    def _deliver_push_batch(entries):
+        """
+        Fan out push entries to every device of every recipient.
+
+        Tokens are resolved at send time (one query for the whole batch) so
+        revoked devices are skipped. Entries with identical content share
+        multicast requests, and tokens FCM reports as unregistered are
+        pruned from User.device_tokens in one bulk update.
+
+        Returns:
+            list: (delivered, error) tuples aligned with entries
+        """
+        user_ids = {entry.user_id for entry in entries}
+        devices = dict(db.session.query(User.id, User.device_tokens).filter(User.id.in_(user_ids)).all())
+
+        groups = {}
+        for entry in entries:
+            payload = entry.payload
+            key = json.dumps([payload['title'], payload['body'], payload.get('data')], sort_keys=True)
+            groups.setdefault(key, []).append(entry)
+
+        notifications = []
+        group_entries = []
+        for group in groups.values():
+            payload = group[0].payload
+            notifications.append({
+                'tokens': [device['token'] for entry in group for device in (devices.get(entry.user_id) or [])],
+                'title': payload['title'],
+                'body': payload['body'],
+                'data': payload.get('data')
+            })
+            group_entries.append(group)
+
+        reports = PushNotificationService().send_batch(notifications)
+
+        outcomes = {}
+        dead_tokens = {}
+        for group, report in zip(group_entries, reports):
+            delivered = set(report['delivered'])
+            unregistered = set(report['unregistered'])
+            for entry in group:
+                tokens = {device['token'] for device in (devices.get(entry.user_id) or [])}
+                dead = tokens & unregistered
+                if dead:
+                    dead_tokens.setdefault(entry.user_id, set()).update(dead)
+
+                # Nothing left to retry if every device is gone
+                if not tokens - dead or tokens & delivered:
+                    outcomes[entry.id] = (True, None)
+                else:
+                    outcomes[entry.id] = (False, 'Push delivery failed for all devices')
+
+        if dead_tokens:
+            pruned = User.prune_device_tokens(dead_tokens)
+            logger.info(f"Pruned {pruned} unregistered device tokens")
+
+        return [outcomes[entry.id] for entry in entries]
@@ -0,0 +1,257 @@
+from jinja2 import Environment, StrictUndefined
+from collections import namedtuple
+from functools import lru_cache
+from app.config import Config
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Notification content, by locale then notification type. 'default' covers
+# types without their own entry. Titles and messages are plain text (push,
+# SMS, in-app); the HTML email wraps them in EMAIL_LAYOUT.
+TEMPLATES = {
+    'en': {
+        'order_created': ('New Order Created', 'Your order #{{ order.id }} has been created and is waiting for a hawker to accept it.'),
+        'order_accepted': ('Order Accepted', 'Your order #{{ order.id }} has been accepted by a hawker and is being prepared.'),
+        'order_picked_up': ('Order Picked Up', 'Your order #{{ order.id }} has been picked up and is on its way to you.'),
+        'order_delivered': ('Order Delivered', 'Your order #{{ order.id }} has been delivered. Enjoy your meal!'),
+        'order_cancelled': ('Order Cancelled', 'Your order #{{ order.id }} has been cancelled.'),
+        'order_expired': ('Order Expired', 'Your order #{{ order.id }} has expired because no hawker accepted it within the time limit.'),
+        'payment_successful': ('Payment Successful', 'Payment for order #{{ order.id }} was successful.'),
+        'payment_failed': ('Payment Failed', 'Payment for order #{{ order.id }} failed. Please try again.'),
+        'eta_updated': ('ETA Updated', 'The estimated delivery time for your order #{{ order.id }} has been updated.'),
+        'default': ('Order Update', 'Update for your order #{{ order.id }}')
+    }
+}
+
+# Shared fragments, rendered once per distinct input and cached
+FRAGMENTS = {
+    'en': {
+        'eta': ' Estimated delivery time: {{ eta }}',
+        'footer': 'Thank you for using HawkeRoute!'
+    }
+}
+
+EMAIL_LAYOUT = """
+        <html>
+        <body>
+            <h1>{{ title }}</h1>
+            <p>{{ message }}</p>
+            <p>Order ID: {{ order_id }}</p>
+            <p>{{ footer }}</p>
+        </body>
+        </html>
+        """
+
+# Coalesced digests, by locale: (title, message) over the buffered messages
+DIGEST_TEMPLATES = {
+    'en': (
+        '{{ count }} updates on your orders',
+        '{% for message in messages %}{{ message }}{% if not loop.last %}\n{% endif %}{% endfor %}'
+    )
+}
+
+DIGEST_EMAIL_LAYOUT = """
+        <html>
+        <body>
+            <h1>{{ title }}</h1>
+            <ul>
+            {% for message in messages %}<li>{{ message }}</li>
+            {% endfor %}</ul>
+            <p>{{ footer }}</p>
+        </body>
+        </html>
+        """
+
+# Hawker's daily delivery summary, by locale: (title, message, email body)
+DAILY_SUMMARY_TEMPLATES = {
+    'en': (
+        '{% if count %}You Have Deliveries Today{% else %}No Deliveries Today{% endif %}',
+        '{% if count %}You have {{ count }} deliver{{ "ies" if count > 1 else "y" }} today.'
+        '{% else %}You have no deliveries scheduled for today.{% endif %}',
+        """
+        <html>
+        <body>
+            <h1>{{ title }}</h1>
+            <p>{{ message }}</p>
+            {% if deliveries %}<h2>Your Deliveries:</h2>
+            <ul>
+            {% for order_id, status in deliveries %}<li>Order #{{ order_id }} - {{ status }}</li>
+            {% endfor %}</ul>
+            <p>Please check your app for more details.</p>{% endif %}
+        </body>
+        </html>
+        """
+    )
+}
+
+# Types whose message mentions the ETA when the order has one
+ETA_TYPES = ('order_accepted', 'order_picked_up', 'eta_updated')
+
+RenderedNotification = namedtuple('RenderedNotification', ['title', 'message', 'html'])
+
+
+class NotificationTemplates:
+    """Compiled notification templates keyed by (notification_type, locale)."""
+
+    _text_env = Environment(undefined=StrictUndefined)
+    _html_env = Environment(autoescape=True, undefined=StrictUndefined)
+    _compiled = {}
+    _fragments = {}
+    _layout = None
+    _digest = {}
+    _digest_layout = None
+    _daily_summary = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def compile_all(cls):
+        """
+        Compile every template once; called at application startup.
+
+        Returns:
+            int: Number of (notification_type, locale) template sets compiled
+        """
+        with cls._lock:
+            if cls._layout is not None:
+                return len(cls._compiled)
+
+            compiled = {}
+            for locale, types in TEMPLATES.items():
+                for notification_type, (title, message) in types.items():
+                    compiled[(notification_type, locale)] = (
+                        cls._text_env.from_string(title),
+                        cls._text_env.from_string(message)
+                    )
+
+            cls._fragments = {
+                (name, locale): cls._text_env.from_string(source)
+                for locale, fragments in FRAGMENTS.items()
+                for name, source in fragments.items()
+            }
+            cls._digest = {
+                locale: (cls._text_env.from_string(title), cls._text_env.from_string(message))
+                for locale, (title, message) in DIGEST_TEMPLATES.items()
+            }
+            cls._digest_layout = cls._html_env.from_string(DIGEST_EMAIL_LAYOUT)
+            cls._daily_summary = {
+                locale: (
+                    cls._text_env.from_string(title),
+                    cls._text_env.from_string(message),
+                    cls._html_env.from_string(html)
+                )
+                for locale, (title, message, html) in DAILY_SUMMARY_TEMPLATES.items()
+            }
+            cls._compiled = compiled
+            cls._layout = cls._html_env.from_string(EMAIL_LAYOUT)
+
+        logger.info(f"Compiled {len(compiled)} notification templates")
+        return len(compiled)
+
+    @classmethod
+    def _resolve_locale(cls, locale):
+        return locale if locale in TEMPLATES else Config.DEFAULT_LOCALE
+
+    @classmethod
+    def _get(cls, notification_type, locale):
+        if cls._layout is None:
+            cls.compile_all()
+        return cls._compiled.get((notification_type, locale)) or cls._compiled[('default', locale)]
+
+    @classmethod
+    def title(cls, notification_type, locale=None):
+        """Render just the title, which never depends on the order."""
+        return _render_title(notification_type, cls._resolve_locale(locale))
+
+    @classmethod
+    def render(cls, notification_type, order, data=None, locale=None):
+        """
+        Render an order notification for every channel at once.
+
+        Call this once per event and reuse the result for the in-app record,
+        email, SMS and push payloads.
+
+        Args:
+            notification_type (str): Type of notification (e.g., 'order_accepted')
+            order: Order (or row with the same attributes) the notification is about
+            data (dict, optional): Additional data for the notification
+            locale (str, optional): Locale; defaults to Config.DEFAULT_LOCALE
+
+        Returns:
+            RenderedNotification: title, plain-text message and HTML email body
+        """
+        locale = cls._resolve_locale(locale)
+        _, message_template = cls._get(notification_type, locale)
+
+        title = _render_title(notification_type, locale)
+        message = message_template.render(order=order, data=data or {})
+
+        eta = getattr(order, 'eta', None)
+        if eta and notification_type in ETA_TYPES:
+            message += _render_fragment('eta', locale, eta.strftime("%I:%M %p"))
+
+        html = cls._layout.render(
+            title=title,
+            message=message,
+            order_id=order.id,
+            footer=_render_fragment('footer', locale)
+        )
+        return RenderedNotification(title, message, html)
+
+    @classmethod
+    def render_digest(cls, messages, locale=None):
+        """
+        Render one digest covering several buffered notifications.
+
+        Args:
+            messages (list): Plain-text messages of the coalesced events, oldest first
+            locale (str, optional): Locale; defaults to Config.DEFAULT_LOCALE
+
+        Returns:
+            RenderedNotification: title, plain-text message and HTML email body
+        """
+        locale = cls._resolve_locale(locale)
+        if cls._layout is None:
+            cls.compile_all()
+        title_template, message_template = cls._digest.get(locale) or cls._digest[Config.DEFAULT_LOCALE]
+
+        title = title_template.render(count=len(messages))
+        message = message_template.render(messages=messages)
+        html = cls._digest_layout.render(title=title, messages=messages, footer=_render_fragment('footer', locale))
+        return RenderedNotification(title, message, html)
+
+    @classmethod
+    def render_daily_summary(cls, deliveries, locale=None):
+        """
+        Render a hawker's daily delivery summary.
+
+        Args:
+            deliveries (list): (order_id, status) pairs for the day
+            locale (str, optional): Locale; defaults to Config.DEFAULT_LOCALE
+
+        Returns:
+            RenderedNotification: title, plain-text message and HTML email body
+        """
+        locale = cls._resolve_locale(locale)
+        if cls._layout is None:
+            cls.compile_all()
+        title_template, message_template, html_template = (
+            cls._daily_summary.get(locale) or cls._daily_summary[Config.DEFAULT_LOCALE]
+        )
+
+        title = title_template.render(count=len(deliveries))
+        message = message_template.render(count=len(deliveries))
+        html = html_template.render(title=title, message=message, deliveries=deliveries)
+        return RenderedNotification(title, message, html)
+
+
+@lru_cache(maxsize=256)
+def _render_title(notification_type, locale):
+    title_template, _ = NotificationTemplates._get(notification_type, locale)
+    return title_template.render()
+
+
+@lru_cache(maxsize=1024)
+def _render_fragment(name, locale, value=None):
+    return NotificationTemplates._fragments[(name, locale)].render(eta=value)
@@ -1,11 +1,10 @@
 from flask import current_app
-from app.models.order import Order, OrderRating, OrderDispute
+from app.models.order import Order, OrderRating, OrderDispute, HawkerRatingAggregate
 from app.models.user import User
 from app import db
 from datetime import datetime
 import logging
-from app.services.notification import NotificationService
-from app.services.payment import PaymentService
+from app.services.container import ServiceContainer
 from app.models.cancellation_reason import CancellationReason
 from app.models.payment import Payment
 
@@ -13,8 +12,9 @@ class OrderService:
     """Service for handling order operations"""
     
     def __init__(self):
-        self.notification_service = NotificationService()
-        self.payment_service = PaymentService()
+        # Shared per worker rather than rebuilt for every OrderService
+        self.notification_service = ServiceContainer.get('notifications')
+        self.payment_service = ServiceContainer.get('payments')
     
     def cancel_order(self, order_id, user_id, reason_code, details=None):
         """
@@ -95,12 +95,9 @@ class OrderService:
                     # Log the refund failure but don't prevent cancellation
                     logging.error(f"Refund failed for order {order_id}: {refund_result['message']}")
             
-            # Save changes
-            db.session.commit()
-            
-            # Send notifications
-            self.notification_service.send_order_notification(
-                order_id=order_id,
+            # Queue notifications
+            self.notification_service.queue_order_notification(
+                order=order,
                 notification_type='order_cancelled',
                 data={
                     'cancelled_by': user_id,
@@ -111,6 +108,9 @@ class OrderService:
                 }
             )
             
+            # Save changes
+            db.session.commit()
+            
             return {
                 'success': True,
                 'message': "Order cancelled successfully",
@@ -177,29 +177,20 @@ class OrderService:
         try:
             db.session.add(rating)
             
-            # Update hawker's average rating
+            # Fold into the hawker's running aggregates in the same transaction
             if user_id == order.customer_id:  # Only customer ratings affect hawker rating
-                hawker = User.query.get(order.hawker_id)
-                if hawker:
-                    # Calculate new average rating
-                    all_ratings = OrderRating.query.join(Order).filter(
-                        Order.hawker_id == order.hawker_id,
-                        Order.status == 'completed'
-                    ).all()
-                    
-                    if all_ratings:
-                        total_rating = sum(r.rating for r in all_ratings)
-                        hawker.rating = total_rating / len(all_ratings)
-            
-            db.session.commit()
+                HawkerRatingAggregate.for_hawker(order.hawker_id).add_rating(rating)
             
-            # Send notification to hawker
-            self.notification_service.send_order_notification(
-                order_id=order_id,
+            # Queue notification to hawker
+            db.session.flush()
+            self.notification_service.queue_order_notification(
+                order=order,
                 notification_type='order_rated',
                 data={'rating': rating.to_dict()}
             )
             
+            db.session.commit()
+            
             return rating.to_dict()
             
         except Exception as e:
@@ -251,11 +242,9 @@ class OrderService:
             order.status = 'disputed'
             order.dispute_id = dispute.id
             
-            db.session.commit()
-            
-            # Send notifications
-            self.notification_service.send_order_notification(
-                order_id=order_id,
+            # Queue notifications
+            self.notification_service.queue_order_notification(
+                order=order,
                 notification_type='order_disputed',
                 data={
                     'reason': reason,
@@ -263,6 +252,8 @@ class OrderService:
                 }
             )
             
+            db.session.commit()
+            
             return True, "Dispute created successfully"
             
         except Exception as e:
@@ -330,11 +321,9 @@ class OrderService:
             # Update order status
             order.status = 'cancelled' if resolution_type == 'refund' else 'completed'
             
-            db.session.commit()
-            
-            # Send notifications
-            self.notification_service.send_order_notification(
-                order_id=order.id,
+            # Queue notifications
+            self.notification_service.queue_order_notification(
+                order=order,
                 notification_type='dispute_resolved',
                 data={
                     'resolution_type': resolution_type,
@@ -343,6 +332,8 @@ class OrderService:
                 }
             )
             
+            db.session.commit()
+            
             return True, "Dispute resolved successfully"
             
         except Exception as e:
@@ -350,26 +341,6 @@ class OrderService:
             logging.error(f"Failed to resolve dispute: {str(e)}")
             return False, "Failed to resolve dispute"
     
-    def _update_hawker_rating(self, hawker_id):
-        """Update hawker's average rating"""
-        try:
-            # Calculate new average rating
-            ratings = OrderRating.query.join(Order).filter(
-                Order.hawker_id == hawker_id
-            ).all()
-            
-            if ratings:
-                avg_rating = sum(r.rating for r in ratings) / len(ratings)
-                
-                # Update hawker's rating
-                hawker = User.query.get(hawker_id)
-                hawker.rating = avg_rating
-                
-                db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            logging.error(f"Failed to update hawker rating: {str(e)}")
-    
     def request_refund(self, order_id, user_id, amount=None, reason=None, details=None):
         """
         Request a refund for an order
@@ -459,12 +430,9 @@ class OrderService:
             else:
                 order.payment_status = 'partially_refunded'
             
-            # Save changes
-            db.session.commit()
-            
-            # Send notifications
-            self.notification_service.send_order_notification(
-                order_id=order_id,
+            # Queue notifications
+            self.notification_service.queue_order_notification(
+                order=order,
                 notification_type='order_refunded',
                 data={
                     'refunded_by': user_id,
@@ -476,6 +444,9 @@ class OrderService:
                 }
             )
             
+            # Save changes
+            db.session.commit()
+            
             return {
                 'success': True,
                 'message': "Refund processed successfully",
@@ -24,10 +24,11 @@ class OrderService:
         
         try:
             db.session.add(order)
-            db.session.commit()
+            db.session.flush()
             
-            # Send notifications
-            NotificationService.send_order_notification(order.id, 'order_created')
+            # Queue notifications in the same transaction
+            NotificationService.queue_order_notification(order, 'order_created')
+            db.session.commit()
             
             return order
         except Exception as e:
@@ -67,11 +68,10 @@ class OrderService:
         order.updated_at = datetime.utcnow()
         
         try:
+            # Queue notifications in the same transaction
+            NotificationService.queue_order_notification(order, f'order_{status}')
             db.session.commit()
             
-            # Send notifications
-            NotificationService.send_order_notification(order.id, f'order_{status}')
-            
             # If order is confirmed, optimize routes
             if status == 'confirmed':
                 hawker = User.query.get(order.hawker_id)
@@ -105,11 +105,10 @@ class OrderService:
         order.updated_at = datetime.utcnow()
         
         try:
+            # Queue notifications in the same transaction
+            NotificationService.queue_order_notification(order, 'order_cancelled', {'reason': reason})
             db.session.commit()
             
-            # Send notifications
-            NotificationService.send_order_notification(order.id, 'order_cancelled', {'reason': reason})
-            
             return order
         except Exception as e:
             db.session.rollback()
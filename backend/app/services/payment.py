@@ -3,7 +3,7 @@ from app.models.payment import Payment, PaymentHistory, PaymentDispute
 from app import db
 from datetime import datetime
 import logging
-import stripe
+from app.services.container import ServiceContainer
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
@@ -26,6 +26,7 @@ class PaymentService:
         Returns:
             dict: Payment result including status and payment details
         """
+        stripe = ServiceContainer.get('stripe')
         try:
             # Create payment intent with Stripe
             intent = stripe.PaymentIntent.create(
@@ -97,6 +98,7 @@ class PaymentService:
         Returns:
             dict: Refund result including status and refund details
         """
+        stripe = ServiceContainer.get('stripe')
         try:
             payment = Payment.query.get(payment_id)
             if not payment:
@@ -221,6 +223,7 @@ class PaymentService:
         Returns:
             dict: Dispute result including status and dispute details
         """
+        stripe = ServiceContainer.get('stripe')
         try:
             payment = Payment.query.get(payment_id)
             if not payment:
@@ -328,6 +331,7 @@ class PaymentService:
         Returns:
             list: List of payment methods
         """
+        stripe = ServiceContainer.get('stripe')
         try:
             payment_methods = stripe.PaymentMethod.list(
                 customer=customer_id,
@@ -350,6 +354,7 @@ class PaymentService:
         Returns:
             dict: Result of attaching the payment method
         """
+        stripe = ServiceContainer.get('stripe')
         try:
             payment_method = stripe.PaymentMethod.attach(
                 payment_method_id,
@@ -377,6 +382,7 @@ class PaymentService:
         Returns:
             dict: Result of detaching the payment method
         """
+        stripe = ServiceContainer.get('stripe')
         try:
             payment_method = stripe.PaymentMethod.detach(payment_method_id)
             return {
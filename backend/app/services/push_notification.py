@@ -1,112 +1,209 @@
-import firebase_admin
-from firebase_admin import credentials, messaging
 from flask import current_app
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
 class PushNotificationService:
     """Service for sending push notifications via Firebase Cloud Messaging."""
-    
+
+    # FCM accepts at most 500 tokens per multicast request
+    MAX_TOKENS_PER_BATCH = 500
+
+    # firebase_admin.messaging errors meaning the token will never work again and should be forgotten
+    DEAD_TOKEN_ERRORS = ('UnregisteredError', 'SenderIdMismatchError')
+
+    # Process-wide transport override, e.g. a local FCM stub in benchmarks
+    default_transport = None
+
     _initialized = False
     _firebase_app = None
-    
-    def __init__(self):
-        """Initialize the push notification service."""
+    _init_lock = threading.Lock()
+
+    _stats_lock = threading.Lock()
+    _stats = {
+        'requests': 0,
+        'tokens': 0,
+        'delivered': 0,
+        'failed': 0,
+        'unregistered': 0,
+        'seconds': 0.0
+    }
+
+    def __init__(self, transport=None):
+        """
+        Initialize the push notification service.
+
+        Args:
+            transport (callable, optional): Replacement for
+                messaging.send_each_for_multicast, e.g. a local FCM stub
+        """
         # Don't initialize Firebase here, do it lazily when needed
-        pass
-    
+        self.transport = transport or PushNotificationService.default_transport
+
     def _initialize_firebase(self):
         """Initialize Firebase if not already initialized."""
-        if not self._initialized:
+        if self.transport or PushNotificationService._initialized:
+            return
+
+        # Class-level so every instance shares the one Firebase app
+        with PushNotificationService._init_lock:
+            if PushNotificationService._initialized:
+                return
             try:
                 cred_path = current_app.config.get('FIREBASE_CREDENTIALS_PATH')
                 if cred_path:
+                    import firebase_admin
+                    from firebase_admin import credentials
                     cred = credentials.Certificate(cred_path)
-                    self._firebase_app = firebase_admin.initialize_app(cred)
-                    self._initialized = True
+                    PushNotificationService._firebase_app = firebase_admin.initialize_app(cred)
+                    PushNotificationService._initialized = True
                     logger.info("Firebase initialized successfully")
                 else:
                     logger.warning("Firebase credentials path not configured")
             except Exception as e:
                 logger.error(f"Failed to initialize Firebase: {str(e)}")
-    
+
+    def _ready(self):
+        self._initialize_firebase()
+        return bool(self.transport) or PushNotificationService._initialized
+
     def send_notification(self, token, title, body, data=None):
         """
         Send a push notification to a specific device.
-        
+
         Args:
             token (str): The FCM token of the device
             title (str): The notification title
             body (str): The notification body
             data (dict, optional): Additional data to send with the notification
-        
+
         Returns:
             bool: True if the notification was sent successfully, False otherwise
         """
-        try:
-            # Initialize Firebase if not already initialized
-            self._initialize_firebase()
-            
-            if not self._initialized:
-                logger.error("Firebase not initialized, cannot send notification")
-                return False
-            
-            # Create the message
-            message = messaging.Message(
-                notification=messaging.Notification(
-                    title=title,
-                    body=body
-                ),
-                data=data or {},
-                token=token
-            )
-            
-            # Send the message
-            response = messaging.send(message)
-            logger.info(f"Successfully sent notification: {response}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to send push notification: {str(e)}")
-            return False
-    
+        success_count, _ = self.send_multicast_notification([token], title, body, data)
+        return success_count > 0
+
     def send_multicast_notification(self, tokens, title, body, data=None):
         """
         Send a push notification to multiple devices.
-        
+
         Args:
             tokens (list): List of FCM tokens
             title (str): The notification title
             body (str): The notification body
             data (dict, optional): Additional data to send with the notification
-        
+
         Returns:
             tuple: (success_count, failure_count)
         """
+        report = self.send_batch([{'tokens': tokens, 'title': title, 'body': body, 'data': data}])[0]
+        return len(report['delivered']), len(report['failed']) + len(report['unregistered'])
+
+    def send_batch(self, notifications):
+        """
+        Fan out many notifications in 500-token multicast requests.
+
+        Requests from all notifications are sent concurrently (PUSH_MAX_WORKERS
+        at a time), so one event reaching thousands of devices takes roughly
+        as long as its slowest request rather than the sum of them.
+
+        Args:
+            notifications (list): Dicts with 'tokens', 'title', 'body' and optional 'data'
+
+        Returns:
+            list: Dicts with 'delivered', 'failed' and 'unregistered' token lists,
+                aligned with notifications
+        """
+        reports = [{'delivered': [], 'failed': [], 'unregistered': []} for _ in notifications]
+
+        requests = []
+        for index, notification in enumerate(notifications):
+            tokens = list(dict.fromkeys(token for token in notification['tokens'] if token))
+            for start in range(0, len(tokens), self.MAX_TOKENS_PER_BATCH):
+                requests.append((index, tokens[start:start + self.MAX_TOKENS_PER_BATCH]))
+
+        if not requests:
+            return reports
+
+        if not self._ready():
+            logger.error("Firebase not initialized, cannot send notification")
+            for index, tokens in requests:
+                reports[index]['failed'].extend(tokens)
+            return reports
+
+        def send(request):
+            index, tokens = request
+            notification = notifications[index]
+            return self._send_multicast(tokens, notification['title'], notification['body'], notification.get('data'))
+
+        started = time.perf_counter()
+        workers = max(1, min(current_app.config.get('PUSH_MAX_WORKERS', 8), len(requests)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for (index, _), outcome in zip(requests, executor.map(send, requests)):
+                for key, tokens in outcome.items():
+                    reports[index][key].extend(tokens)
+
+        self._record(requests, reports, time.perf_counter() - started)
+        return reports
+
+    def _send_multicast(self, tokens, title, body, data=None):
+        """Send one multicast request of at most MAX_TOKENS_PER_BATCH tokens."""
+        from firebase_admin import messaging
+        outcome = {'delivered': [], 'failed': [], 'unregistered': []}
+        dead_token_errors = tuple(getattr(messaging, name) for name in self.DEAD_TOKEN_ERRORS)
+
+        message = messaging.MulticastMessage(
+            notification=messaging.Notification(
+                title=title,
+                body=body
+            ),
+            data=data or {},
+            tokens=tokens
+        )
+
         try:
-            # Initialize Firebase if not already initialized
-            self._initialize_firebase()
-            
-            if not self._initialized:
-                logger.error("Firebase not initialized, cannot send notification")
-                return 0, len(tokens)
-            
-            # Create the message
-            message = messaging.MulticastMessage(
-                notification=messaging.Notification(
-                    title=title,
-                    body=body
-                ),
-                data=data or {},
-                tokens=tokens
-            )
-            
-            # Send the message
-            response = messaging.send_multicast(message)
-            logger.info(f"Successfully sent multicast notification: {response.success_count} successful, {response.failure_count} failed")
-            return response.success_count, response.failure_count
-            
+            if self.transport:
+                response = self.transport(message)
+            else:
+                response = messaging.send_each_for_multicast(message, app=PushNotificationService._firebase_app)
         except Exception as e:
             logger.error(f"Failed to send multicast push notification: {str(e)}")
-            return 0, len(tokens) 
\ No newline at end of file
+            outcome['failed'] = list(tokens)
+            return outcome
+
+        for token, result in zip(tokens, response.responses):
+            if result.success:
+                outcome['delivered'].append(token)
+            elif isinstance(result.exception, dead_token_errors):
+                outcome['unregistered'].append(token)
+            else:
+                outcome['failed'].append(token)
+        return outcome
+
+    @classmethod
+    def _record(cls, requests, reports, seconds):
+        with cls._stats_lock:
+            stats = cls._stats
+            stats['requests'] += len(requests)
+            stats['tokens'] += sum(len(tokens) for _, tokens in requests)
+            stats['seconds'] += seconds
+            for report in reports:
+                stats['delivered'] += len(report['delivered'])
+                stats['failed'] += len(report['failed'])
+                stats['unregistered'] += len(report['unregistered'])
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Get cumulative push throughput counters for this process.
+
+        Returns:
+            dict: Request/token/outcome counts and tokens sent per second
+        """
+        with cls._stats_lock:
+            stats = dict(cls._stats)
+        stats['tokens_per_second'] = round(stats['tokens'] / stats['seconds'], 1) if stats['seconds'] else 0.0
+        return stats
@@ -5,8 +5,7 @@ from app import db
 from datetime import datetime, timedelta
 import logging
 from sqlalchemy import func
-from app.services.geocoding import GeocodingService
-import googlemaps
+from app.services.container import ServiceContainer
 import polyline
 import json
 
@@ -14,13 +13,9 @@ class RouteService:
     """Service for handling route optimization and analytics"""
     
     def __init__(self):
-        self.geocoding_service = GeocodingService()
-        api_key = current_app.config.get('GOOGLE_MAPS_API_KEY')
-        if api_key:
-            self.client = googlemaps.Client(key=api_key)
-        else:
-            self.client = None
-            logging.warning("Google Maps API key not configured. Route service will be disabled.")
+        self.geocoding_service = ServiceContainer.get('geocoding')
+        # Shared per worker, so its connection pool survives across requests
+        self.client = ServiceContainer.get('googlemaps')
     
     def optimize_route(self, orders, start_location=None, end_location=None):
         """
@@ -1,36 +1,48 @@
-from ortools.constraint_solver import routing_enums_pb2
-from ortools.constraint_solver import pywrapcp
+from flask import current_app
 from app.models.order import Order
 from app.models.route import HawkerRoute
 from app.models.user import User
 from app import db
+from app.services.container import ServiceContainer
 from datetime import datetime, date, timedelta
 import math
 import json
-import numpy as np
 from typing import List, Dict, Tuple, Any
-import requests
-import googlemaps
 import os
+from app.utils.dates import day_range, within
 
 class RouteOptimizer:
-    def __init__(self, hawker_id, delivery_date):
+    def __init__(self, hawker_id=None, delivery_date=None):
+        """
+        Without arguments the optimizer only serves optimize_route() and
+        get_eta(), and one shared instance per worker comes from
+        ServiceContainer.get('route_optimizer'). With a hawker and date it
+        loads that day's orders for optimize().
+        """
         self.hawker_id = hawker_id
         self.delivery_date = delivery_date
-        self.hawker = User.query.get(hawker_id)
-        self.orders = self._get_orders()
-        self.locations = self._prepare_locations()
-        self.distance_matrix = self._create_distance_matrix()
-        self.api_key = None  # Google Maps API key should be set in config 
-        self.gmaps = googlemaps.Client(key=os.environ.get('GOOGLE_MAPS_API_KEY'))
+        if hawker_id is not None:
+            self.hawker = User.query.get(hawker_id)
+            self.orders = self._get_orders()
+            self.locations = self._prepare_locations()
+            self.distance_matrix = self._create_distance_matrix()
+    
+    @property
+    def api_key(self):
+        return current_app.config.get('GOOGLE_MAPS_API_KEY')
+    
+    @property
+    def gmaps(self):
+        return ServiceContainer.get('googlemaps')
         
     def _get_orders(self):
         """Get all pending orders for the hawker on the specified date"""
+        start, end = day_range(self.delivery_date)
         return Order.query.filter_by(
             hawker_id=self.hawker_id,
             status='pending'
         ).filter(
-            db.func.date(Order.created_at) == self.delivery_date
+            *within(Order.created_at, start, end)
         ).all()
     
     def _prepare_locations(self):
@@ -94,6 +106,10 @@ class RouteOptimizer:
         if not self.orders:
             return None
         
+        # OR-Tools is only needed here; keep it out of every worker's startup
+        from ortools.constraint_solver import routing_enums_pb2
+        from ortools.constraint_solver import pywrapcp
+        
         # Create routing model
         manager = pywrapcp.RoutingIndexManager(
             len(self.distance_matrix), 1, 0  # 1 vehicle, depot at index 0
@@ -277,7 +293,8 @@ class RouteOptimizer:
             'key': self.api_key
         }
         
-        response = requests.get(url, params=params)
+        # Pooled keep-alive session with timeouts, retries and a circuit breaker
+        response = ServiceContainer.get('http.googlemaps').get(url, params=params)
         data = response.json()
         
         if data['status'] != 'OK':
@@ -372,7 +389,7 @@ class RouteOptimizer:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = ServiceContainer.get('http.googlemaps').get(url, params=params)
             data = response.json()
             
             if data['status'] != 'OK':
@@ -424,9 +441,13 @@ class RouteOptimizer:
         # Get hawker's current location as starting point
         origin = hawker.current_location or hawker.base_location
         
+        gmaps = ServiceContainer.get('googlemaps')
+        if gmaps is None:
+            return {'error': 'Google Maps API key not configured'}
+        
         try:
             # Request directions from Google Maps
-            result = self.gmaps.directions(
+            result = gmaps.directions(
                 origin=origin,
                 destination=origin,  # Return to starting point
                 waypoints=waypoints,
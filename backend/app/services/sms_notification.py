@@ -1,92 +1,194 @@
-from twilio.rest import Client
 from flask import current_app
+from app.utils.throttle import TokenBucket
+from app.services.container import ServiceContainer
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit
+import threading
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+def routed_http_client(base_url=None, **kwargs):
+    """Twilio HTTP client that can redirect API calls to another host (e.g. a local stand-in)."""
+    # twilio is imported on first use, not when the app starts
+    from twilio.http.http_client import TwilioHttpClient
+
+    class _RoutedHttpClient(TwilioHttpClient):
+        def __init__(self, base_url=None, **kwargs):
+            super().__init__(**kwargs)
+            self.base_url = urlsplit(base_url) if base_url else None
+
+        def request(self, method, url, *args, **kwargs):
+            if self.base_url:
+                url = urlunsplit(urlsplit(url)._replace(scheme=self.base_url.scheme, netloc=self.base_url.netloc))
+            return super().request(method, url, *args, **kwargs)
+
+    return _RoutedHttpClient(base_url=base_url, **kwargs)
+
+
 class SMSNotificationService:
     """Service for sending SMS notifications using Twilio"""
-    
+
     _instance = None
     _initialized = False
-    _client = None
     _from_number = None
-    
+    _bucket = None
+    _init_lock = threading.Lock()
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(SMSNotificationService, cls).__new__(cls)
         return cls._instance
-    
+
     def __init__(self):
         if not SMSNotificationService._initialized:
             SMSNotificationService._initialized = True
-    
-    def _initialize_client(self):
-        """Initialize Twilio client if not already initialized."""
-        if SMSNotificationService._client is None:
-            try:
-                account_sid = current_app.config.get('TWILIO_ACCOUNT_SID')
-                auth_token = current_app.config.get('TWILIO_AUTH_TOKEN')
-                SMSNotificationService._from_number = current_app.config.get('TWILIO_PHONE_NUMBER')
-                
-                if not all([account_sid, auth_token, SMSNotificationService._from_number]):
-                    logger.error("Missing Twilio configuration")
-                    return False
-                
-                SMSNotificationService._client = Client(account_sid, auth_token)
-                return True
-            except Exception as e:
-                logger.error(f"Failed to initialize Twilio client: {str(e)}")
-                return False
-        return True
-    
+
+    def _get_client(self):
+        """The worker's shared Twilio client, or None if Twilio is not configured."""
+        try:
+            SMSNotificationService._from_number = current_app.config.get('TWILIO_PHONE_NUMBER')
+            client = ServiceContainer.get('twilio')
+            if client is None or not SMSNotificationService._from_number:
+                logger.error("Missing Twilio configuration")
+                return None
+
+            if SMSNotificationService._bucket is None:
+                # The bucket is process-wide because the provider's cap is per account;
+                # sending threads must not each build their own
+                with SMSNotificationService._init_lock:
+                    if SMSNotificationService._bucket is None:
+                        SMSNotificationService._bucket = TokenBucket(
+                            current_app.config.get('SMS_RATE_PER_SECOND', 10),
+                            current_app.config.get('SMS_BURST', 10)
+                        )
+            return client
+        except Exception as e:
+            logger.error(f"Failed to initialize Twilio client: {str(e)}")
+            return None
+
     def send_sms(self, to_number, message):
         """
         Send an SMS message.
-        
+
         Args:
             to_number: Recipient phone number
             message: Message content
-            
+
         Returns:
             bool: True if message was sent successfully, False otherwise
         """
-        if not self._initialize_client():
+        client = self._get_client()
+        if client is None:
             return False
-        
+
         try:
-            self._client.messages.create(
-                body=message,
-                from_=self._from_number,
-                to=to_number
-            )
+            self._bucket.acquire()
+            self._create_message(client, to_number, message)
             return True
         except Exception as e:
             logger.error(f"Failed to send SMS: {str(e)}")
             return False
-    
+
     def send_bulk_sms(self, phone_numbers, message):
         """
         Send SMS to multiple phone numbers
-        
+
+        Numbers are deduplicated and sent from a bounded thread pool, paced by
+        the shared token bucket so the provider's per-second cap is never
+        exceeded. Throttling and server errors are retried per recipient with
+        exponential backoff; numbers still unsent when retries or the
+        SMS_BULK_DEADLINE_SECONDS budget run out are reported as deferred so
+        the caller can reschedule them.
+
         Args:
             phone_numbers: List of recipient phone numbers
             message: SMS message content
-            
+
         Returns:
-            tuple: (success_count, failure_count)
+            dict: 'delivered', 'failed' and 'deferred' lists of phone numbers
         """
-        if not SMSNotificationService._client:
-            logging.warning("Twilio client not initialized. Cannot send SMS.")
-            return (0, len(phone_numbers))
-        
-        success_count = 0
-        failure_count = 0
-        
-        for phone_number in phone_numbers:
-            if self.send_sms(phone_number, message):
-                success_count += 1
-            else:
-                failure_count += 1
-        
-        return (success_count, failure_count) 
\ No newline at end of file
+        report = {'delivered': [], 'failed': [], 'deferred': []}
+
+        numbers = self._dedupe(phone_numbers)
+        if not numbers:
+            return report
+
+        # Resolved here: the sending threads have no application context
+        client = self._get_client()
+        if client is None:
+            report['deferred'] = numbers
+            return report
+
+        config = current_app.config
+        max_attempts = max(1, config.get('SMS_MAX_ATTEMPTS', 3))
+        retry_base = config.get('SMS_RETRY_BASE_SECONDS', 1)
+        deadline = time.monotonic() + config.get('SMS_BULK_DEADLINE_SECONDS', 600)
+        workers = max(1, min(config.get('SMS_MAX_WORKERS', 8), len(numbers)))
+
+        def send(to_number):
+            return self._send_with_retry(client, to_number, message, max_attempts, retry_base, deadline)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for to_number, outcome in zip(numbers, executor.map(send, numbers)):
+                report[outcome].append(to_number)
+
+        logger.info(
+            f"Bulk SMS: {len(report['delivered'])} delivered, {len(report['failed'])} failed, "
+            f"{len(report['deferred'])} deferred"
+        )
+        return report
+
+    def _create_message(self, client, to_number, message):
+        return client.messages.create(
+            body=message,
+            from_=self._from_number,
+            to=to_number
+        )
+
+    def _send_with_retry(self, client, to_number, message, max_attempts, retry_base, deadline):
+        """Send to one recipient, returning 'delivered', 'failed' or 'deferred'."""
+        from twilio.base.exceptions import TwilioRestException
+        for attempt in range(1, max_attempts + 1):
+            if not self._bucket.acquire(deadline):
+                return 'deferred'
+
+            try:
+                self._create_message(client, to_number, message)
+                return 'delivered'
+            except TwilioRestException as e:
+                if not self._is_retryable(e):
+                    logger.error(f"Failed to send SMS to {to_number}: {str(e)}")
+                    return 'failed'
+                error = e
+            except Exception as e:
+                # Connection errors and timeouts are worth another try
+                error = e
+
+            delay = retry_base * (2 ** (attempt - 1))
+            if attempt == max_attempts or time.monotonic() + delay > deadline:
+                break
+            time.sleep(delay)
+
+        logger.warning(f"Deferring SMS to {to_number} after {attempt} attempt(s): {str(error)}")
+        return 'deferred'
+
+    @staticmethod
+    def _is_retryable(error):
+        """Throttling (429) and provider-side (5xx) errors are transient."""
+        return error.status == 429 or error.status >= 500
+
+    @staticmethod
+    def _dedupe(phone_numbers):
+        """Drop blanks and repeats, ignoring spacing/punctuation differences."""
+        seen = set()
+        numbers = []
+        for number in phone_numbers:
+            if not number:
+                continue
+            key = ''.join(ch for ch in str(number) if ch.isdigit() or ch == '+')
+            if key and key not in seen:
+                seen.add(key)
+                numbers.append(number)
+        return numbers
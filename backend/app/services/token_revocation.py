@@ -0,0 +1,264 @@
+from flask import current_app
+from redis import Redis
+from redis.exceptions import RedisError
+from app.models.token_blacklist import TokenBlacklist
+from app.utils.bloom import BloomFilter
+from app import db
+from app.database import use_primary
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TokenRevocationService:
+    """
+    Service answering "is this JWT revoked?" from an in-process Bloom filter.
+
+    A jti missing from the filter is not revoked, which answers almost every
+    request without I/O. Hits are confirmed against token_blacklist and the
+    answer cached briefly. The filter learns new revocations from Redis
+    pub/sub straight away, and from an incremental database sync every
+    TOKEN_REVOCATION_SYNC_SECONDS in case a message was missed.
+
+    The sync re-reads every revocation made in the last
+    TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS, not just those with higher ids:
+    ids and revoked_at are assigned before commit, so a revocation can
+    become visible after later ones were already loaded.
+
+    Every read goes to the primary, even on replica endpoints: a lagging
+    replica would let a token revoked a moment ago through.
+    """
+
+    CHANNEL = 'token_revocations'
+    # Session.info key collecting jtis to broadcast once the transaction commits
+    PENDING_KEY = 'token_revocations_pending'
+
+    _filter = None
+    _synced_from = None  # revoked_at the next sync reads from, before the overlap
+    _synced_at = 0.0
+    _rebuilt_at = 0.0
+    _confirmed = {}  # jti -> (revoked, expires_at), oldest first
+    _learned = {}  # jti -> when it entered the filter, for the last _recent_seconds
+    _recent_seconds = 30  # TOKEN_REVOCATION_RECENT_SECONDS; read here so the listener thread needs no app
+    _listener = None
+    _redis = None
+    _pid = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_revoked(cls, jti):
+        """
+        Check whether a token has been revoked.
+
+        Args:
+            jti (str): JWT ID of the token
+
+        Returns:
+            bool: True if the token is revoked
+        """
+        with use_primary():
+            cls._refresh()
+            if jti not in cls._filter:
+                return False
+
+            now = time.monotonic()
+            cached = cls._confirmed.get(jti)
+            if cached and cached[1] > now:
+                return cached[0]
+
+            revoked = TokenBlacklist.is_blacklisted(jti)
+
+        config = current_app.config
+        with cls._lock:
+            learned_at = cls._learned.get(jti)
+            if not revoked and learned_at is not None and now - learned_at < cls._recent_seconds:
+                # Learned moments ago (e.g. revoked by this process, not yet
+                # committed); don't let a "no" stick for the whole TTL
+                return False
+            cls._confirmed.pop(jti, None)
+            cls._confirmed[jti] = (revoked, now + config.get('TOKEN_REVOCATION_CONFIRM_TTL', 60))
+            # Dicts keep insertion order, so the first keys are the oldest entries
+            while len(cls._confirmed) > config.get('TOKEN_REVOCATION_CONFIRM_MAX_SIZE', 10000):
+                cls._confirmed.pop(next(iter(cls._confirmed)))
+        return revoked
+
+    @classmethod
+    def revoke(cls, claims):
+        """
+        Revoke a token in the current transaction.
+
+        Other processes are told over Redis once the transaction commits.
+
+        Args:
+            claims (dict): Decoded JWT, as returned by get_jwt()
+        """
+        db.session.add(TokenBlacklist(
+            jti=claims['jti'],
+            token_type=claims['type'],
+            user_id=claims['sub'],
+            expires_at=datetime.utcfromtimestamp(claims['exp'])
+        ))
+        cls._remember(claims['jti'])
+        db.session.info.setdefault(cls.PENDING_KEY, []).append(claims['jti'])
+
+    @classmethod
+    def _remember(cls, jti):
+        cls._refresh()
+        with cls._lock:
+            cls._add(jti)
+
+    @classmethod
+    def _add(cls, jti):
+        """Put a revoked jti in the filter; call with _lock held."""
+        now = time.monotonic()
+        if jti not in cls._filter:
+            cls._learned[jti] = now
+        # Dicts keep insertion order, so the first keys are the oldest entries
+        while cls._learned and now - next(iter(cls._learned.values())) >= cls._recent_seconds:
+            cls._learned.pop(next(iter(cls._learned)))
+        cls._filter.add(jti)
+        cached = cls._confirmed.get(jti)
+        if cached and not cached[0]:
+            cls._confirmed.pop(jti)
+
+    @classmethod
+    def _publish(cls, jtis):
+        try:
+            url = current_app.config.get('REDIS_URL')
+            if not url:
+                return
+            if cls._redis is None:
+                cls._redis = Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+            for jti in jtis:
+                cls._redis.publish(cls.CHANNEL, jti)
+        except RedisError as e:
+            # Other processes still pick it up on their next database sync
+            logger.warning(f"Could not broadcast token revocation: {str(e)}")
+        except RuntimeError:
+            # No application context; nothing else to tell
+            pass
+
+    @classmethod
+    def _refresh(cls):
+        now = time.monotonic()
+        config = current_app.config
+        if (cls._filter is not None and cls._pid == os.getpid()
+                and now - cls._synced_at < config.get('TOKEN_REVOCATION_SYNC_SECONDS', 10)):
+            return
+
+        with cls._lock:
+            cls._recent_seconds = config.get('TOKEN_REVOCATION_RECENT_SECONDS', 30)
+            if cls._pid != os.getpid():
+                # Forked worker: the parent's listener thread did not come along
+                cls._filter = None
+                cls._listener = None
+                cls._redis = None
+                cls._pid = os.getpid()
+
+            if (cls._filter is None or cls._filter.full
+                    or now - cls._rebuilt_at > config.get('TOKEN_REVOCATION_REBUILD_SECONDS', 3600)):
+                cls._rebuild(now)
+            elif now - cls._synced_at >= config.get('TOKEN_REVOCATION_SYNC_SECONDS', 10):
+                cls._sync(now)
+
+            if cls._listener is None:
+                cls._listen()
+
+    @classmethod
+    def _rebuild(cls, now):
+        """Load every unexpired revocation into a fresh filter, dropping expired ones."""
+        started = datetime.utcnow()
+        rows = db.session.query(TokenBlacklist.jti).filter(
+            TokenBlacklist.expires_at > started
+        ).all()
+
+        capacity = max(current_app.config.get('TOKEN_REVOCATION_BLOOM_CAPACITY', 100000), len(rows) * 2)
+        bloom = BloomFilter(capacity, current_app.config.get('TOKEN_REVOCATION_BLOOM_ERROR_RATE', 0.001))
+        for jti, in rows:
+            bloom.add(jti)
+
+        cls._filter = bloom
+        cls._synced_from = started
+        cls._confirmed = {}
+        cls._learned = {}
+        cls._synced_at = cls._rebuilt_at = now
+        logger.info(f"Loaded {len(rows)} revoked tokens into the revocation filter")
+
+    @classmethod
+    def _sync(cls, now):
+        """Add revocations committed since the last sync, re-reading the overlap window."""
+        started = datetime.utcnow()
+        overlap = timedelta(seconds=current_app.config.get('TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS', 300))
+        rows = db.session.query(TokenBlacklist.jti).filter(
+            TokenBlacklist.revoked_at >= cls._synced_from - overlap,
+            TokenBlacklist.expires_at > started
+        ).all()
+        # Adding is idempotent, so rows already loaded by an earlier sync are harmless
+        for jti, in rows:
+            cls._add(jti)
+        cls._synced_from = started
+        cls._synced_at = now
+
+    @classmethod
+    def _listen(cls):
+        url = current_app.config.get('REDIS_URL')
+        if not url:
+            cls._listener = False
+            return
+
+        def handle(message):
+            jti = message['data'].decode('utf-8')
+            with cls._lock:
+                cls._add(jti)
+
+        def failed(error, pubsub, thread):
+            # Fall back to the periodic database sync until the next attempt
+            logger.warning(f"Token revocation listener stopped: {str(error)}")
+            thread.stop()
+            cls._listener = None
+
+        try:
+            pubsub = Redis.from_url(url, socket_connect_timeout=0.25).pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{cls.CHANNEL: handle})
+            cls._listener = pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=failed)
+        except RedisError as e:
+            # Retried on the next sync; the database sync covers the gap
+            logger.warning(f"Token revocation listener unavailable: {str(e)}")
+
+    @staticmethod
+    def purge_expired(batch_size=None):
+        """
+        Delete revocations whose tokens have expired anyway.
+
+        Returns:
+            int: Number of rows deleted
+        """
+        batch_size = batch_size or current_app.config.get('TOKEN_REVOCATION_PURGE_BATCH_SIZE', 1000)
+        total = 0
+        while True:
+            deleted = TokenBlacklist.purge_expired(datetime.utcnow(), batch_size)
+            db.session.commit()
+            total += deleted
+            if deleted < batch_size:
+                break
+
+        if total:
+            logger.info(f"Purged {total} expired token revocations")
+        return total
+
+
+@event.listens_for(Session, 'after_commit')
+def _broadcast_committed_revocations(session):
+    jtis = session.info.pop(TokenRevocationService.PENDING_KEY, None)
+    if jtis:
+        TokenRevocationService._publish(jtis)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_revocations(session):
+    session.info.pop(TokenRevocationService.PENDING_KEY, None)
@@ -38,6 +38,37 @@ celery.conf.beat_schedule = {
         'task': 'app.tasks.reports.generate_daily_reports',
         'schedule': crontab(hour=0, minute=0),  # Daily at midnight
     },
+    'drain-email-outbox': {
+        'task': 'app.tasks.notification.drain_notification_outbox',
+        'schedule': 10.0,  # Every 10 seconds
+        'args': ('email',),
+    },
+    'drain-sms-outbox': {
+        'task': 'app.tasks.notification.drain_notification_outbox',
+        'schedule': 10.0,  # Every 10 seconds
+        'args': ('sms',),
+    },
+    'drain-push-outbox': {
+        'task': 'app.tasks.notification.drain_notification_outbox',
+        'schedule': 10.0,  # Every 10 seconds
+        'args': ('push',),
+    },
+    'flush-notification-digests': {
+        'task': 'app.tasks.notification.flush_notification_digests',
+        'schedule': 30.0,  # Every 30 seconds
+    },
+    'send-daily-hawker-summaries': {
+        'task': 'app.tasks.notification.send_daily_hawker_summaries',
+        'schedule': crontab(hour=8, minute=45),  # 2:15 PM Asia/Kolkata, after ORDER_CUTOFF_TIME
+    },
+    'archive-notifications': {
+        'task': 'app.tasks.notification.archive_notifications',
+        'schedule': crontab(minute=30),  # Hourly; each run is capped at NOTIFICATION_ARCHIVE_MAX_BATCHES
+    },
+    'purge-expired-revocations': {
+        'task': 'app.tasks.auth.purge_expired_revocations',
+        'schedule': crontab(minute=15),  # Hourly
+    },
 }
 
 # Setup logging
@@ -59,4 +90,4 @@ def setup_loggers(logger, *args, **kwargs):
     logger.addHandler(error_fh)
 
 # Import task modules
-from app.tasks import order, location, reports 
\ No newline at end of file
+from app.tasks import order, notification, location, reports, auth 
\ No newline at end of file
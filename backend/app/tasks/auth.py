@@ -0,0 +1,17 @@
+from app.tasks import celery
+from app.services.token_revocation import TokenRevocationService
+import logging
+
+logger = logging.getLogger(__name__)
+
+@celery.task(bind=True, max_retries=3)
+def purge_expired_revocations(self, batch_size=None):
+    """Delete token revocations whose tokens have expired anyway."""
+    try:
+        return {'purged': TokenRevocationService.purge_expired(batch_size)}
+
+    except Exception as exc:
+        from app import db
+        db.session.rollback()
+        logger.error(f"Error purging expired token revocations: {str(exc)}")
+        self.retry(exc=exc)
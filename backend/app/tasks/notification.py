@@ -0,0 +1,70 @@
+from app.tasks import celery
+from app.services.notification_outbox import NotificationOutboxService
+from app.services.push_notification import PushNotificationService
+from app.services.notification_digest import NotificationDigestService
+from app.services.daily_summary import DailySummaryService
+from app.services.notification_archive import NotificationArchiveService
+from datetime import date
+import logging
+
+logger = logging.getLogger(__name__)
+
+@celery.task(bind=True, max_retries=3)
+def drain_notification_outbox(self, channel, batch_size=None):
+    """Deliver due notification outbox entries for one channel."""
+    try:
+        sent, retried, failed = NotificationOutboxService.drain(channel, batch_size)
+        result = {'sent': sent, 'retried': retried, 'failed': failed}
+        if channel == 'push':
+            result['push_stats'] = PushNotificationService.get_stats()
+        return result
+
+    except Exception as exc:
+        logger.error(f"Error draining {channel} notification outbox: {str(exc)}")
+        self.retry(exc=exc)
+
+@celery.task(bind=True, max_retries=3)
+def flush_notification_digests(self, batch_size=None):
+    """Emit coalesced notifications for users whose digest window has closed."""
+    try:
+        return {'users': NotificationDigestService.flush_due(batch_size)}
+
+    except Exception as exc:
+        from app import db
+        db.session.rollback()
+        logger.error(f"Error flushing notification digests: {str(exc)}")
+        self.retry(exc=exc)
+
+@celery.task(bind=True, max_retries=3)
+def send_daily_hawker_summaries(self, day=None):
+    """Queue every hawker's daily delivery summary, then drain each channel in parallel."""
+    try:
+        def progress(done, total):
+            self.update_state(state='PROGRESS', meta={'done': done, 'total': total})
+
+        queued = DailySummaryService.queue(date.fromisoformat(day) if day else None, progress=progress)
+        for channel in NotificationOutboxService.CHANNELS:
+            drain_notification_outbox.delay(channel)
+        return {'hawkers': queued}
+
+    except Exception as exc:
+        from app import db
+        db.session.rollback()
+        logger.error(f"Error sending daily hawker summaries: {str(exc)}")
+        # Safe to retry: hawkers already summarised are skipped
+        self.retry(exc=exc)
+
+@celery.task(bind=True, max_retries=3)
+def archive_notifications(self):
+    """Move old read notifications to the archive in bounded batches."""
+    try:
+        return {
+            'archived': NotificationArchiveService.archive(),
+            'purged': NotificationArchiveService.purge()
+        }
+
+    except Exception as exc:
+        from app import db
+        db.session.rollback()
+        logger.error(f"Error archiving notifications: {str(exc)}")
+        self.retry(exc=exc)
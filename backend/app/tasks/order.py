@@ -2,44 +2,100 @@ from app.tasks import celery
 from app.models.order import Order
 from app.models.user import User
 from app.services.notification import NotificationService
+from app.services.notification_templates import NotificationTemplates
+from app.models.notification import Notification, NotificationOutbox
+from app.models.metrics import DailyOrderMetric
+from app import db
 from datetime import datetime, timedelta
-from sqlalchemy import and_
+from sqlalchemy import select, update
 import logging
 
 logger = logging.getLogger(__name__)
 
+ORDER_EXPIRY_MINUTES = 30
+EXPIRY_BATCH_SIZE = 500
+EXPIRY_REASON = 'No hawker accepted the order within 30 minutes'
+
+def _expire_order_batch(expiry_time, batch_size):
+    """
+    Atomically mark one batch of stale pending orders as expired.
+    
+    Candidate rows are locked with FOR UPDATE SKIP LOCKED, so several workers
+    can sweep concurrently without blocking on or double-processing rows.
+    
+    Returns:
+        list: Rows (id, customer_id, hawker_id, created_at, total_amount) that were expired
+    """
+    candidates = select(Order.id).where(
+        Order.status == 'pending',
+        Order.created_at < expiry_time
+    ).order_by(Order.id).limit(batch_size).with_for_update(skip_locked=True)
+    
+    stmt = update(Order).where(
+        Order.id.in_(candidates),
+        Order.status == 'pending'
+    ).values(
+        status='expired',
+        updated_at=datetime.utcnow()
+    ).returning(
+        Order.id, Order.customer_id, Order.hawker_id, Order.created_at, Order.total_amount
+    ).execution_options(synchronize_session=False)
+    
+    return db.session.execute(stmt).all()
+
 @celery.task(bind=True, max_retries=3)
-def cleanup_expired_orders(self):
+def cleanup_expired_orders(self, batch_size=EXPIRY_BATCH_SIZE):
     """Clean up expired orders that haven't been accepted."""
     try:
-        # Find orders that are older than 30 minutes and still pending
-        expiry_time = datetime.utcnow() - timedelta(minutes=30)
-        expired_orders = Order.query.filter(
-            and_(
-                Order.status == 'pending',
-                Order.created_at < expiry_time
-            )
-        ).all()
-        
-        for order in expired_orders:
-            # Update order status
-            order.status = 'expired'
-            order.updated_at = datetime.utcnow()
+        expiry_time = datetime.utcnow() - timedelta(minutes=ORDER_EXPIRY_MINUTES)
+        data = {'reason': EXPIRY_REASON}
+        total = 0
+        
+        while True:
+            expired = _expire_order_batch(expiry_time, batch_size)
+            if not expired:
+                break
             
-            # Notify customer
-            NotificationService.send_order_notification(
-                order.id,
-                'order_expired',
-                {'reason': 'No hawker accepted the order within 30 minutes'}
-            )
-        
-        # Commit changes
-        from app import db
-        db.session.commit()
+            # Bulk UPDATE skips the Order mapper events, so adjust metrics here
+            DailyOrderMetric.apply_status_change(db.session.connection(), expired, 'pending', 'expired')
+            
+            # Render each order's content once for the in-app row and every channel
+            rendered = {order.id: NotificationTemplates.render('order_expired', order, data) for order in expired}
+            
+            # One bulk insert for the whole batch's in-app notifications
+            Notification.bulk_create([{
+                'user_id': order.customer_id,
+                'type': 'order_expired',
+                'title': rendered[order.id].title,
+                'message': rendered[order.id].message,
+                'data': dict(data, order_id=order.id),
+                'read': False,
+                'created_at': datetime.utcnow()
+            } for order in expired])
+            
+            # Email/SMS/push go through the outbox, committed with the batch
+            customers = {
+                user.id: user
+                for user in User.query.filter(User.id.in_({order.customer_id for order in expired})).all()
+            }
+            NotificationOutbox.enqueue([
+                entry
+                for order in expired
+                for entry in NotificationService.build_outbox_entries(
+                    customers.get(order.customer_id), 'order_expired', order, data, rendered[order.id]
+                )
+            ])
+            
+            db.session.commit()
+            
+            total += len(expired)
+            if len(expired) < batch_size:
+                break
         
-        logger.info(f"Cleaned up {len(expired_orders)} expired orders")
+        logger.info(f"Cleaned up {total} expired orders")
         
     except Exception as exc:
+        db.session.rollback()
         logger.error(f"Error cleaning up expired orders: {str(exc)}")
         self.retry(exc=exc)
 
@@ -0,0 +1,86 @@
+from datetime import datetime, time, timedelta
+import pytz
+from app.config import Config
+
+# Timestamps such as Order.created_at are stored as naive UTC (datetime.utcnow),
+# while business days are defined in Config.TIMEZONE. These helpers translate a
+# local calendar day, or a span of days, into a half-open [start, end) range of
+# naive UTC datetimes, so filters compare the raw column and can use its index
+# instead of wrapping it in DATE().
+
+
+def get_timezone():
+    """Return the configured business timezone"""
+    return pytz.timezone(Config.TIMEZONE)
+
+
+def local_today():
+    """Return today's date in the configured timezone"""
+    return datetime.now(get_timezone()).date()
+
+
+def to_local_date(value):
+    """
+    Convert a stored naive UTC datetime to its local calendar day
+
+    Args:
+        value (datetime): Naive UTC datetime, e.g. Order.created_at
+
+    Returns:
+        date: Day in the configured timezone
+    """
+    return pytz.utc.localize(value).astimezone(get_timezone()).date()
+
+
+def local_midnight_utc(day):
+    """
+    Convert local midnight at the start of a day to a naive UTC datetime
+
+    Args:
+        day (date): Local calendar day
+
+    Returns:
+        datetime: Naive UTC datetime comparable with stored timestamps
+    """
+    local_start = get_timezone().localize(datetime.combine(day, time.min))
+    return local_start.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def date_range(start_day, end_day):
+    """
+    Half-open UTC range covering local days start_day..end_day inclusive
+
+    Args:
+        start_day (date): First local day
+        end_day (date): Last local day (inclusive)
+
+    Returns:
+        tuple: (start, end) naive UTC datetimes where end is exclusive
+    """
+    return local_midnight_utc(start_day), local_midnight_utc(end_day + timedelta(days=1))
+
+
+def day_range(day=None):
+    """Half-open UTC range for a single local day (defaults to today)"""
+    day = day or local_today()
+    return date_range(day, day)
+
+
+def within(column, start=None, end=None):
+    """
+    Build a sargable filter for a half-open range on a datetime column
+
+    Args:
+        column: SQLAlchemy column, e.g. Order.created_at
+        start (datetime, optional): Inclusive lower bound
+        end (datetime, optional): Exclusive upper bound
+
+    Returns:
+        list: Filter expressions to pass to query.filter(*...)
+    """
+    criteria = []
+    if start is not None:
+        criteria.append(column >= start)
+    if end is not None:
+        criteria.append(column < end)
+    return criteria
@@ -0,0 +1,95 @@
+import threading
+
+
+class Histogram:
+    """
+    Thread-safe log-linear (HDR-style) histogram of durations in seconds
+
+    Values are counted in `resolution`-sized units in buckets whose width
+    doubles every `sub_buckets / 2` buckets, so every recorded value is kept
+    to within 2 / sub_buckets of its true size (about 3% by default) from
+    microseconds to hours, in a few hundred counters at most. Recording is
+    O(1); percentiles walk only the buckets that have been used.
+    """
+
+    def __init__(self, resolution=1e-6, sub_bucket_bits=6):
+        self.resolution = resolution
+        self._sub_bits = sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self._counts = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def _index(self, value):
+        units = max(0, int(value / self.resolution))
+        magnitude = max(0, units.bit_length() - self._sub_bits)
+        return magnitude * self._half + (units >> magnitude)
+
+    def _upper(self, index):
+        """Largest value counted in a bucket."""
+        if index < 2 * self._half:
+            return (index + 1) * self.resolution
+        magnitude = index // self._half - 1
+        mantissa = index - magnitude * self._half
+        return ((mantissa + 1) << magnitude) * self.resolution
+
+    def record(self, value):
+        index = self._index(value)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, q):
+        """
+        Value below which a fraction `q` of recordings fall
+
+        Args:
+            q (float): Between 0 and 1, e.g. 0.95
+
+        Returns:
+            float: Upper bound of the bucket holding that recording (0 if empty)
+        """
+        with self._lock:
+            counts = sorted(self._counts.items())
+            total = self.count
+            highest = self.max
+        if not total:
+            return 0.0
+        target = max(1, q * total)
+        seen = 0
+        for index, count in counts:
+            seen += count
+            if seen >= target:
+                return min(self._upper(index), highest)
+        return highest
+
+    def cumulative(self, bounds):
+        """
+        Counts at or below each bound, for Prometheus `le` buckets
+
+        Bucket edges rarely line up with the bounds exactly, so a count may
+        include values up to one bucket width above its bound.
+
+        Args:
+            bounds (list): Ascending upper bounds in seconds
+
+        Returns:
+            list: Cumulative count for each bound
+        """
+        with self._lock:
+            counts = sorted(self._counts.items())
+        result = []
+        seen = 0
+        position = 0
+        for bound in bounds:
+            limit = self._index(bound)
+            while position < len(counts) and counts[position][0] <= limit:
+                seen += counts[position][1]
+                position += 1
+            result.append(seen)
+        return result
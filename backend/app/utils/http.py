@@ -0,0 +1,139 @@
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError
+from urllib3.util.retry import Retry
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one provider
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail immediately for `reset_timeout` seconds. Then one trial call is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Whether a call may go ahead now
+
+        Returns:
+            bool: False while the circuit is open, or half-open with a trial in flight
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self._failures >= self.failure_threshold):
+                logger.warning(f"Circuit for {self.name} opened after {self._failures} failure(s); "
+                               f"failing fast for {self.reset_timeout}s")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ProviderAdapter(HTTPAdapter):
+    """
+    HTTPAdapter applying a default timeout and a circuit breaker to every request
+
+    Connection errors, timeouts and 5xx responses (after retries) count as
+    failures; any other response, including 4xx, shows the provider is up.
+    """
+
+    def __init__(self, breaker, timeout, **kwargs):
+        self.breaker = breaker
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.breaker.name} is unavailable (circuit open)", request=request)
+        try:
+            response = super().send(request, timeout=timeout or self.timeout, **kwargs)
+        except Exception:
+            # Whatever went wrong, a half-open circuit must not wait on this call forever
+            self.breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+
+def provider_session(name, pool_size=10, connect_timeout=3.05, read_timeout=10,
+                     retries=2, failure_threshold=5, reset_timeout=30):
+    """
+    Keep-alive session for one provider's API
+
+    Connections are pooled per host (up to `pool_size` kept open, one per
+    concurrent thread). Connection failures are retried with backoff for every
+    method, since nothing reached the server; read errors and 502/503/504
+    responses are retried for idempotent methods only.
+
+    Args:
+        name (str): Provider name, used in logs and errors
+        pool_size (int): Connections kept open per host
+        connect_timeout (float): Seconds to establish a connection
+        read_timeout (float): Seconds to wait for each read
+        retries (int): Retries per request
+        failure_threshold (int): Consecutive failures that open the circuit
+        reset_timeout (float): Seconds the circuit stays open
+
+    Returns:
+        requests.Session: Session with the adapter mounted for http and https
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        status_forcelist=(502, 503, 504),
+        backoff_factor=0.2,
+        raise_on_status=False,
+        respect_retry_after_header=False
+    )
+    adapter = ProviderAdapter(
+        CircuitBreaker(name, failure_threshold, reset_timeout),
+        (connect_timeout, read_timeout),
+        pool_connections=4,
+        pool_maxsize=pool_size,
+        max_retries=retry
+    )
+    session = Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
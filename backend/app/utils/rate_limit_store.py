@@ -0,0 +1,109 @@
+import threading
+import time
+import zlib
+
+
+class _Entry:
+    __slots__ = ('tat',)
+
+    def __init__(self, tat):
+        self.tat = tat  # Theoretical arrival time (time.monotonic() seconds)
+
+
+class LocalRateLimitStore:
+    """
+    Bounded, thread-safe in-process GCRA limiter
+
+    Keys are spread over `shards` independently locked dicts, so concurrent
+    requests for different clients rarely wait on each other. An entry is
+    worth keeping only until its theoretical arrival time passes (after that
+    it behaves exactly like a missing key), so expired entries are dropped as
+    they are met and the least recently used are evicted beyond `max_keys`.
+    Evicting a live entry only forgets that client's usage, never blocks it.
+    """
+
+    # Expired entries examined per write, keeping eviction work bounded per call
+    SWEEP = 4
+
+    def __init__(self, max_keys=10000, shards=16):
+        if max_keys <= 0 or shards <= 0:
+            raise ValueError("max_keys and shards must be positive")
+        self.shards = int(shards)
+        self.max_per_shard = max(1, int(max_keys) // self.shards)
+        self._entries = [{} for _ in range(self.shards)]
+        self._locks = [threading.Lock() for _ in range(self.shards)]
+
+    def _shard(self, key):
+        return zlib.crc32(key.encode('utf-8')) % self.shards
+
+    def _put(self, entries, key, entry, now):
+        # Dicts keep insertion order: re-inserting moves the key to the newest end
+        entries.pop(key, None)
+        entries[key] = entry
+        for _ in range(self.SWEEP):
+            oldest = next(iter(entries))
+            if oldest == key or entries[oldest].tat > now:
+                break
+            del entries[oldest]
+        while len(entries) > self.max_per_shard:
+            del entries[next(iter(entries))]
+
+    def hit(self, key, limit, period, cost=1):
+        """
+        Count a request against a key
+
+        Args:
+            key (str): Client key
+            limit (int): Requests allowed per period
+            period (float): Period in seconds
+            cost (int): Units this request uses
+
+        Returns:
+            tuple: (allowed, remaining, reset_after, retry_after), times in
+                seconds, matching the Redis limiter's script
+        """
+        emission = period / limit
+        index = self._shard(key)
+        entries = self._entries[index]
+        with self._locks[index]:
+            now = time.monotonic()
+            entry = entries.get(key)
+            tat = max(entry.tat, now) if entry is not None else now
+            new_tat = tat + emission * cost
+            allow_at = new_tat - period
+            if allow_at > now:
+                return False, 0, tat - now, allow_at - now
+            if entry is None:
+                entry = _Entry(new_tat)
+            else:
+                entry.tat = new_tat
+            self._put(entries, key, entry, now)
+            return True, int((now - allow_at) / emission), new_tat - now, 0.0
+
+    def block(self, key, limit, period, retry_after):
+        """
+        Reject a key locally for `retry_after` seconds
+
+        Used to remember a denial made elsewhere (e.g. by Redis), so repeat
+        requests from the same client are turned away without asking again.
+        """
+        index = self._shard(key)
+        entries = self._entries[index]
+        with self._locks[index]:
+            now = time.monotonic()
+            # The next request is allowed once new_tat - period <= now
+            tat = now + retry_after + period - period / limit
+            entry = entries.get(key)
+            if entry is None:
+                entry = _Entry(tat)
+            else:
+                entry.tat = max(entry.tat, tat)
+            self._put(entries, key, entry, now)
+
+    def clear(self):
+        for index in range(self.shards):
+            with self._locks[index]:
+                self._entries[index].clear()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries)
@@ -0,0 +1,57 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for pacing calls to a rate-limited provider
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so short
+    bursts are allowed while the long-run rate never exceeds the provider's cap.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """
+        Take a token if one is available
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, deadline=None):
+        """
+        Block until a token is available
+
+        Args:
+            deadline (float, optional): time.monotonic() value to give up at
+
+        Returns:
+            bool: True if a token was taken, False if the deadline passed first
+        """
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
@@ -0,0 +1,358 @@
+"""create the base schema
+
+Revision ID: 0000_base_schema
+Revises:
+Create Date: 2025-05-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0000_base_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The tables that predate the migration chain. Databases first built with
+    # db.create_all() already have them, hence IF NOT EXISTS.
+    op.create_table(
+        'cancellation_reasons',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('code', sa.String(length=50), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('requires_refund', sa.Boolean(), nullable=True),
+        sa.Column('refund_percentage', sa.Float(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('code'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'routes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('orders', sa.JSON(), nullable=True),
+        sa.Column('waypoints', sa.JSON(), nullable=True),
+        sa.Column('polyline', sa.Text(), nullable=True),
+        sa.Column('distance', sa.Integer(), nullable=True),
+        sa.Column('duration', sa.Integer(), nullable=True),
+        sa.Column('duration_in_traffic', sa.Integer(), nullable=True),
+        sa.Column('start_location', sa.JSON(), nullable=True),
+        sa.Column('end_location', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('shared_with', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=False),
+        sa.Column('password_hash', sa.String(length=128), nullable=False),
+        sa.Column('role', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('email_verified', sa.Boolean(), nullable=True),
+        sa.Column('email_verified_at', sa.DateTime(), nullable=True),
+        sa.Column('email_verification_sent_at', sa.DateTime(), nullable=True),
+        sa.Column('business_name', sa.String(length=100), nullable=True),
+        sa.Column('business_address', sa.String(length=200), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('notify_order_created', sa.Boolean(), nullable=True),
+        sa.Column('notify_order_confirmed', sa.Boolean(), nullable=True),
+        sa.Column('notify_order_preparing', sa.Boolean(), nullable=True),
+        sa.Column('notify_order_ready', sa.Boolean(), nullable=True),
+        sa.Column('notify_order_delivered', sa.Boolean(), nullable=True),
+        sa.Column('notify_order_cancelled', sa.Boolean(), nullable=True),
+        sa.Column('notify_account_updates', sa.Boolean(), nullable=True),
+        sa.Column('notify_promotions', sa.Boolean(), nullable=True),
+        sa.Column('notify_email', sa.Boolean(), nullable=True),
+        sa.Column('notify_push', sa.Boolean(), nullable=True),
+        sa.Column('notify_sms', sa.Boolean(), nullable=True),
+        sa.Column('device_tokens', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('phone'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'hawker_routes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hawker_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('order_sequence', sa.Text(), nullable=False),
+        sa.Column('total_distance', sa.Float(), nullable=False),
+        sa.Column('estimated_duration', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['hawker_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'locations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('accuracy', sa.Float(), nullable=True),
+        sa.Column('speed', sa.Float(), nullable=True),
+        sa.Column('heading', sa.Float(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'notifications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('data', sa.JSON(), nullable=True),
+        sa.Column('read', sa.Boolean(), nullable=True),
+        sa.Column('read_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'orders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('hawker_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('delivery_address', sa.String(length=200), nullable=False),
+        sa.Column('delivery_latitude', sa.Float(), nullable=False),
+        sa.Column('delivery_longitude', sa.Float(), nullable=False),
+        sa.Column('delivery_instructions', sa.Text(), nullable=True),
+        sa.Column('delivery_time', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('payment_status', sa.String(length=20), nullable=True),
+        sa.Column('cancelled_at', sa.DateTime(), nullable=True),
+        sa.Column('cancelled_by', sa.Integer(), nullable=True),
+        sa.Column('cancellation_reason', sa.String(length=200), nullable=True),
+        sa.Column('cancellation_details', sa.Text(), nullable=True),
+        sa.Column('refund_status', sa.String(length=20), nullable=True),
+        sa.Column('refund_amount', sa.Float(), nullable=True),
+        sa.Column('refunded_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['cancelled_by'], ['users.id']),
+        sa.ForeignKeyConstraint(['customer_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['hawker_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'products',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hawker_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('image_url', sa.String(length=200), nullable=True),
+        sa.Column('is_available', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['hawker_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'route_analytics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('route_id', sa.Integer(), nullable=False),
+        sa.Column('total_distance', sa.Integer(), nullable=True),
+        sa.Column('total_duration', sa.Integer(), nullable=True),
+        sa.Column('avg_speed', sa.Float(), nullable=True),
+        sa.Column('traffic_data', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['route_id'], ['routes.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'route_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('route_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('distance', sa.Integer(), nullable=True),
+        sa.Column('duration', sa.Integer(), nullable=True),
+        sa.Column('duration_in_traffic', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['route_id'], ['routes.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'token_blacklist',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=36), nullable=False),
+        sa.Column('token_type', sa.String(length=10), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'location_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('accuracy', sa.Float(), nullable=True),
+        sa.Column('speed', sa.Float(), nullable=True),
+        sa.Column('heading', sa.Float(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.Column('address', sa.String(length=255), nullable=True),
+        sa.Column('location_type', sa.String(length=50), nullable=True),
+        sa.Column('order_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'order_disputes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('evidence', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('resolution', sa.JSON(), nullable=True),
+        sa.Column('resolved_by', sa.Integer(), nullable=True),
+        sa.Column('resolved_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.ForeignKeyConstraint(['resolved_by'], ['users.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'order_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'order_ratings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('product_quality', sa.Integer(), nullable=True),
+        sa.Column('delivery_time', sa.Integer(), nullable=True),
+        sa.Column('communication', sa.Integer(), nullable=True),
+        sa.Column('packaging', sa.Integer(), nullable=True),
+        sa.Column('value_for_money', sa.Integer(), nullable=True),
+        sa.Column('product_condition', sa.Integer(), nullable=True),
+        sa.Column('tags', sa.JSON(), nullable=True),
+        sa.Column('photos', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'payments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=False),
+        sa.Column('payment_method', sa.String(length=100), nullable=False),
+        sa.Column('payment_intent_id', sa.String(length=100), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('payment_metadata', sa.JSON(), nullable=True),
+        sa.Column('refunded_amount', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('refunded_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('payment_intent_id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'payment_disputes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('payment_id', sa.Integer(), nullable=False),
+        sa.Column('dispute_id', sa.String(length=100), nullable=False),
+        sa.Column('reason', sa.String(length=100), nullable=False),
+        sa.Column('evidence', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('resolution', sa.Text(), nullable=True),
+        sa.Column('resolved_by', sa.Integer(), nullable=True),
+        sa.Column('resolved_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['payment_id'], ['payments.id']),
+        sa.ForeignKeyConstraint(['resolved_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dispute_id'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'payment_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('payment_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('type', sa.String(length=20), nullable=False),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['payment_id'], ['payments.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('payment_history')
+    op.drop_table('payment_disputes')
+    op.drop_table('payments')
+    op.drop_table('order_ratings')
+    op.drop_table('order_items')
+    op.drop_table('order_disputes')
+    op.drop_table('location_history')
+    op.drop_table('token_blacklist')
+    op.drop_table('route_history')
+    op.drop_table('route_analytics')
+    op.drop_table('products')
+    op.drop_table('orders')
+    op.drop_table('notifications')
+    op.drop_table('locations')
+    op.drop_table('hawker_routes')
+    op.drop_table('users')
+    op.drop_table('routes')
+    op.drop_table('cancellation_reasons')
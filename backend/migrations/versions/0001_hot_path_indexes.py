@@ -0,0 +1,60 @@
+"""add indexes for hot query paths
+
+Revision ID: 0001_hot_path_indexes
+Revises: 0000_base_schema
+Create Date: 2025-05-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_hot_path_indexes'
+down_revision = '0000_base_schema'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, partial WHERE clause for postgresql / sqlite / mssql)
+INDEXES = [
+    ('ix_orders_hawker_status_created', 'orders', ['hawker_id', 'status', 'created_at'], None),
+    ('ix_orders_customer_created', 'orders', ['customer_id', 'created_at'], None),
+    ('ix_orders_status_created', 'orders', ['status', 'created_at'], None),
+    ('ix_orders_created_at', 'orders', ['created_at'], None),
+    ('ix_orders_pending_created', 'orders', ['created_at'],
+     ("status = 'pending'", "status = 'pending'", "status = 'pending'")),
+    ('ix_order_items_order_id', 'order_items', ['order_id'], None),
+    ('ix_order_ratings_order_id', 'order_ratings', ['order_id'], None),
+    ('ix_notifications_user_read', 'notifications', ['user_id', 'read'], None),
+    ('ix_notifications_user_created', 'notifications', ['user_id', 'created_at'], None),
+    ('ix_notifications_user_unread', 'notifications', ['user_id'],
+     ('read = false', 'read = 0', '[read] = 0')),
+    ('ix_locations_user_active', 'locations', ['user_id', 'is_active'], None),
+    ('ix_location_history_user_timestamp', 'location_history', ['user_id', 'timestamp'], None),
+    ('ix_location_history_order_id', 'location_history', ['order_id'], None),
+    ('ix_location_history_timestamp', 'location_history', ['timestamp'], None),
+    ('ix_token_blacklist_expires_at', 'token_blacklist', ['expires_at'], None),
+    ('ix_hawker_routes_hawker_date', 'hawker_routes', ['hawker_id', 'date'], None),
+    ('ix_products_hawker_available', 'products', ['hawker_id', 'is_available'], None),
+    ('ix_payments_order_id', 'payments', ['order_id'], None),
+    ('ix_payment_history_payment_created', 'payment_history', ['payment_id', 'created_at'], None),
+    ('ix_users_role_active', 'users', ['role', 'is_active'], None),
+]
+
+
+def upgrade():
+    # Tables created through db.create_all() may already carry these indexes,
+    # so every statement is guarded with IF NOT EXISTS.
+    for name, table, columns, where in INDEXES:
+        kwargs = {}
+        if where:
+            kwargs['postgresql_where'] = sa.text(where[0])
+            kwargs['sqlite_where'] = sa.text(where[1])
+            kwargs['mssql_where'] = sa.text(where[2])
+        op.create_index(name, table, columns, if_not_exists=True, **kwargs)
+
+
+def downgrade():
+    for name, table, columns, where in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
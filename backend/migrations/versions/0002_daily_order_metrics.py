@@ -0,0 +1,41 @@
+"""add daily order metrics
+
+Revision ID: 0002_daily_order_metrics
+Revises: 0001_hot_path_indexes
+Create Date: 2025-05-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_daily_order_metrics'
+down_revision = '0001_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate existing data afterwards with `flask rebuild-order-metrics`
+    op.create_table(
+        'daily_order_metrics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('hawker_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['hawker_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'hawker_id', 'status', name='uq_daily_order_metrics_day_hawker_status'),
+        if_not_exists=True
+    )
+    op.create_index('ix_daily_order_metrics_hawker_day', 'daily_order_metrics', ['hawker_id', 'day'],
+                    if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_daily_order_metrics_hawker_day', table_name='daily_order_metrics', if_exists=True)
+    op.drop_table('daily_order_metrics')
@@ -0,0 +1,46 @@
+"""add hawker rating aggregates
+
+Revision ID: 0003_hawker_rating_aggregates
+Revises: 0002_daily_order_metrics
+Create Date: 2025-05-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_hawker_rating_aggregates'
+down_revision = '0002_daily_order_metrics'
+branch_labels = None
+depends_on = None
+
+CATEGORIES = ('product_quality', 'delivery_time', 'communication',
+              'packaging', 'value_for_money', 'product_condition')
+
+
+def upgrade():
+    # Populate existing data afterwards with `flask rebuild-hawker-ratings`
+    category_columns = []
+    for category in CATEGORIES:
+        category_columns.append(sa.Column(f'{category}_sum', sa.Integer(), nullable=False, server_default='0'))
+        category_columns.append(sa.Column(f'{category}_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table(
+        'hawker_rating_aggregates',
+        sa.Column('hawker_id', sa.Integer(), nullable=False),
+        sa.Column('rating_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'),
+        *category_columns,
+        sa.Column('decayed_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('decayed_weight', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('decayed_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['hawker_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('hawker_id'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('hawker_rating_aggregates')
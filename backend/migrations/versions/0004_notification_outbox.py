@@ -0,0 +1,46 @@
+"""add notification outbox
+
+Revision ID: 0004_notification_outbox
+Revises: 0003_hawker_rating_aggregates
+Create Date: 2025-05-21 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_notification_outbox'
+down_revision = '0003_hawker_rating_aggregates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'notification_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=255), nullable=False),
+        sa.Column('channel', sa.String(length=20), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('notification_type', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('idempotency_key'),
+        if_not_exists=True
+    )
+    op.create_index('ix_notification_outbox_channel_status_next', 'notification_outbox',
+                    ['channel', 'status', 'next_attempt_at'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_notification_outbox_channel_status_next', table_name='notification_outbox', if_exists=True)
+    op.drop_table('notification_outbox')
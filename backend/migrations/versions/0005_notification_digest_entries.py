@@ -0,0 +1,48 @@
+"""add notification digest entries
+
+Revision ID: 0005_notification_digest_entries
+Revises: 0004_notification_outbox
+Create Date: 2025-05-22 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_notification_digest_entries'
+down_revision = '0004_notification_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'notification_digest_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=True),
+        sa.Column('coalesce_key', sa.String(length=100), nullable=False),
+        sa.Column('notification_type', sa.String(length=50), nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('html', sa.Text(), nullable=True),
+        sa.Column('data', sa.JSON(), nullable=True),
+        sa.Column('deliver', sa.Boolean(), nullable=False),
+        sa.Column('flush_after', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'coalesce_key', name='uq_notification_digest_entries_user_key'),
+        if_not_exists=True
+    )
+    op.create_index('ix_notification_digest_entries_flush_after', 'notification_digest_entries',
+                    ['flush_after'], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_notification_digest_entries_flush_after', table_name='notification_digest_entries',
+                  if_exists=True)
+    op.drop_table('notification_digest_entries')
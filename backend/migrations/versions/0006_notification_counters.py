@@ -0,0 +1,33 @@
+"""add notification counters
+
+Revision ID: 0006_notification_counters
+Revises: 0005_notification_digest_entries
+Create Date: 2025-05-23 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_notification_counters'
+down_revision = '0005_notification_digest_entries'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate existing data afterwards with `flask rebuild-notification-counters`
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+        if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('notification_counters')
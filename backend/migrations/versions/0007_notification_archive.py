@@ -0,0 +1,45 @@
+"""add notification archive
+
+Revision ID: 0007_notification_archive
+Revises: 0006_notification_counters
+Create Date: 2025-05-24 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_notification_archive'
+down_revision = '0006_notification_counters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing read notifications move over on the first runs of the archive_notifications task
+    op.create_table(
+        'notification_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('content', sa.LargeBinary(), nullable=False),
+        sa.Column('read_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True
+    )
+    op.create_index('ix_notification_archive_user_created', 'notification_archive',
+                    ['user_id', 'created_at'], if_not_exists=True)
+    op.create_index('ix_notifications_read_created', 'notifications', ['created_at'],
+                    postgresql_where=sa.text('read = true'), sqlite_where=sa.text('read = 1'),
+                    mssql_where=sa.text('[read] = 1'),
+                    if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_notifications_read_created', table_name='notifications', if_exists=True)
+    op.drop_index('ix_notification_archive_user_created', table_name='notification_archive', if_exists=True)
+    op.drop_table('notification_archive')
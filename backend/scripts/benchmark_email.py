@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Default to a throwaway database so the benchmark never touches real data
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+from aiosmtpd.controller import Controller
+from flask_mail import Message
+from app import create_app
+from app.services.email_delivery import EmailDeliveryService
+
+SINK_HOST = '127.0.0.1'
+SINK_PORT = 8025
+
+
+class CountingHandler:
+    """aiosmtpd handler that accepts and counts every message."""
+
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 Message accepted for delivery'
+
+
+def build_messages(count):
+    """Build a daily-summary sized message per recipient."""
+    return [
+        Message(
+            subject='Your deliveries today',
+            recipients=[f'hawker{i}@example.com'],
+            html=f'<html><body><h1>Hawker {i}</h1><p>You have 3 deliveries today.</p></body></html>'
+        ) for i in range(count)
+    ]
+
+
+def run_benchmark(count):
+    """Send `count` messages to a local SMTP sink and report throughput."""
+    handler = CountingHandler()
+    controller = Controller(handler, hostname=SINK_HOST, port=SINK_PORT)
+    controller.start()
+
+    app = create_app()
+    app.config.update(
+        MAIL_SERVER=SINK_HOST,
+        MAIL_PORT=SINK_PORT,
+        MAIL_USE_TLS=False,
+        MAIL_USE_SSL=False,
+        MAIL_USERNAME=None,
+        MAIL_PASSWORD=None,
+        MAIL_DEFAULT_SENDER='noreply@example.com'
+    )
+
+    try:
+        with app.app_context():
+            messages = build_messages(count)
+
+            started = time.perf_counter()
+            results = EmailDeliveryService.send_batch(messages)
+            elapsed = time.perf_counter() - started
+
+            EmailDeliveryService.get_pool().close_all()
+    finally:
+        controller.stop()
+
+    sent = sum(1 for ok, _ in results if ok)
+    logger.info(
+        f"Sent {sent}/{count} messages in {elapsed:.2f}s "
+        f"({sent / elapsed if elapsed else 0:.0f} msg/s, "
+        f"pool={app.config['MAIL_POOL_SIZE']}, batch={app.config['MAIL_BATCH_SIZE']}); "
+        f"sink received {handler.received}"
+    )
+    return sent == count
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark pooled SMTP delivery against a local sink.')
+    parser.add_argument('--count', type=int, default=10000, help='Number of messages to send')
+    args = parser.parse_args()
+    sys.exit(0 if run_benchmark(args.count) else 1)
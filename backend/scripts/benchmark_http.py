@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Default to a throwaway database so the benchmark never touches real data
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+import requests
+from app import create_app
+from app.services.container import ServiceContainer
+
+
+class FakeProvider(ThreadingHTTPServer):
+    """Distance Matrix stand-in that can be switched into an outage where it stops answering."""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.hanging = False
+        self.connections = 0
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; don't let Nagle hold the body back on a kept-alive socket
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        if self.server.hanging:
+            time.sleep(5)
+        time.sleep(self.server.latency)
+        body = b'{"status": "OK", "rows": [{"elements": [{"status": "OK", "distance": {"value": 1200}, "duration": {"value": 300}}]}]}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def time_calls(get, url, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        get(url, params={'origins': '12.9,77.6', 'destinations': '12.95,77.65'}).json()
+    return (time.perf_counter() - started) / calls
+
+
+def run_benchmark(calls, latency):
+    server = FakeProvider(('127.0.0.1', 0), latency)
+    server.start()
+    url = f"{server.base_url}/maps/api/distancematrix/json"
+
+    app = create_app({'TESTING': True, 'HTTP_READ_TIMEOUT': 0.5, 'HTTP_RETRIES': 0,
+                      'HTTP_BREAKER_FAILURES': 5, 'HTTP_BREAKER_RESET_SECONDS': 30})
+    with app.app_context():
+        session = ServiceContainer.get('http.googlemaps')
+
+        server.connections = 0
+        bare = time_calls(requests.get, url, calls)
+        bare_connections = server.connections
+        server.connections = 0
+        pooled = time_calls(session.get, url, calls)
+        logger.info(f"requests.get:   {bare * 1000:.2f} ms per call, {bare_connections} connections")
+        logger.info(f"pooled session: {pooled * 1000:.2f} ms per call, {server.connections} connections")
+
+        # Outage: the provider stops answering
+        server.hanging = True
+        outcomes = []
+        for _ in range(20):
+            started = time.perf_counter()
+            try:
+                session.get(url)
+                outcome = 'ok'
+            except requests.exceptions.RequestException as e:
+                outcome = type(e).__name__
+            outcomes.append((outcome, time.perf_counter() - started))
+        server.hanging = False
+
+    slow = [elapsed for outcome, elapsed in outcomes if outcome != 'CircuitOpenError']
+    fast = [elapsed for outcome, elapsed in outcomes if outcome == 'CircuitOpenError']
+    logger.info(f"Outage: {len(slow)} calls waited for the timeout ({sum(slow):.2f}s in total), "
+                f"{len(fast)} failed fast (max {max(fast, default=0) * 1000:.2f} ms)")
+    server.shutdown()
+    return bool(fast) and max(fast) < 0.01
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare pooled provider sessions with bare requests and check the circuit breaker.')
+    parser.add_argument('--calls', type=int, default=300, help='Calls per client')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated provider latency in seconds')
+    args = parser.parse_args()
+    sys.exit(0 if run_benchmark(args.calls, args.latency) else 1)
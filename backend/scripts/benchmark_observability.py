@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from app import create_app, db
+from app.utils.histogram import Histogram
+
+
+def time_requests(enabled, requests):
+    """Mean wall time of a cheap request that runs one query, with or without the middleware."""
+    app = create_app({'TESTING': True, 'RATELIMIT_ENABLED': False, 'OBSERVABILITY_ENABLED': enabled})
+
+    @app.route('/_bench')
+    def bench():
+        db.session.execute(db.text('SELECT 1'))
+        return {'ok': True}
+
+    client = app.test_client()
+    for _ in range(100):
+        client.get('/_bench')
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get('/_bench')
+    return (time.perf_counter() - started) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cost of request timing and /metrics')
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    histogram = Histogram()
+    started = time.perf_counter()
+    for i in range(100000):
+        histogram.record(i * 1e-6)
+    logger.info(f"Histogram.record: {(time.perf_counter() - started) / 100000 * 1e6:.2f}us")
+
+    off = time_requests(False, args.requests)
+    on = time_requests(True, args.requests)
+    logger.info(f"Without middleware: {off * 1e6:.0f}us per request")
+    logger.info(f"With middleware:    {on * 1e6:.0f}us per request ({(on - off) * 1e6:+.0f}us)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from datetime import datetime
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Default to a throwaway database so the benchmark never touches real data
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+from fcm_stub import FCMStub
+from app import create_app, db
+from app.models.user import User
+from app.models.notification import NotificationOutbox
+from app.services.notification_outbox import NotificationOutboxService
+from app.services.push_notification import PushNotificationService
+
+DEVICES_PER_USER = 3
+DEAD_EVERY = 10  # Every 10th device token is unregistered
+
+
+def seed_recipients(count):
+    """Create customers with device tokens and one broadcast push entry each."""
+    now = datetime.utcnow()
+    users = []
+    for i in range(count):
+        tokens = []
+        for d in range(DEVICES_PER_USER):
+            prefix = 'dead-' if (i * DEVICES_PER_USER + d) % DEAD_EVERY == 0 else 'tok-'
+            tokens.append({'token': f'{prefix}{i}-{d}', 'platform': 'android', 'added_at': now.isoformat()})
+        users.append({
+            'id': i + 1,
+            'name': f'customer {i}',
+            'email': f'customer{i}@example.com',
+            'phone': f'+9197{i:08d}',
+            'password_hash': 'x',
+            'role': 'customer',
+            'is_active': True,
+            'device_tokens': tokens,
+            'created_at': now
+        })
+    db.session.bulk_insert_mappings(User, users)
+
+    NotificationOutbox.enqueue([{
+        'idempotency_key': f'promo:broadcast:user:{i + 1}:push',
+        'channel': 'push',
+        'user_id': i + 1,
+        'notification_type': 'promo',
+        'payload': {'title': 'Fresh stock nearby', 'body': 'Your hawker has new items today', 'data': {'type': 'promo'}}
+    } for i in range(count)])
+    db.session.commit()
+
+
+def run_benchmark(count, latency):
+    """Drain push entries for `count` recipients through the FCM stub."""
+    stub = FCMStub(latency=latency)
+    PushNotificationService.default_transport = stub
+
+    app = create_app()
+    app.config['NOTIFICATION_OUTBOX_BATCH_SIZE'] = count
+
+    with app.app_context():
+        # In-memory database: the app no longer creates tables at startup
+        db.create_all()
+        seed_recipients(count)
+
+        started = time.perf_counter()
+        sent, retried, failed = NotificationOutboxService.drain('push')
+        elapsed = time.perf_counter() - started
+
+        remaining_dead = sum(
+            1 for devices, in db.session.query(User.device_tokens)
+            for device in devices or [] if device['token'].startswith('dead-')
+        )
+
+    stats = PushNotificationService.get_stats()
+    logger.info(
+        f"{sent} entries sent, {retried} retrying, {failed} failed in {elapsed:.2f}s; "
+        f"{stub.requests} FCM requests (max {stub.max_tokens_per_request} tokens), "
+        f"{stats['tokens_per_second']} tokens/s, {stats['unregistered']} unregistered, "
+        f"{remaining_dead} dead tokens left"
+    )
+    return sent == count and remaining_dead == 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark push fan-out against a local FCM stub.')
+    parser.add_argument('--count', type=int, default=5000, help='Number of recipients')
+    parser.add_argument('--latency', type=float, default=0.1, help='Simulated FCM request latency in seconds')
+    args = parser.parse_args()
+    sys.exit(0 if run_benchmark(args.count, args.latency) else 1)
@@ -0,0 +1,151 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+import fakeredis
+from app.middleware.rate_limit import GCRA_SCRIPT
+from app.utils.rate_limit_store import LocalRateLimitStore
+
+
+class CountingRedis(fakeredis.FakeRedis):
+    """In-memory Redis that counts round trips and can add network latency to each."""
+
+    def __init__(self, *args, latency=0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latency = latency
+        self.round_trips = 0
+
+    def execute_command(self, *args, **kwargs):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return super().execute_command(*args, **kwargs)
+
+
+def legacy_check(redis, key, limit, period):
+    """The previous limiter: GET, then SETEX or INCR, then GET and TTL for the headers."""
+    current = redis.get(key)
+    if current is None:
+        redis.setex(key, period, 1)
+        allowed = True
+    elif int(current) >= limit:
+        allowed = False
+    else:
+        redis.incr(key)
+        allowed = True
+    current = redis.get(key)
+    remaining = max(0, limit - int(current or 0))
+    reset = max(0, redis.ttl(key))
+    return allowed, remaining, reset
+
+
+def gcra_check(script, redis, key, limit, period):
+    allowed, remaining, reset_after, _ = script(keys=[key], args=[limit, period * 1000, 1], client=redis)
+    return bool(allowed), remaining, reset_after
+
+
+def tiered_check(store, script, redis, key, limit, period):
+    """Local store first; Redis only for requests it lets through, remembering denials."""
+    allowed, remaining, reset_after, _ = store.hit(key, limit, period)
+    if not allowed:
+        return False, remaining, reset_after
+    allowed, remaining, reset_after, retry_after = script(keys=[key], args=[limit, period * 1000, 1], client=redis)
+    if not allowed:
+        store.block(key, limit, period, retry_after / 1000.0)
+    return bool(allowed), remaining, reset_after
+
+
+def run_local_memory(clients, max_keys):
+    """Distinct clients far beyond the store's size: memory must stay bounded."""
+    store = LocalRateLimitStore(max_keys=max_keys)
+    started = time.perf_counter()
+    for i in range(clients):
+        store.hit(f"ip:{i}", 100, 60)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"local: {clients} distinct clients in {elapsed:.3f}s "
+        f"({elapsed / clients * 1e6:.2f}us per check), {len(store)} keys held (max {max_keys})"
+    )
+    return len(store) <= max_keys
+
+
+def run_serial(name, check, redis, requests, limit):
+    redis.flushall()
+    redis.round_trips = 0
+    started = time.perf_counter()
+    allowed = sum(1 for i in range(requests) if check(redis, f"bench:{i % 100}", limit, 60)[0])
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"{name}: {requests} checks in {elapsed:.3f}s ({requests / elapsed:.0f}/s), "
+        f"{redis.round_trips / requests:.2f} round trips per check, {allowed} allowed"
+    )
+
+
+def run_concurrent(name, check, redis, threads, per_thread, limit):
+    """Hammer one key from many threads; an atomic limiter admits exactly `limit`."""
+    redis.flushall()
+    allowed = []
+    lock = threading.Lock()
+
+    def worker():
+        count = sum(1 for _ in range(per_thread) if check(redis, 'bench:hot', limit, 60)[0])
+        with lock:
+            allowed.append(count)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    total = sum(allowed)
+    logger.info(f"{name}: {threads}x{per_thread} concurrent requests against a limit of {limit}: {total} allowed")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Redis rate limiter against the previous GET/INCR one')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0005, help='Simulated network latency per round trip (s)')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--clients', type=int, default=200000, help='Distinct clients for the local store memory check')
+    args = parser.parse_args()
+
+    redis = CountingRedis(latency=args.latency)
+    script = redis.register_script(GCRA_SCRIPT)
+
+    def gcra(client, key, limit, period):
+        return gcra_check(script, client, key, limit, period)
+
+    store = LocalRateLimitStore()
+
+    def tiered(client, key, limit, period):
+        return tiered_check(store, script, client, key, limit, period)
+
+    run_serial('legacy', legacy_check, redis, args.requests, args.limit)
+    run_serial('gcra', gcra, redis, args.requests, args.limit)
+    run_serial('local+gcra', tiered, redis, args.requests, args.limit)
+
+    run_concurrent('legacy', legacy_check, redis, args.threads, args.limit, args.limit)
+    admitted = run_concurrent('gcra', gcra, redis, args.threads, args.limit, args.limit)
+    store.clear()
+    tiered_admitted = run_concurrent('local+gcra', tiered, redis, args.threads, args.limit, args.limit)
+
+    bounded = run_local_memory(args.clients, 10000)
+    return 0 if admitted == tiered_admitted == args.limit and bounded else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
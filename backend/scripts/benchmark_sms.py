@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import logging
+import argparse
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Default to a throwaway database so the benchmark never touches real data
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+from fake_twilio import FakeTwilioServer
+from app import create_app
+from app.services.sms_notification import SMSNotificationService
+
+
+def build_numbers(count):
+    """Build recipient numbers, including some duplicates and invalid ones."""
+    numbers = [f'+9198{i:08d}' for i in range(count)]
+    numbers.extend(numbers[:count // 20])  # 5% duplicates
+    return numbers
+
+
+def run_benchmark(count, rate, latency):
+    """Send a bulk SMS through the fake Twilio server and report throughput."""
+    server = FakeTwilioServer(('127.0.0.1', 0), rate_limit=rate, latency=latency)
+    server.start()
+
+    app = create_app()
+    app.config.update(
+        TWILIO_ACCOUNT_SID='AC' + '0' * 32,
+        TWILIO_AUTH_TOKEN='benchmark',
+        TWILIO_PHONE_NUMBER='+15005550006',
+        TWILIO_API_BASE_URL=server.base_url,
+        SMS_RATE_PER_SECOND=rate,
+        SMS_BURST=rate
+    )
+
+    try:
+        with app.app_context():
+            started = time.perf_counter()
+            report = SMSNotificationService().send_bulk_sms(build_numbers(count), 'Your order is on its way')
+            elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+
+    delivered = len(report['delivered'])
+    logger.info(
+        f"{delivered} delivered, {len(report['failed'])} failed, {len(report['deferred'])} deferred "
+        f"in {elapsed:.2f}s ({delivered / elapsed if elapsed else 0:.1f} msg/s, cap {rate}/s); "
+        f"server saw {server.accepted} accepted, {server.throttled} throttled, {server.rejected} rejected"
+    )
+    return not report['deferred']
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark bulk SMS against a local Twilio stand-in.')
+    parser.add_argument('--count', type=int, default=1000, help='Number of distinct recipients')
+    parser.add_argument('--rate', type=int, default=100, help='Provider per-second cap')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated request latency in seconds')
+    args = parser.parse_args()
+    sys.exit(0 if run_benchmark(args.count, args.rate, args.latency) else 1)
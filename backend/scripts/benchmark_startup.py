@@ -0,0 +1,84 @@
+import os
+import re
+import sys
+import logging
+import argparse
+import subprocess
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Modules that must load on first use, not when a worker boots
+DEFERRED_MODULES = (
+    'googlemaps', 'ortools', 'numpy', 'stripe', 'razorpay', 'firebase_admin',
+    'twilio', 'alembic', 'flask_migrate', 'flask_socketio', 'socketio'
+)
+
+BOOT = """
+import resource, time
+started = time.perf_counter()
+from app import create_app
+create_app()
+print('BOOT', time.perf_counter() - started, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure():
+    """Boot the app in a fresh interpreter under -X importtime."""
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT],
+        cwd=project_root, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+
+    modules = {}  # top-level import -> cumulative microseconds
+    loaded = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)) // 2, match.group(4)
+        loaded.add(name)
+        if depth == 0:
+            modules[name] = cumulative
+
+    boot = next(line for line in result.stdout.splitlines() if line.startswith('BOOT'))
+    _, wall, rss = boot.split()
+    return float(wall), int(rss), modules, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure worker boot time and check heavy SDKs stay unloaded')
+    parser.add_argument('--budget-ms', type=float, default=None, help='Fail if booting takes longer than this')
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list')
+    args = parser.parse_args()
+
+    wall, rss, modules, loaded = measure()
+    logger.info(f"create_app() booted in {wall * 1000:.0f} ms "
+                f"({sum(modules.values()) / 1000:.0f} ms importing), max RSS {rss / 1024:.1f} MiB")
+    for name, micros in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        logger.info(f"  {micros / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = sorted({name.split('.')[0] for name in loaded} & set(DEFERRED_MODULES))
+    if eager:
+        logger.error(f"Imported at startup: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and wall * 1000 > args.budget_ms:
+        logger.error(f"Boot took {wall * 1000:.0f} ms, budget {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import logging
+import argparse
+from types import SimpleNamespace
+from datetime import datetime
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+from app.services.notification import NotificationService
+from app.services.notification_templates import NotificationTemplates
+
+TYPES = ['order_created', 'order_accepted', 'order_picked_up', 'order_delivered', 'order_cancelled']
+
+
+def build_events(count):
+    """Orders and customers shaped like the real rows, without a database."""
+    customer = SimpleNamespace(
+        id=1, email='customer@example.com', phone='+919800000001', device_tokens=[{'token': 'tok'}],
+        notify_email=True, notify_sms=True, notify_push=True
+    )
+    eta = datetime(2025, 5, 19, 13, 30)
+    return [(TYPES[i % len(TYPES)], SimpleNamespace(id=i, eta=eta if i % 2 else None), customer) for i in range(count)]
+
+
+def cpu_per_event(label, events, fn):
+    """Run fn over every event and log CPU microseconds per notification."""
+    started = time.process_time()
+    for notification_type, order, customer in events:
+        fn(notification_type, order, customer)
+    elapsed = time.process_time() - started
+    logger.info(f"{label}: {elapsed / len(events) * 1e6:.1f} us CPU per notification")
+    return elapsed
+
+
+def run_benchmark(count):
+    started = time.process_time()
+    compiled = NotificationTemplates.compile_all()
+    logger.info(f"Compiled {compiled} template sets in {(time.process_time() - started) * 1e3:.1f} ms (once per process)")
+
+    events = build_events(count)
+
+    # One render shared by the in-app record and all three channels
+    cpu_per_event('render once, reuse across channels', events, lambda t, order, customer: (
+        NotificationService.build_outbox_entries(customer, t, order, None, NotificationTemplates.render(t, order))
+    ))
+
+    # Rendering separately for the in-app record and the outbox entries
+    cpu_per_event('render per consumer', events, lambda t, order, customer: (
+        NotificationTemplates.render(t, order),
+        NotificationService.build_outbox_entries(customer, t, order)
+    ))
+
+    cpu_per_event('render only', events, lambda t, order, customer: NotificationTemplates.render(t, order))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure per-notification template CPU cost.')
+    parser.add_argument('--count', type=int, default=100000, help='Number of notifications to render')
+    args = parser.parse_args()
+    run_benchmark(args.count)
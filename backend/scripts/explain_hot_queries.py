@@ -0,0 +1,219 @@
+import os
+import sys
+import random
+import logging
+from datetime import datetime, timedelta, date
+
+# Add the project root directory to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# Default to a throwaway database so the harness never touches real data
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+from app import create_app, db
+from app.models.user import User
+from app.models.order import Order
+from app.models.product import Product
+from app.models.notification import Notification
+from app.models.location import LocationHistory
+from app.models.token_blacklist import TokenBlacklist
+from app.models.route import HawkerRoute
+
+SEED_HAWKERS = 20
+SEED_CUSTOMERS = 200
+SEED_ORDERS = 5000
+SEED_NOTIFICATIONS = 5000
+SEED_LOCATIONS = 5000
+SEED_TOKENS = 2000
+
+STATUSES = ['pending', 'accepted', 'picked_up', 'delivered', 'cancelled']
+
+
+def seed_data():
+    """Insert a representative dataset using bulk inserts."""
+    now = datetime.utcnow()
+    rng = random.Random(42)
+
+    users = []
+    for i in range(SEED_HAWKERS + SEED_CUSTOMERS):
+        role = 'hawker' if i < SEED_HAWKERS else 'customer'
+        users.append({
+            'id': i + 1,
+            'name': f'{role} {i}',
+            'email': f'{role}{i}@example.com',
+            'phone': f'+91000000{i:04d}',
+            'password_hash': 'x',
+            'role': role,
+            'is_active': True,
+            'created_at': now
+        })
+    db.session.bulk_insert_mappings(User, users)
+
+    hawker_ids = list(range(1, SEED_HAWKERS + 1))
+    customer_ids = list(range(SEED_HAWKERS + 1, SEED_HAWKERS + SEED_CUSTOMERS + 1))
+
+    db.session.bulk_insert_mappings(Product, [{
+        'hawker_id': rng.choice(hawker_ids),
+        'name': f'product {i}',
+        'price': 10.0,
+        'is_available': rng.random() > 0.2,
+        'created_at': now
+    } for i in range(500)])
+
+    db.session.bulk_insert_mappings(Order, [{
+        'customer_id': rng.choice(customer_ids),
+        'hawker_id': rng.choice(hawker_ids),
+        'status': rng.choice(STATUSES),
+        'total_amount': 100.0,
+        'delivery_address': 'somewhere',
+        'delivery_latitude': 12.9,
+        'delivery_longitude': 77.6,
+        'created_at': now - timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+        'updated_at': now
+    } for _ in range(SEED_ORDERS)])
+
+    db.session.bulk_insert_mappings(Notification, [{
+        'user_id': rng.choice(customer_ids),
+        'type': 'order_delivered',
+        'title': 'Order Delivered',
+        'message': 'Your order has been delivered',
+        'data': {},
+        'read': rng.random() > 0.3,
+        'created_at': now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+    } for _ in range(SEED_NOTIFICATIONS)])
+
+    db.session.bulk_insert_mappings(LocationHistory, [{
+        'user_id': rng.choice(hawker_ids),
+        'latitude': 12.9,
+        'longitude': 77.6,
+        'location_type': 'idle',
+        'timestamp': now - timedelta(seconds=rng.randint(0, 60 * 60 * 24 * 7))
+    } for _ in range(SEED_LOCATIONS)])
+
+    db.session.bulk_insert_mappings(TokenBlacklist, [{
+        'jti': f'{i:036d}',
+        'token_type': 'access',
+        'user_id': rng.choice(customer_ids),
+        'revoked_at': now,
+        'expires_at': now + timedelta(hours=rng.randint(-48, 48))
+    } for i in range(SEED_TOKENS)])
+
+    db.session.bulk_insert_mappings(HawkerRoute, [{
+        'hawker_id': hawker_id,
+        'date': date.today() - timedelta(days=d),
+        'order_sequence': '[]',
+        'total_distance': 0.0,
+        'estimated_duration': 0,
+        'status': 'completed'
+    } for hawker_id in hawker_ids for d in range(30)])
+
+    db.session.commit()
+
+
+def hot_queries():
+    """Return (name, query) pairs for every hot filter used by routes and services."""
+    now = datetime.utcnow()
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_end = day_start + timedelta(days=1)
+
+    return [
+        ('hawker daily deliveries', Order.query.filter(
+            Order.hawker_id == 1,
+            Order.status.in_(['accepted', 'picked_up']),
+            Order.created_at >= day_start,
+            Order.created_at < day_end
+        )),
+        ('customer order history', Order.query.filter_by(customer_id=SEED_HAWKERS + 1)
+            .order_by(Order.created_at.desc())),
+        ('admin orders by status', Order.query.filter_by(status='delivered')
+            .order_by(Order.created_at.desc())),
+        ('admin orders by date range', Order.query.filter(
+            Order.created_at >= day_start - timedelta(days=7),
+            Order.created_at < day_end
+        )),
+        ('expired pending orders', Order.query.filter(
+            Order.status == 'pending',
+            Order.created_at < now - timedelta(minutes=30)
+        )),
+        ('unread notifications', Notification.query.filter_by(
+            user_id=SEED_HAWKERS + 1, read=False
+        )),
+        ('notification history', Notification.query.filter_by(user_id=SEED_HAWKERS + 1)
+            .order_by(Notification.created_at.desc())),
+        ('location history', LocationHistory.query.filter(
+            LocationHistory.user_id == 1,
+            LocationHistory.timestamp >= now - timedelta(days=1)
+        ).order_by(LocationHistory.timestamp.desc())),
+        ('token blacklist lookup', TokenBlacklist.query.filter_by(jti=f'{7:036d}')),
+        ('expired blacklist entries', TokenBlacklist.query.filter(
+            TokenBlacklist.expires_at < now
+        )),
+        ('hawker route for day', HawkerRoute.query.filter_by(hawker_id=1, date=date.today())),
+        ('hawker catalog', Product.query.filter_by(hawker_id=1, is_available=True)),
+        ('active hawkers', User.query.filter_by(role='hawker', is_active=True)),
+    ]
+
+
+def explain(query):
+    """Return the query plan for a query as a single string."""
+    statement = query.statement.compile(
+        dialect=db.engine.dialect,
+        compile_kwargs={'literal_binds': True}
+    )
+    if db.engine.dialect.name == 'sqlite':
+        rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {statement}')).fetchall()
+        return '\n'.join(str(row[-1]) for row in rows)
+
+    rows = db.session.execute(db.text(f'EXPLAIN {statement}')).fetchall()
+    return '\n'.join(str(row[0]) for row in rows)
+
+
+def uses_index(plan):
+    """Check whether a query plan reads through an index rather than a full scan."""
+    markers = ('USING INDEX', 'USING COVERING INDEX', 'USING INTEGER PRIMARY KEY',
+               'Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+    return any(marker in plan for marker in markers)
+
+
+def run_harness():
+    """Seed a database, EXPLAIN every hot query and report which ones miss an index."""
+    app = create_app()
+    failures = []
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        seed_data()
+
+        db.session.execute(db.text('ANALYZE'))
+        if db.engine.dialect.name != 'sqlite':
+            # Small seeded tables can make a sequential scan look cheaper;
+            # we want to know whether an index *can* serve the query.
+            db.session.execute(db.text('SET enable_seqscan = off'))
+
+        for name, query in hot_queries():
+            plan = explain(query)
+            if uses_index(plan):
+                logger.info(f"[ok]   {name}")
+            else:
+                logger.error(f"[scan] {name}\n{plan}")
+                failures.append(name)
+
+        db.session.rollback()
+        db.drop_all()
+
+    if failures:
+        logger.error(f"{len(failures)} hot queries are not using an index: {', '.join(failures)}")
+        return False
+
+    logger.info("All hot queries are served by an index")
+    return True
+
+
+if __name__ == '__main__':
+    sys.exit(0 if run_harness() else 1)
@@ -0,0 +1,118 @@
+"""
+Local stand-in for the Twilio Messages API, for tests and throughput benchmarks.
+
+Point the app at it with TWILIO_API_BASE_URL=http://127.0.0.1:8026 and any
+non-empty TWILIO_ACCOUNT_SID/TWILIO_AUTH_TOKEN/TWILIO_PHONE_NUMBER.
+
+Behaviour:
+    - Enforces a per-second cap like a real account (429, code 20429)
+    - Numbers ending in 0000 are rejected as invalid (400, code 21211)
+    - Every request takes --latency seconds, like a real HTTPS round trip
+"""
+import json
+import time
+import uuid
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class FakeTwilioServer(ThreadingHTTPServer):
+    """Threaded HTTP server that accepts Messages.json requests."""
+
+    daemon_threads = True
+
+    def __init__(self, address, rate_limit=10, latency=0.05):
+        super().__init__(address, FakeTwilioHandler)
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.accepted = 0
+        self.throttled = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit)
+        self._updated = time.monotonic()
+
+    def admit(self):
+        """Take one unit of the per-second allowance (refilled continuously)."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens < 1:
+                self.throttled += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        server = self.server
+        time.sleep(server.latency)
+
+        if not self.path.endswith('/Messages.json'):
+            return self._reply(404, {'code': 20404, 'message': 'Not found', 'status': 404})
+
+        if not server.admit():
+            return self._reply(429, {'code': 20429, 'message': 'Too Many Requests', 'status': 429})
+
+        to_number = form.get('To', '')
+        if not to_number or to_number.endswith('0000'):
+            with server._lock:
+                server.rejected += 1
+            return self._reply(400, {
+                'code': 21211,
+                'message': f"The 'To' number {to_number} is not a valid phone number.",
+                'status': 400
+            })
+
+        with server._lock:
+            server.accepted += 1
+        self._reply(201, {
+            'sid': 'SM' + uuid.uuid4().hex,
+            'to': to_number,
+            'from': form.get('From'),
+            'body': form.get('Body'),
+            'status': 'queued'
+        })
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a local Twilio Messages API stand-in.')
+    parser.add_argument('--port', type=int, default=8026)
+    parser.add_argument('--rate-limit', type=int, default=10, help='Accepted requests per second')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to every request')
+    args = parser.parse_args()
+
+    server = FakeTwilioServer(('127.0.0.1', args.port), rate_limit=args.rate_limit, latency=args.latency)
+    print(f'Fake Twilio listening on {server.base_url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,51 @@
+"""
+Local stand-in for FCM's send_each_for_multicast, for tests and throughput benchmarks.
+
+Install it with PushNotificationService.default_transport = FCMStub(). It answers
+with real firebase_admin response and error types, so token classification and
+pruning run exactly as they would against FCM.
+
+Behaviour:
+    - Tokens starting with 'dead-' are reported unregistered
+    - Tokens starting with 'flaky-' fail with a transient error
+    - Every multicast request takes `latency` seconds, like a real round trip
+"""
+import time
+import uuid
+import threading
+from firebase_admin import exceptions, messaging
+
+
+class FCMStub:
+    """Callable replacement for messaging.send_each_for_multicast."""
+
+    def __init__(self, latency=0.1):
+        self.latency = latency
+        self.requests = 0
+        self.tokens = 0
+        self.max_tokens_per_request = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, message):
+        tokens = message.tokens
+        if len(tokens) > 500:
+            raise ValueError('tokens must not contain more than 500 elements')
+
+        with self._lock:
+            self.requests += 1
+            self.tokens += len(tokens)
+            self.max_tokens_per_request = max(self.max_tokens_per_request, len(tokens))
+
+        time.sleep(self.latency)
+
+        responses = []
+        for token in tokens:
+            if token.startswith('dead-'):
+                error = messaging.UnregisteredError('Requested entity was not found.')
+                responses.append(messaging.SendResponse(None, error))
+            elif token.startswith('flaky-'):
+                error = exceptions.UnavailableError('The service is currently unavailable.')
+                responses.append(messaging.SendResponse(None, error))
+            else:
+                responses.append(messaging.SendResponse({'name': f'projects/stub/messages/{uuid.uuid4().hex}'}, None))
+        return messaging.BatchResponse(responses)
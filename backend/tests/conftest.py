@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.models.user import User
+from app.models.product import Product
+from app.models.order import Order, OrderItem
+
+pytest_plugins = ['app.pytest_plugin']
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}"
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def customer(app):
+    user = User(name='Customer', email='customer@example.com', phone='+911111111111',
+                password='password', role='customer')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def hawker(app):
+    user = User(name='Hawker', email='hawker@example.com', phone='+912222222222',
+                password='password', role='hawker')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def customer_headers(customer):
+    return {'Authorization': f"Bearer {create_access_token(identity=str(customer.id))}"}
+
+
+@pytest.fixture
+def customer_orders(app, customer, hawker):
+    """Ten orders from customer to hawker, each with three line items."""
+    products = [
+        Product(hawker_id=hawker.id, name=f"Product {n}", price=10.0 + n)
+        for n in range(3)
+    ]
+    db.session.add_all(products)
+    now = datetime.utcnow()
+    for n in range(10):
+        order = Order(customer_id=customer.id, hawker_id=hawker.id, total_amount=0,
+                      delivery_address='1 Test Street', delivery_latitude=12.97,
+                      delivery_longitude=77.59)
+        order.created_at = now - timedelta(minutes=n)
+        order.items = [OrderItem(product=product, quantity=1, price=product.price) for product in products]
+        db.session.add(order)
+    db.session.commit()
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+from redis import Redis
+
+from app.services.notification_feed import NotificationFeedService
+
+
+@pytest.fixture
+def feed(app, monkeypatch):
+    """The feed pointed at a Redis that refuses connections, with its calls recorded."""
+    monkeypatch.setitem(app.config, 'SOCKETIO_MESSAGE_QUEUE', 'redis://127.0.0.1:1/0')
+    for name, value in (('_emitter', None), ('_emitter_url', None), ('_redis', None), ('_down_until', 0.0)):
+        monkeypatch.setattr(NotificationFeedService, name, value)
+
+    calls = {'ping': 0, 'emit': 0}
+    ping = Redis.ping
+
+    def counted_ping(self, *args, **kwargs):
+        calls['ping'] += 1
+        return ping(self, *args, **kwargs)
+
+    def counted_emit(self, *args, **kwargs):
+        calls['emit'] += 1
+
+    monkeypatch.setattr(Redis, 'ping', counted_ping)
+    monkeypatch.setattr('flask_socketio.SocketIO.emit', counted_emit)
+    return calls
+
+
+def test_publish_backs_off_while_redis_is_down(feed):
+    events = [(1, 'notification', {'id': 1})]
+
+    NotificationFeedService.publish(events)
+
+    assert feed == {'ping': 1, 'emit': 0}
+    assert NotificationFeedService._down_until > time.monotonic()
+
+    started = time.perf_counter()
+    NotificationFeedService.publish(events)
+
+    # Backing off: no further connection attempt on the commit path
+    assert feed == {'ping': 1, 'emit': 0}
+    assert time.perf_counter() - started < 0.01
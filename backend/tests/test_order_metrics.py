@@ -0,0 +1,50 @@
+from app import db
+from app.models.metrics import DailyOrderMetric
+from app.models.order import Order
+
+
+def _counts(hawker_id):
+    return {
+        metric.status: (metric.order_count, metric.revenue)
+        for metric in DailyOrderMetric.query.filter_by(hawker_id=hawker_id)
+        if metric.order_count
+    }
+
+
+def _order(customer, hawker, total_amount=25.0):
+    order = Order(customer_id=customer.id, hawker_id=hawker.id, total_amount=total_amount,
+                  delivery_address='1 Test Street', delivery_latitude=12.97, delivery_longitude=77.59)
+    db.session.add(order)
+    db.session.commit()
+    return order
+
+
+def test_new_order_is_counted(customer, hawker):
+    _order(customer, hawker)
+
+    assert _counts(hawker.id) == {'pending': (1, 25.0)}
+
+
+def test_status_change_on_expired_order_moves_its_count(customer, hawker):
+    order = _order(customer, hawker)
+    # After the commit every attribute is expired; assign without reading first
+    order.status = 'delivered'
+    db.session.commit()
+
+    assert _counts(hawker.id) == {'delivered': (1, 25.0)}
+
+
+def test_amount_change_on_expired_order_adjusts_revenue(customer, hawker):
+    order = _order(customer, hawker)
+    order.total_amount = 40.0
+    db.session.commit()
+
+    assert _counts(hawker.id) == {'pending': (1, 40.0)}
+
+
+def test_deleted_order_is_uncounted(customer, hawker):
+    order = _order(customer, hawker)
+    db.session.delete(order)
+    db.session.commit()
+
+    assert _counts(hawker.id) == {}
@@ -0,0 +1,19 @@
+import pytest
+
+from app import db
+
+
+# Revocation filter sync, the user, then orders with their hawkers, items and
+# products one query each, however many orders there are
+@pytest.mark.query_budget(6)
+def test_order_list_does_not_query_per_order(client, customer_headers, customer_orders):
+    # Start from an empty identity map, as a real request would
+    db.session.expunge_all()
+
+    response = client.get('/api/orders', headers=customer_headers)
+
+    assert response.status_code == 200
+    orders = response.get_json()
+    assert len(orders) == 10
+    assert all(len(order['items']) == 3 for order in orders)
+    assert orders[0]['items'][0]['product_name'] == 'Product 0'
@@ -0,0 +1,74 @@
+import pytest
+from datetime import datetime
+from flask_jwt_extended import create_access_token, decode_token
+
+from app import create_app, db
+from app.database import use_primary
+from app.models.token_blacklist import TokenBlacklist
+from app.services.token_revocation import TokenRevocationService
+
+
+@pytest.fixture
+def app(tmp_path):
+    """An app whose replica is a separate, empty database: anything read from it comes back missing."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'SQLALCHEMY_BINDS': {'replica': f"sqlite:///{tmp_path / 'replica.db'}"}
+    })
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines['replica'])
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_replica_endpoint_reads_orders_from_replica(client, customer_headers, customer_orders):
+    response = client.get('/api/orders', headers=customer_headers)
+
+    # The user is only on the primary, so authentication read from it;
+    # the orders are only on the primary too, so the list came from the replica
+    assert response.status_code == 200
+    assert response.get_json() == []
+
+
+def test_revoked_token_is_rejected_on_replica_endpoint(client, customer):
+    token = create_access_token(identity=str(customer.id))
+    TokenRevocationService.revoke(decode_token(token))
+    db.session.commit()
+
+    response = client.get('/api/orders', headers={'Authorization': f"Bearer {token}"})
+
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize('method, path, bind', [
+    ('GET', '/api/orders', 'replica'),
+    ('POST', '/api/orders', None),
+    ('GET', '/api/auth/me', None),
+])
+def test_session_bind_follows_endpoint_and_method(app, method, path, bind):
+    with app.test_request_context(path, method=method):
+        assert db.session.get_bind() is db.engines[bind]
+
+
+def test_use_primary_overrides_replica_endpoint(app):
+    with app.test_request_context('/api/orders', method='GET'):
+        with use_primary():
+            assert db.session.get_bind() is db.engines[None]
+        assert db.session.get_bind() is db.engines['replica']
+
+
+def test_not_revoked_answer_for_a_just_learned_jti_is_not_cached(app, customer):
+    claims = decode_token(create_access_token(identity=str(customer.id)))
+    # The filter hears of the revocation before its row is committed
+    TokenRevocationService._remember(claims['jti'])
+    assert TokenRevocationService.is_revoked(claims['jti']) is False
+
+    # ... and the transaction that told it commits the row afterwards
+    db.session.add(TokenBlacklist(jti=claims['jti'], token_type=claims['type'], user_id=claims['sub'],
+                                  expires_at=datetime.utcfromtimestamp(claims['exp'])))
+    db.session.commit()
+
+    assert TokenRevocationService.is_revoked(claims['jti']) is True
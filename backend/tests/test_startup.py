@@ -0,0 +1,32 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Heavy provider SDKs must load on first use, not when a worker boots
+DEFERRED_SDKS = ('ortools', 'razorpay', 'googlemaps', 'firebase_admin', 'twilio', 'stripe')
+
+BOOT = """
+import json, sys
+from app import create_app
+create_app()
+print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))
+"""
+
+
+@pytest.fixture(scope='module')
+def boot_modules():
+    """Top-level modules loaded by create_app() in a fresh interpreter."""
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, DATABASE_URL='sqlite://')
+    result = subprocess.run([sys.executable, '-c', BOOT], cwd=backend, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+@pytest.mark.parametrize('module', DEFERRED_SDKS)
+def test_create_app_does_not_import_provider_sdk(boot_modules, module):
+    assert module not in boot_modules, f"{module} is imported by create_app()"